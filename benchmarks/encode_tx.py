@@ -0,0 +1,94 @@
+"""
+Đo chi phí CPU để mã hóa một giao dịch gọi hợp đồng (không tính ký và gửi).
+
+So sánh:
+    - build_transaction: tạo hợp đồng mới mỗi giao dịch rồi build_transaction
+    - build_transaction (hợp đồng cache): dùng lại hợp đồng từ ContractRegistry
+    - prepare_call: mã hóa bằng FunctionCodec dùng chung và ghép giao dịch tại chỗ
+
+Mọi trường (gas, nonce, chainId, giá gas) đều được điền sẵn để build_transaction
+không gọi RPC; trong thực tế thiếu trường nào thì web3 sẽ gọi RPC để lấy trường đó.
+
+Chạy từ thư mục gốc dự án:
+    python -m benchmarks.encode_tx
+"""
+
+import asyncio
+import time
+
+from web3 import AsyncWeb3
+
+from src.model.onchain.contracts import get_contract_registry, prepare_call
+from src.model.projects.swaps.constants import GTE_SWAPS_ABI, GTE_SWAPS_CONTRACT
+
+ITERATIONS = 2000
+WALLET = "0x1111111111111111111111111111111111111111"
+PATH = [
+    "0x2222222222222222222222222222222222222222",
+    "0x3333333333333333333333333333333333333333",
+]
+TX_PARAMS = {
+    "from": WALLET,
+    "gas": 300000,
+    "gasPrice": 10**9,
+    "nonce": 1,
+    "chainId": 6342,
+}
+
+
+async def bench_build_transaction(web3: AsyncWeb3) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        contract = web3.eth.contract(
+            address=web3.to_checksum_address(GTE_SWAPS_CONTRACT), abi=GTE_SWAPS_ABI
+        )
+        await contract.functions.swapExactTokensForETH(
+            10**18, 0, PATH, WALLET, 2**32
+        ).build_transaction(TX_PARAMS)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+async def bench_cached_build_transaction(web3: AsyncWeb3) -> float:
+    registry = get_contract_registry()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        contract = registry.get(web3, GTE_SWAPS_CONTRACT, GTE_SWAPS_ABI)
+        await contract.functions.swapExactTokensForETH(
+            10**18, 0, PATH, WALLET, 2**32
+        ).build_transaction(TX_PARAMS)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+async def bench_prepare_call(web3: AsyncWeb3) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        prepare_call(
+            GTE_SWAPS_CONTRACT,
+            GTE_SWAPS_ABI,
+            "swapExactTokensForETH",
+            10**18,
+            0,
+            PATH,
+            WALLET,
+            2**32,
+        ).as_transaction(TX_PARAMS)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+async def main() -> None:
+    # Provider không bao giờ được gọi: mọi trường đã được điền sẵn
+    web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider("http://127.0.0.1:1"))
+
+    results = [
+        ("build_transaction", await bench_build_transaction(web3)),
+        ("build_transaction (hợp đồng cache)", await bench_cached_build_transaction(web3)),
+        ("prepare_call", await bench_prepare_call(web3)),
+    ]
+    baseline = results[0][1]
+    print(f"Mã hóa swapExactTokensForETH, {ITERATIONS} lần:")
+    for name, seconds in results:
+        print(f"  {name:<36} {seconds * 1e6:9.1f} µs/giao dịch  (x{baseline / seconds:.1f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
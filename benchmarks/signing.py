@@ -0,0 +1,75 @@
+"""
+Đo độ trễ vòng lặp sự kiện khi nhiều tài khoản ký giao dịch đồng thời,
+với ký trực tiếp trong vòng lặp (inline) và qua SignerPool (process).
+
+Mỗi "tài khoản" lặp lại: chờ một yêu cầu RPC giả lập rồi ký một giao dịch.
+Với inline, mỗi lần ký chặn vòng lặp vài mili giây nên mọi tài khoản khác
+nhận phản hồi RPC muộn hơn; với process, vòng lặp chỉ chờ kết quả.
+
+Chạy từ thư mục gốc dự án:
+    python -m benchmarks.signing
+"""
+
+import asyncio
+import os
+import time
+
+from src.model.onchain.signer import SignerPool
+from src.utils.loop_lag import LoopLagMonitor
+
+ACCOUNTS = 50
+TXS_PER_ACCOUNT = 4
+RPC_LATENCY = 0.05
+TX = {
+    "to": "0x1111111111111111111111111111111111111111",
+    "value": 1,
+    "gas": 21000,
+    "maxFeePerGas": 10**9,
+    "maxPriorityFeePerGas": 10**6,
+    "nonce": 0,
+    "chainId": 6342,
+    "type": 2,
+}
+
+
+async def run_accounts(pool: SignerPool, keys) -> float:
+    async def account(key: str) -> None:
+        for nonce in range(TXS_PER_ACCOUNT):
+            await asyncio.sleep(RPC_LATENCY)  # giả lập yêu cầu RPC
+            await pool.sign({**TX, "nonce": nonce}, key)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(account(key) for key in keys))
+    return time.perf_counter() - start
+
+
+async def bench(mode: str, keys) -> None:
+    pool = SignerPool(mode=mode)
+    if mode == "process":
+        # Khởi động trước các tiến trình con để không tính vào kết quả
+        await pool.sign_many([(TX, keys[0])] * pool.workers)
+
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    elapsed = await run_accounts(pool, keys)
+    await monitor.stop()
+
+    start = time.perf_counter()
+    await pool.sign_many([({**TX, "nonce": i}, keys[i % len(keys)]) for i in range(200)])
+    sign_many_elapsed = time.perf_counter() - start
+    pool.shutdown()
+
+    print(f"[{mode}] workers={pool.workers if mode != 'inline' else 1}")
+    print(f"  {ACCOUNTS} tài khoản x {TXS_PER_ACCOUNT} giao dịch: {elapsed:.2f} giây")
+    print(f"  độ trễ vòng lặp: {monitor.format_summary()}")
+    print(f"  sign_many(200): {sign_many_elapsed * 1000:.0f} ms")
+
+
+async def main() -> None:
+    keys = ["0x" + os.urandom(32).hex() for _ in range(ACCOUNTS)]
+    await bench("inline", keys)
+    await bench("process", keys)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+import argparse
 from loguru import logger
 import urllib3
 import sys
@@ -14,12 +15,23 @@ from src.utils.check_github_version import check_version
 if platform.system() == "Windows":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-async def main():
+async def main(shards: int = 1):
     show_logo()
     show_dev_info()
     
     configuration()
-    await start()
+    await start(shards)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="số tiến trình chạy song song, mỗi tiến trình xử lý một phần tài khoản",
+    )
+    return parser.parse_args()
 
 def configuration():
     urllib3.disable_warnings()
@@ -66,4 +78,5 @@ def configuration():
     )
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    asyncio.run(main(max(1, args.shards)))
@@ -245,7 +245,9 @@ def task_exists_in_config(task_name: str, tasks_list: list) -> bool:
             return True
     return Falseimport 
 import asyncio
+import heapq
 import random
+from collections import Counter
 from loguru import logger
 
 
@@ -257,19 +259,22 @@ from src.utils.statistics import print_wallets_stats
 from src.utils.check_github_version import check_version
 from src.utils.logs import ProgressTracker, create_progress_tracker
 from src.utils.config_browser import run
-
-async def start():
-    async def launch_wrapper(index, proxy, private_key):
-        async with semaphore:
-            await account_flow(
-                index,
-                proxy,
-                private_key,
-                config,
-                lock,
-                progress_tracker,
-            )
-
+from src.model.onchain.transport import get_transport_pool
+from src.model.onchain.rpc_metrics import get_rpc_metrics
+from src.model.onchain.signer import get_signer_pool
+from src.utils.loop_lag import LoopLagMonitor
+from src.utils.worker_pool import create_slot_scheduler, pause as pause_account
+from src.utils.adaptive_concurrency import create_adaptive_concurrency
+from src.utils.shards import (
+    ShardProgress,
+    ShardResult,
+    ShardSupervisor,
+    ShardWriter,
+    split_accounts,
+    split_threads,
+)
+
+async def start(shards: int = 1):
     try:
         await check_version("Crazyscholarr", "MegaETH_auto")
     except Exception as e:
@@ -303,7 +308,7 @@ async def start():
         from src.model.database.db_manager import show_database_menu
 
         await show_database_menu()
-        await start()
+        await start(shards)
     else:
         logger.error(f"Tùy chọn không hợp lệ: {choice}")
         return
@@ -351,16 +356,12 @@ async def start():
 
     threads = config.SETTINGS.THREADS
 
-    # Chuẩn bị proxy cho các tài khoản đã chọn
-    cycled_proxies = [
-        proxies[i % len(proxies)] for i in range(len(accounts_to_process))
-    ]
-
-    # Tạo danh sách chỉ số
-    indices = list(range(len(accounts_to_process)))
+    # Chỉ số tài khoản; chỉ tạo danh sách khi cần xáo trộn
+    indices = range(len(accounts_to_process))
 
     # Xáo trộn chỉ số chỉ khi SHUFFLE_WALLETS được bật
     if config.SETTINGS.SHUFFLE_WALLETS:
+        indices = list(indices)
         random.shuffle(indices)
         shuffle_status = "ngẫu nhiên"
     else:
@@ -379,33 +380,52 @@ async def start():
         )
     logger.info(f"Thứ tự tài khoản: {account_order}")
 
-    lock = asyncio.Lock()
-    semaphore = asyncio.Semaphore(value=threads)
-    tasks = []
-
     # Thêm trước khi tạo tác vụ
     progress_tracker = await create_progress_tracker(
         total=len(accounts_to_process), description="Tài khoản đã hoàn thành"
     )
 
-    # Sử dụng chỉ số để tạo tác vụ
-    for idx in indices:
-        actual_index = (
-            config.SETTINGS.EXACT_ACCOUNTS_TO_USE[idx]
-            if config.SETTINGS.EXACT_ACCOUNTS_TO_USE
-            else start_index + idx
-        )
-        tasks.append(
-            asyncio.create_task(
-                launch_wrapper(
-                    actual_index,
-                    cycled_proxies[idx],
-                    accounts_to_process[idx],
-                )
+    sticky_proxies = {}
+    if config.SCHEDULER.STICKY_PROXY:
+        sticky_proxies = await load_sticky_proxies(accounts_to_process, proxies)
+
+    def account_stream():
+        """Tạo dần (số tài khoản, proxy, khóa riêng) theo thứ tự chỉ số."""
+        for idx in indices:
+            actual_index = (
+                config.SETTINGS.EXACT_ACCOUNTS_TO_USE[idx]
+                if config.SETTINGS.EXACT_ACCOUNTS_TO_USE
+                else start_index + idx
             )
+            private_key = accounts_to_process[idx]
+            # Proxy cố định của ví, nếu không có thì xoay vòng theo vị trí trong danh sách
+            proxy = sticky_proxies.get(private_key) or proxies[idx % len(proxies)]
+            yield actual_index, proxy, private_key
+
+    shards = min(shards, len(accounts_to_process))
+    if shards > 1:
+        # Mỗi shard là một tiến trình với vòng lặp sự kiện riêng và phần tài khoản riêng
+        slices = split_accounts(list(account_stream()), shards, key=lambda account: account[1])
+        supervisor = ShardSupervisor(config, progress_tracker)
+        results = await supervisor.run(
+            shard_worker, slices, split_threads(threads, len(slices))
         )
+        rpc_metrics = get_rpc_metrics()
+        for result in results:
+            config.WALLETS.wallets.extend(result.wallets)
+            if rpc_metrics is not None and result.rpc_metrics is not None:
+                rpc_metrics.merge(result.rpc_metrics)
+    else:
+        loop_lag = await run_accounts(account_stream(), threads, config, progress_tracker)
+        logger.info(f"Độ trễ vòng lặp sự kiện: {loop_lag.format_summary()}")
+        rpc_metrics = get_rpc_metrics()
 
-    await asyncio.gather(*tasks)
+        # Đóng các nhóm kết nối RPC dùng chung
+        await get_transport_pool().close_all()
+        get_signer_pool().shutdown()
+
+    if rpc_metrics is not None:
+        logger.info("Số liệu RPC:\n" + "\n".join(rpc_metrics.format_summary()))
 
     logger.success("Đã lưu tài khoản và khóa riêng vào tệp.")
 
@@ -414,6 +434,116 @@ async def start():
     input("Nhấn Enter để tiếp tục...")
 
 
+async def run_accounts(
+    accounts, threads: int, config: src.utils.config.Config, progress_tracker: ProgressTracker
+) -> LoopLagMonitor:
+    """
+    Chạy các tài khoản (số tài khoản, proxy, khóa riêng) trong vòng lặp sự kiện hiện tại.
+    Trả về bộ theo dõi độ trễ vòng lặp sự kiện của quá trình chạy.
+    """
+    lock = asyncio.Lock()
+
+    # Theo dõi độ trễ vòng lặp sự kiện trong suốt quá trình chạy
+    loop_lag = LoopLagMonitor()
+    loop_lag.start()
+
+    # Tối đa THREADS tài khoản làm việc cùng lúc, tài khoản mới được lấy dần
+    # từ accounts; tài khoản đang nghỉ trả slot cho tài khoản khác
+    scheduler = create_slot_scheduler(threads)
+    progress_tracker.status = scheduler.format_status
+    # Chế độ thích ứng: số luồng thay đổi theo độ trễ và lỗi RPC
+    adaptive = create_adaptive_concurrency(scheduler)
+    if adaptive is not None:
+        adaptive.start()
+    await scheduler.run(
+        accounts,
+        lambda account: account_flow(*account, config, lock, progress_tracker),
+        key=lambda account: account[1],
+    )
+    if adaptive is not None:
+        await adaptive.stop()
+        logger.info(f"Số luồng cuối cùng (thích ứng): {scheduler.limit}")
+
+    await loop_lag.stop()
+    return loop_lag
+
+
+def shard_worker(shard: int, accounts: list, threads: int, channel, replies) -> None:
+    """Điểm vào của tiến trình shard (xem ShardSupervisor)."""
+    from main import configuration
+
+    configuration()
+    asyncio.run(run_shard(shard, accounts, threads, channel, replies))
+
+
+async def run_shard(shard: int, accounts: list, threads: int, channel, replies) -> None:
+    """Chạy phần tài khoản của shard; ghi SQLite và Telegram được chuyển cho tiến trình cha."""
+    from src.model.database.instance import Database
+    from src.utils.telegram_logger import forward_telegram_messages
+
+    config = src.utils.get_config()
+    writer = ShardWriter(shard, channel, replies)
+    Database.writer = writer
+    forward_telegram_messages(lambda message: channel.put(("telegram", message)))
+
+    progress_tracker = ShardProgress(
+        total=len(accounts), description="Tài khoản đã hoàn thành", shard=shard, channel=channel
+    )
+    loop_lag = await run_accounts(accounts, threads, config, progress_tracker)
+
+    await writer.close()
+    await get_transport_pool().close_all()
+    get_signer_pool().shutdown()
+    channel.put(
+        (
+            "done",
+            ShardResult(
+                shard=shard,
+                wallets=config.WALLETS.wallets,
+                rpc_metrics=get_rpc_metrics(),
+                loop_lag=loop_lag.format_summary(),
+            ),
+        )
+    )
+
+
+async def load_sticky_proxies(private_keys: list, proxies: list) -> dict:
+    """
+    Proxy cố định của các ví từ cột Wallet.proxy. Ví chưa có proxy hoặc có proxy
+    không còn trong danh sách được gán proxy đang có ít ví nhất và lưu lại.
+    Ví không có trong cơ sở dữ liệu dùng proxy xoay vòng như trước.
+    """
+    from src.model.database.instance import Database
+
+    db = Database()
+    try:
+        stored = await db.get_wallet_proxies(private_keys)
+    except Exception as e:
+        logger.error(f"Không thể đọc proxy của ví từ cơ sở dữ liệu: {e}")
+        return {}
+
+    available = set(proxies)
+    sticky = {key: proxy for key, proxy in stored.items() if proxy in available}
+    load = Counter(sticky.values())
+    # (số ví, vị trí trong danh sách, proxy): proxy ít ví nhất nằm ở đầu heap
+    heap = [(load[proxy], position, proxy) for position, proxy in enumerate(proxies)]
+    heapq.heapify(heap)
+    reassigned = {}
+    for key in stored:
+        if key in sticky:
+            continue
+        count, position, proxy = heapq.heappop(heap)
+        heapq.heappush(heap, (count + 1, position, proxy))
+        sticky[key] = reassigned[key] = proxy
+    if reassigned:
+        await db.update_wallet_proxies_batch(reassigned)
+    logger.info(
+        f"Proxy cố định: {len(sticky) - len(reassigned)} ví giữ proxy đã lưu, "
+        f"{len(reassigned)} ví được gán proxy mới"
+    )
+    return sticky
+
+
 async def account_flow(
     account_index: int,
     proxy: str,
@@ -428,7 +558,7 @@ async def account_flow(
             config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[1],
         )
         logger.info(f"[{account_index}] Nghỉ {pause} giây trước khi bắt đầu...")
-        await asyncio.sleep(pause)
+        await pause_account(pause)
 
         instance = src.model.Start(account_index, proxy, private_key, config)
 
@@ -445,7 +575,7 @@ async def account_flow(
             config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[1],
         )
         logger.info(f"Nghỉ {pause} giây trước tài khoản tiếp theo...")
-        await asyncio.sleep(pause)
+        await pause_account(pause)
 
         # Cập nhật tiến độ
         await progress_tracker.increment(1)
@@ -1,5 +1,6 @@
+import functools
 import json
-from typing import Optional, List, Dict
+from typing import Any, Awaitable, Callable, Optional, List, Dict
 from sqlalchemy import create_engine, Column, Integer, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
@@ -18,7 +19,27 @@ class Wallet(Base):
     tasks = Column(String)  # Chuỗi JSON chứa các nhiệm vụ
 
 
+def single_writer(method):
+    """
+    Phương thức ghi: khi Database.writer được đặt (tiến trình shard), lời gọi được
+    chuyển cho tiến trình cha thực hiện để chỉ một tiến trình ghi vào SQLite.
+    Lời gọi chờ tiến trình cha ghi xong và trả về đúng giá trị của phương thức.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if Database.writer is not None:
+            return await Database.writer(method.__name__, args, kwargs)
+        return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class Database:
+    # Hàm nhận (tên phương thức, args, kwargs) của các lời gọi ghi và trả về kết quả
+    # sau khi tiến trình cha ghi xong, None - ghi trực tiếp
+    writer: Optional[Callable[[str, tuple, dict], Awaitable[Any]]] = None
+
     def __init__(self):
         self.engine = create_async_engine(
             "sqlite+aiosqlite:///data/accounts.db",  # Đường dẫn và tên cơ sở dữ liệu
@@ -76,6 +97,7 @@ class Database:
             await session.commit()
             logger.success(f"Đã thêm ví {private_key[:4]}...{private_key[-4:]}")
 
+    @single_writer
     async def update_task_status(
         self, private_key: str, task_name: str, new_status: str
     ) -> None:
@@ -109,6 +131,7 @@ class Database:
                 f"Đã cập nhật nhiệm vụ {task_name} thành {new_status} cho ví {private_key[:4]}...{private_key[-4:]}"
             )
 
+    @single_writer
     async def clear_wallet_tasks(self, private_key: str) -> None:
         """
         Xóa tất cả nhiệm vụ của ví
@@ -127,6 +150,7 @@ class Database:
                 f"Đã xóa tất cả nhiệm vụ cho ví {private_key[:4]}...{private_key[-4:]}"
             )
 
+    @single_writer
     async def update_wallet_proxy(self, private_key: str, new_proxy: str) -> None:
         """
         Cập nhật proxy của ví
@@ -224,6 +248,7 @@ class Database:
         )
         return result.scalar_one_or_none()
 
+    @single_writer
     async def add_tasks_to_wallet(self, private_key: str, new_tasks: List[str]) -> None:
         """
         Thêm nhiệm vụ mới vào ví hiện có
@@ -395,6 +420,7 @@ class Database:
 
         return added_count
 
+    @single_writer
     async def update_wallets_tasks_batch(self, wallet_tasks_data: List[Dict]) -> int:
         """
         Cập nhật nhiệm vụ hàng loạt cho nhiều ví
@@ -445,4 +471,61 @@ class Database:
                 await session.rollback()
                 logger.error(f"Lỗi khi cập nhật nhiệm vụ ví hàng loạt: {e}")
 
-        return updated_count
\ No newline at end of file
+        return updated_count
+
+    async def get_wallet_proxies(self, private_keys: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Lấy proxy đã lưu của các ví
+
+        :param private_keys: Danh sách khóa riêng
+        :return: Từ điển {private_key: proxy} cho các ví có trong cơ sở dữ liệu
+        """
+        wallet_proxies = {}
+        async with self.session() as session:
+            from sqlalchemy import select
+
+            # Chia nhỏ để không vượt giới hạn số tham số của SQLite
+            for i in range(0, len(private_keys), 500):
+                result = await session.execute(
+                    select(Wallet.private_key, Wallet.proxy).where(
+                        Wallet.private_key.in_(private_keys[i : i + 500])
+                    )
+                )
+                wallet_proxies.update(result.all())
+        return wallet_proxies
+
+    @single_writer
+    async def update_wallet_proxies_batch(self, wallet_proxies: Dict[str, str]) -> int:
+        """
+        Cập nhật proxy hàng loạt cho nhiều ví
+
+        :param wallet_proxies: Từ điển {private_key: proxy mới}
+        :return: Số lượng ví được cập nhật thành công
+        """
+        updated_count = 0
+        async with self.session() as session:
+            try:
+                from sqlalchemy import select
+
+                private_keys = list(wallet_proxies)
+                for i in range(0, len(private_keys), 500):
+                    result = await session.execute(
+                        select(Wallet).where(
+                            Wallet.private_key.in_(private_keys[i : i + 500])
+                        )
+                    )
+                    for wallet in result.scalars().all():
+                        wallet.proxy = wallet_proxies[wallet.private_key]
+                        updated_count += 1
+
+                # Lưu tất cả thay đổi bằng một commit
+                await session.commit()
+                logger.success(
+                    f"Đã cập nhật proxy cho {updated_count} ví ở chế độ hàng loạt"
+                )
+
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Lỗi khi cập nhật proxy ví hàng loạt: {e}")
+
+        return updated_count
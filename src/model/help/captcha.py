@@ -1,6 +1,7 @@
 import asyncio
 from loguru import logger
 from primp import AsyncClient
+from src.utils.client import GuardedAsyncClient
 import requests
 from typing import Optional, Dict
 from enum import Enum
@@ -39,7 +40,7 @@ class Capsolver:
         self.api_key = api_key
         self.base_url = "https://api.capsolver.com"
         self.proxy = self._format_proxy(proxy) if proxy else None
-        self.session = session or AsyncClient(verify=False)
+        self.session = session or GuardedAsyncClient(verify=False)
 
     def _format_proxy(self, proxy: str) -> str:
         if not proxy:
@@ -196,7 +197,7 @@ class TwoCaptcha:
         self.api_key = api_key
         self.base_url = "http://2captcha.com"
         self.proxy = self._format_proxy(proxy) if proxy else None
-        self.session = session or AsyncClient(verify=False)
+        self.session = session or GuardedAsyncClient(verify=False)
 
     def _format_proxy(self, proxy: str) -> str:
         if not proxy:
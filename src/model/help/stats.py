@@ -1,10 +1,10 @@
-from eth_account import Account
 from typing import Optional, Tuple
 from dataclasses import dataclass
 from threading import Lock
 from loguru import logger
 from src.utils.config import Config
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.signer import get_signer_pool
 
 
 @dataclass
@@ -38,7 +38,7 @@ class WalletStats:
         """
         try:
             # Lấy địa chỉ từ khóa riêng
-            account = Account.from_key(private_key)
+            account = await get_signer_pool().account(private_key)
             address = account.address
 
             # Lấy số dư
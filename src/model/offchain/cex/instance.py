@@ -1,12 +1,12 @@
 import random
 import ccxt.async_support as ccxt
 import asyncio
-import time
 from decimal import Decimal
 from src.utils.config import Config
 from eth_account import Account
 from loguru import logger
 from web3 import Web3
+from src.model.onchain.web3_custom import Web3Custom
 from src.model.offchain.cex.constants import (
     CEX_WITHDRAWAL_RPCS,
     NETWORK_MAPPINGS,
@@ -172,24 +172,29 @@ class CexWithdraw:
         Chờ số dư tăng từ số dư ban đầu.
         Trả về True nếu số dư tăng, False nếu hết thời gian chờ.
         """
-        start_time = time.time()
         logger.info(f"[{self.account_index}] Đang chờ tiền đến. Số dư ban đầu: {initial_balance} ETH")
-        
-        while time.time() - start_time < timeout:
-            try:
-                current_balance = await self.get_eth_balance()
-                if current_balance > initial_balance:
-                    increase = current_balance - initial_balance
-                    logger.success(f"[{self.account_index}] Đã nhận được tiền! Số dư tăng thêm {increase} ETH")
-                    return True
-                
-                logger.info(f"[{self.account_index}] Số dư hiện tại: {current_balance} ETH. Đang chờ...")
-                await asyncio.sleep(10)  # Kiểm tra mỗi 10 giây
-                
-            except Exception as e:
-                logger.error(f"[{self.account_index}] Lỗi khi kiểm tra số dư: {str(e)}")
-                await asyncio.sleep(5)
-                
+
+        # Số dư được kiểm tra bởi tác vụ theo dõi dùng chung của mạng đích
+        # (một lần đọc cho tất cả ví đang chờ) thay vì mỗi ví tự hỏi mỗi 10 giây
+        web3 = None
+        try:
+            web3 = await Web3Custom.create(
+                self.account_index,
+                [CEX_WITHDRAWAL_RPCS[self.network]],
+                use_proxy=False,
+                proxy="",
+            )
+            if await web3.wait_for_balance_increase(
+                self.address, initial_balance, timeout=timeout
+            ):
+                logger.success(f"[{self.account_index}] Đã nhận được tiền!")
+                return True
+        except Exception as e:
+            logger.error(f"[{self.account_index}] Lỗi khi kiểm tra số dư: {str(e)}")
+        finally:
+            if web3:
+                await web3.cleanup()
+
         logger.warning(f"[{self.account_index}] Đã hết thời gian chờ sau {timeout} giây. Không nhận được tiền.")
         return False
 
@@ -1,5 +1,4 @@
 from .web3_custom import Web3Custom
-from .constants import Balance
-
-__all__ = ["Web3Custom", "Balance"]
+from .constants import Balance, TransactionParams
 
+__all__ = ["Web3Custom", "Balance", "TransactionParams"]
@@ -0,0 +1,187 @@
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.model.onchain.block_watcher import BlockWatcher
+from src.model.onchain.contracts import get_contract_registry
+from src.utils.constants import BALANCE_CHECKER_ABI, BALANCE_CHECKER_CONTRACT_ADDRESS
+
+if TYPE_CHECKING:
+    from src.model.onchain.web3_custom import Web3Custom
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+# Selector của balanceOf(address)
+BALANCE_OF_SELECTOR = "0x70a08231"
+
+
+@dataclass
+class _BalanceWaiter:
+    address: str
+    token: str  # ZERO_ADDRESS cho coin gốc
+    threshold: int  # đánh thức khi số dư > threshold (wei)
+    future: asyncio.Future
+
+
+class BalanceWatcher(BlockWatcher):
+    """
+    Một tác vụ nền cho mỗi nhóm RPC đọc số dư của tất cả địa chỉ đang chờ
+    mỗi khối mới bằng một lần gọi hợp đồng balance checker (hoặc một yêu cầu batch
+    nếu chuỗi không có hợp đồng này), rồi đánh thức những người chờ đã đủ số dư.
+    """
+
+    # Chờ số dư không cần độ trễ thấp như chờ biên lai
+    min_poll_interval = 1.0
+    min_head_interval = 1.0
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        poll_interval: float,
+        batch_size: int,
+        proxy: Optional[str] = None,
+        ssl: bool = False,
+    ):
+        super().__init__(urls, poll_interval, proxy, ssl)
+        self.batch_size = batch_size
+        self._waiters: List[_BalanceWaiter] = []
+        self._use_balance_checker: Optional[bool] = None
+
+    def _has_waiters(self) -> bool:
+        return bool(self._waiters)
+
+    async def wait(
+        self,
+        source: "Web3Custom",
+        address: str,
+        threshold: int,
+        token: Optional[str] = None,
+        timeout: float = 60,
+        log_interval: float = 15,
+    ) -> Optional[int]:
+        """
+        Chờ số dư của địa chỉ vượt quá ngưỡng.
+
+        Args:
+            source: Thể hiện Web3Custom (cung cấp thông tin chuỗi khi tạo kết nối)
+            address: Địa chỉ cần theo dõi
+            threshold: Ngưỡng số dư (wei), đánh thức khi số dư lớn hơn
+            token: Địa chỉ token (None cho coin gốc)
+            timeout: Thời gian chờ tối đa (giây)
+            log_interval: Tần suất ghi log tiến trình (giây)
+
+        Returns:
+            Số dư mới (wei) hoặc None nếu hết thời gian chờ
+        """
+        waiter = _BalanceWaiter(
+            address=AsyncWeb3.to_checksum_address(address),
+            token=AsyncWeb3.to_checksum_address(token) if token else ZERO_ADDRESS,
+            threshold=threshold,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        self._ensure_running(source)
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        try:
+            while True:
+                remaining = timeout - (loop.time() - start_time)
+                if remaining <= 0:
+                    return None
+                done, _ = await asyncio.wait(
+                    {waiter.future}, timeout=min(log_interval, remaining)
+                )
+                if done:
+                    return waiter.future.result()
+                elapsed = int(loop.time() - start_time)
+                logger.info(
+                    f"{source.account_index} | Vẫn đang chờ số dư tăng... ({elapsed}/{int(timeout)} giây)"
+                )
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    async def _on_block(self, block: int) -> None:
+        pairs = list({(w.address, w.token) for w in self._waiters})
+        balances = await self._read_balances(pairs)
+        for waiter in list(self._waiters):
+            balance = balances.get((waiter.address, waiter.token))
+            if balance is not None and balance > waiter.threshold:
+                self._waiters.remove(waiter)
+                if not waiter.future.done():
+                    waiter.future.set_result(balance)
+
+    async def _read_balances(
+        self, pairs: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], int]:
+        if self._use_balance_checker is None:
+            code = await self._web3.eth.get_code(BALANCE_CHECKER_CONTRACT_ADDRESS)
+            self._use_balance_checker = len(code) > 0
+
+        if self._use_balance_checker:
+            return await self._read_with_balance_checker(pairs)
+        return await self._read_with_batch(pairs)
+
+    async def _read_with_balance_checker(
+        self, pairs: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], int]:
+        contract = get_contract_registry().get(
+            self._web3, BALANCE_CHECKER_CONTRACT_ADDRESS, BALANCE_CHECKER_ABI
+        )
+        users = sorted({address for address, _ in pairs})
+        tokens = sorted({token for _, token in pairs})
+        balances = {}
+        for start in range(0, len(users), self.batch_size):
+            chunk = users[start : start + self.batch_size]
+            # Kết quả là ma trận phẳng: số dư của users[i] với tokens[j] nằm ở i * len(tokens) + j
+            result = await contract.functions.balances(chunk, tokens).call()
+            for i, user in enumerate(chunk):
+                for j, token in enumerate(tokens):
+                    balances[(user, token)] = result[i * len(tokens) + j]
+        return balances
+
+    async def _read_with_batch(
+        self, pairs: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], int]:
+        provider = self._web3.provider
+        balances = {}
+        for start in range(0, len(pairs), self.batch_size):
+            chunk = pairs[start : start + self.batch_size]
+            requests = []
+            for address, token in chunk:
+                if token == ZERO_ADDRESS:
+                    requests.append(("eth_getBalance", [address, "latest"]))
+                else:
+                    data = BALANCE_OF_SELECTOR + address[2:].lower().rjust(64, "0")
+                    requests.append(("eth_call", [{"to": token, "data": data}, "latest"]))
+            responses = await provider.make_batch_request(requests)
+            if not isinstance(responses, list):
+                raise Exception(responses.get("error"))
+            for pair, response in zip(chunk, responses):
+                result = response.get("result")
+                if result and result != "0x":
+                    balances[pair] = int(result, 16)
+        return balances
+
+
+def get_balance_watcher(urls: Iterable[str]) -> BalanceWatcher:
+    """Lấy BalanceWatcher dùng chung cho một danh sách RPC"""
+    if not hasattr(get_balance_watcher, "_watchers"):
+        get_balance_watcher._watchers = {}
+    key = tuple(urls)
+    watcher = get_balance_watcher._watchers.get(key)
+    if watcher is None:
+        from src.utils.config import get_config
+
+        balances = get_config().RPC_SETTINGS.BALANCES
+        watcher = BalanceWatcher(
+            key,
+            balances.POLL_INTERVAL,
+            balances.BATCH_SIZE,
+            f"http://{balances.PROXY}" if balances.PROXY else None,
+        )
+        get_balance_watcher._watchers[key] = watcher
+    return watcher
@@ -0,0 +1,158 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.model.onchain.gas_oracle import get_gas_oracle
+from src.model.onchain.rpc_router import get_rpc_router
+from src.model.onchain.transport import (
+    PooledHTTPProvider,
+    RpcTransport,
+    get_transport_pool,
+)
+from src.model.onchain.ws_transport import (
+    NEW_HEADS,
+    Subscription,
+    WsConnection,
+    WsTransport,
+)
+
+if TYPE_CHECKING:
+    from src.model.onchain.web3_custom import Web3Custom
+
+# Giới hạn khoảng kiểm tra khối mới khi POLL_INTERVAL = 0 (theo thời gian khối)
+MIN_POLL_INTERVAL = 0.2
+MAX_POLL_INTERVAL = 5.0
+
+
+class BlockWatcher(ABC):
+    """
+    Cơ sở cho các tác vụ nền dùng chung theo dõi khối mới của một nhóm RPC.
+    Tác vụ chỉ chạy khi có người chờ, dùng kết nối riêng lấy từ nhóm kết nối
+    dùng chung và trả lại khi không còn ai chờ. Mỗi chuỗi có một bộ theo dõi, luôn
+    dùng proxy được chỉ định trong cấu hình (không phụ thuộc tài khoản nào đến trước);
+    proxy của tài khoản chỉ áp dụng cho kết nối riêng của tài khoản đó.
+    Nếu RPC có WebSocket, khối mới được nhận qua newHeads; khi subscription
+    chưa hoạt động, tác vụ quay về hỏi eth_blockNumber qua HTTP.
+    """
+
+    min_poll_interval = MIN_POLL_INTERVAL
+    # Khoảng tối thiểu giữa hai lần xử lý khi nhận khối qua newHeads (giây)
+    min_head_interval = 0.0
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        poll_interval: float,
+        proxy: Optional[str] = None,
+        ssl: bool = False,
+    ):
+        self.urls = list(urls)
+        self.poll_interval = poll_interval
+        self.proxy = proxy
+        self.ssl = ssl
+        self.block_time: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._web3: Optional[AsyncWeb3] = None
+        self._transports: Dict[str, RpcTransport] = {}
+        self._heads: Optional[Subscription] = None
+        self._head_connection: Optional[WsConnection] = None
+        self._head_block: Optional[int] = None
+        self._new_head = asyncio.Event()
+
+    @abstractmethod
+    def _has_waiters(self) -> bool:
+        """Còn người chờ hay không; tác vụ nền dừng khi trả về False."""
+
+    @abstractmethod
+    async def _on_block(self, block: int) -> None:
+        """Xử lý khối mới."""
+
+    def _interval(self) -> float:
+        if self.poll_interval > 0:
+            return self.poll_interval
+        return min(
+            max(self.block_time or self.min_poll_interval, self.min_poll_interval),
+            MAX_POLL_INTERVAL,
+        )
+
+    def _ensure_running(self, source: "Web3Custom") -> None:
+        """Khởi động tác vụ nền nếu chưa chạy; source cung cấp thông tin chuỗi."""
+        if self._task is not None:
+            return
+        pool = get_transport_pool()
+        self._transports = {
+            url: pool.acquire(url, self.proxy, self.ssl) for url in self.urls
+        }
+        provider = PooledHTTPProvider(self._transports, router=get_rpc_router(self.urls))
+        provider.chain_id = source.chain_id
+        self._web3 = AsyncWeb3(provider)
+        if source.chain_meta:
+            self.block_time = source.chain_meta.block_time
+        self._task = asyncio.create_task(self._run())
+
+    def _on_head(self, head: Dict) -> None:
+        self._head_block = int(head["number"], 16)
+        self._new_head.set()
+
+    async def _subscribe_heads(self) -> None:
+        for transport in self._transports.values():
+            if isinstance(transport, WsTransport):
+                self._head_connection = transport.connection
+                self._heads = await transport.connection.subscribe(NEW_HEADS, self._on_head)
+                return
+
+    async def _wait_next(self, started_at: float) -> None:
+        if self._heads is None or not self._heads.active:
+            await asyncio.sleep(self._interval())
+            return
+        # Chờ newHeads; nếu không có khối mới trong MAX_POLL_INTERVAL thì tự hỏi lại
+        try:
+            await asyncio.wait_for(self._new_head.wait(), MAX_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            return
+        elapsed = asyncio.get_running_loop().time() - started_at
+        if elapsed < self.min_head_interval:
+            await asyncio.sleep(self.min_head_interval - elapsed)
+
+    async def _detach(self) -> None:
+        # Xóa trạng thái trước mọi await, để người chờ mới trong lúc dọn dẹp
+        # tạo tác vụ mới thay vì chờ tác vụ đang kết thúc
+        head_connection = self._head_connection
+        transports = self._transports
+        self._heads = None
+        self._head_connection = None
+        self._head_block = None
+        self._transports = {}
+        self._web3 = None
+        self._task = None
+        if head_connection is not None:
+            await head_connection.unsubscribe(NEW_HEADS, self._on_head)
+        pool = get_transport_pool()
+        for transport in transports.values():
+            await pool.release(transport)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last_block = None
+        try:
+            await self._subscribe_heads()
+            while self._has_waiters():
+                started_at = loop.time()
+                self._new_head.clear()
+                try:
+                    if self._heads is not None and self._heads.active and self._head_block:
+                        block = self._head_block
+                    else:
+                        block = await self._web3.eth.block_number
+                    if block != last_block:
+                        last_block = block
+                        get_gas_oracle(self.urls).on_new_block(block)
+                        await self._on_block(block)
+                except Exception as e:
+                    logger.debug(f"Lỗi trong tác vụ theo dõi khối ({type(self).__name__}): {e}")
+                await self._wait_next(started_at)
+        finally:
+            await self._detach()
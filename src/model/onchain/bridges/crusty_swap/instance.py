@@ -1,6 +1,7 @@
 import random
 from eth_account import Account
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.signer import get_signer_pool
 from loguru import logger
 import primp
 import asyncio
@@ -39,8 +40,8 @@ class CrustySwap:
         self.private_key = private_key
 
         self.eth_web3 = None
-        self.megaeth_contract = self.megaeth_web3.web3.eth.contract(
-            address=DESTINATION_CONTRACT_ADDRESS, abi=CRUSTY_SWAP_ABI
+        self.megaeth_contract = self.megaeth_web3.contract(
+            DESTINATION_CONTRACT_ADDRESS, CRUSTY_SWAP_ABI
         )
 
     async def initialize(self):
@@ -109,31 +110,13 @@ class CrustySwap:
         Args:
             initial_balance: Số dư ban đầu để so sánh
         """
-        timeout = self.config.CRUSTY_SWAP.MAX_WAIT_TIME
-
-        logger.info(
-            f"[{self.account_index}] Đang chờ số dư tăng (thời gian chờ tối đa: {timeout} giây)..."
+        # Số dư được kiểm tra bởi tác vụ theo dõi dùng chung của MegaETH,
+        # không phải vòng lặp riêng mỗi 5 giây cho từng ví
+        return await self.megaeth_web3.wait_for_balance_increase(
+            self.wallet.address,
+            initial_balance,
+            timeout=self.config.CRUSTY_SWAP.MAX_WAIT_TIME,
         )
-        start_time = asyncio.get_event_loop().time()
-
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_megaeth_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Số dư đã tăng từ {initial_balance:.9f} lên {current_balance:.9f} MEGAETH"
-                )
-                return True
-
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(
-                    f"[{self.account_index}] Vẫn đang chờ số dư tăng... ({elapsed}/{timeout} giây)"
-                )
-
-            await asyncio.sleep(5)
-
-        logger.error(f"[{self.account_index}] Số dư không tăng sau {timeout} giây")
-        return False
 
     async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
         """
@@ -142,9 +125,12 @@ class CrustySwap:
         Args:
             web3: Thể hiện Web3 cho mạng cụ thể
         """
-        latest_block = await web3.web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.web3.eth.max_priority_fee
+        # Phí lấy từ một lần gọi eth_feeHistory dùng chung giữa các tài khoản trên cùng mạng
+        if web3.eip1559:
+            return await web3.gas_oracle.fee_params(web3.web3)
+
+        base_fee = await web3.gas_oracle.base_fee(web3.web3)
+        max_priority_fee = await web3.gas_oracle.max_priority_fee(web3.web3)
         max_fee = int((base_fee + max_priority_fee) * 1.5)
 
         return {
@@ -161,7 +147,7 @@ class CrustySwap:
         """
         try:
             web3 = await self.create_web3(network)
-            contract = web3.web3.eth.contract(address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI)
+            contract = web3.contract(CONTRACT_ADDRESSES[network], CRUSTY_SWAP_ABI)
             return await contract.functions.minimumDeposit().call()
         except Exception as e:
             logger.error(f"[{self.account_index}] Lỗi khi lấy số tiền nạp tối thiểu: {str(e)}")
@@ -239,7 +225,7 @@ class CrustySwap:
 
             web3 = await self.create_web3(network)
             gas_params = await self.get_gas_params(web3)
-            contract = web3.web3.eth.contract(address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI)
+            contract = web3.contract(CONTRACT_ADDRESSES[network], CRUSTY_SWAP_ABI)
 
             gas_estimate = await web3.web3.eth.estimate_gas({
                 'from': self.wallet.address,
@@ -276,7 +262,6 @@ class CrustySwap:
                 )
                 amount_wei = int(round(web3.web3.to_wei(amount_ether, 'ether'), random.randint(8, 12)))
 
-            nonce = await web3.web3.eth.get_transaction_count(self.wallet.address)
             has_enough_megaeth = await self.check_available_megaeth(amount_wei, contract)
             if not has_enough_megaeth:
                 logger.error(
@@ -292,17 +277,15 @@ class CrustySwap:
                     ZERO_ADDRESS,
                     self.wallet.address
                 )._encode_transaction_data(),
-                'nonce': nonce,
                 'gas': int(gas_estimate * 1.1),
-                'chainId': await web3.web3.eth.chain_id,
+                'chainId': web3.chain_id,
                 **gas_params
             }
 
-            signed_tx = web3.web3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = await web3.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await web3.submit_transaction(tx, self.wallet)
 
             logger.info(f"[{self.account_index}] Đang chờ xác nhận giao dịch nạp...")
-            receipt = await web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await web3.wait_for_receipt(tx_hash)
 
             explorer_url = f"{EXPLORER_URLS[network]}{tx_hash.hex()}"
 
@@ -327,14 +310,12 @@ class CrustySwap:
             logger.error(f"[{self.account_index}] Nạp thất bại: {str(e)}")
             return False
 
-    def _convert_private_keys_to_addresses(self, private_keys_to_distribute):
+    async def _convert_private_keys_to_addresses(self, private_keys_to_distribute):
         """
-        Chuyển đổi khóa riêng thành địa chỉ.
+        Chuyển đổi khóa riêng thành địa chỉ (qua SignerPool, ngoài vòng lặp sự kiện).
         """
-        addresses = []
-        for private_key in private_keys_to_distribute:
-            addresses.append(Account.from_key(private_key).address)
-        return addresses
+        accounts = await get_signer_pool().accounts(private_keys_to_distribute)
+        return [account.address for account in accounts]
 
     async def check_available_megaeth(self, eth_amount_wei, contract, max_retries=5, retry_delay=5) -> bool:
         """
@@ -356,9 +337,8 @@ class CrustySwap:
                     DESTINATION_CONTRACT_ADDRESS
                 )
 
-                chainlink_eth_price_contract = self.eth_web3.web3.eth.contract(
-                    address=CHAINLINK_ETH_PRICE_CONTRACT_ADDRESS,
-                    abi=CHAINLINK_ETH_PRICE_ABI
+                chainlink_eth_price_contract = self.eth_web3.contract(
+                    CHAINLINK_ETH_PRICE_CONTRACT_ADDRESS, CHAINLINK_ETH_PRICE_ABI
                 )
                 eth_price_usd = await chainlink_eth_price_contract.functions.latestAnswer().call()
 
@@ -437,31 +417,13 @@ class CrustySwap:
             initial_balance: Số dư ban đầu để so sánh
             address: Địa chỉ để kiểm tra số dư
         """
-        timeout = self.config.CRUSTY_SWAP.MAX_WAIT_TIME
-
-        logger.info(
-            f"[{self.account_index}] Đang chờ số dư tăng (thời gian chờ tối đa: {timeout} giây)..."
+        # Số dư được kiểm tra bởi tác vụ theo dõi dùng chung của MegaETH,
+        # không phải vòng lặp riêng mỗi 5 giây cho từng ví
+        return await self.megaeth_web3.wait_for_balance_increase(
+            address,
+            initial_balance,
+            timeout=self.config.CRUSTY_SWAP.MAX_WAIT_TIME,
         )
-        start_time = asyncio.get_event_loop().time()
-
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self._get_megaeth_balance(address)
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Số dư đã tăng từ {initial_balance} lên {current_balance} MEGAETH"
-                )
-                return True
-
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(
-                    f"[{self.account_index}] Vẫn đang chờ số dư tăng... ({elapsed}/{timeout} giây)"
-                )
-
-            await asyncio.sleep(5)
-
-        logger.error(f"[{self.account_index}] Số dư không tăng sau {timeout} giây")
-        return False
 
     async def _handle_transaction_status(self, receipt, explorer_url, initial_balance, network, address) -> bool:
         """
@@ -522,7 +484,7 @@ class CrustySwap:
 
             web3 = await self.create_web3(network)
             gas_params = await self.get_gas_params(web3)
-            contract = web3.web3.eth.contract(address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI)
+            contract = web3.contract(CONTRACT_ADDRESSES[network], CRUSTY_SWAP_ABI)
 
             gas_estimate = await web3.web3.eth.estimate_gas({
                 'from': self.wallet.address,
@@ -561,7 +523,6 @@ class CrustySwap:
                 )
                 amount_wei = int(round(web3.web3.to_wei(amount_ether, 'ether'), random.randint(8, 12)))
 
-            nonce = await web3.web3.eth.get_transaction_count(self.wallet.address)
             has_enough_megaeth = await self.check_available_megaeth(amount_wei, contract)
             if not has_enough_megaeth:
                 logger.error(
@@ -577,17 +538,15 @@ class CrustySwap:
                     ZERO_ADDRESS,
                     address
                 )._encode_transaction_data(),
-                'nonce': nonce,
                 'gas': int(gas_estimate * 1.1),
-                'chainId': await web3.web3.eth.chain_id,
+                'chainId': web3.chain_id,
                 **gas_params
             }
 
-            signed_tx = web3.web3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = await web3.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await web3.submit_transaction(tx, self.wallet)
 
             logger.info(f"[{self.account_index}] Đang chờ xác nhận giao dịch nạp...")
-            receipt = await web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await web3.wait_for_receipt(tx_hash)
 
             explorer_url = f"{EXPLORER_URLS[network]}{tx_hash.hex()}"
             return await self._handle_transaction_status(receipt, explorer_url, initial_balance, network, address)
@@ -605,7 +564,7 @@ class CrustySwap:
         """
         try:
             await self.initialize()
-            addresses = self._convert_private_keys_to_addresses(private_keys_to_distribute)
+            addresses = await self._convert_private_keys_to_addresses(private_keys_to_distribute)
             for index, address in enumerate(addresses):
                 logger.info(
                     f"[{self.account_index}] - [{index}/{len(addresses)}] Đang nạp từ CHÍNH: {self.wallet.address} đến: {address}"
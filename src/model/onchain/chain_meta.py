@@ -0,0 +1,83 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+# Số khối dùng để tính thời gian khối trung bình
+BLOCK_TIME_SAMPLE = 100
+
+
+@dataclass(frozen=True)
+class ChainMeta:
+    """Thông tin chuỗi không đổi, được xác định một lần cho mỗi nhóm RPC."""
+
+    chain_id: int
+    eip1559: bool  # khối có baseFeePerGas
+    block_time: float  # thời gian khối trung bình (giây)
+
+
+class ChainMetaCache:
+    """
+    Bộ nhớ đệm thông tin chuỗi dùng chung cho toàn bộ tiến trình.
+    Khóa là danh sách RPC; nhiều tài khoản yêu cầu cùng lúc chỉ tạo một lần truy vấn.
+    """
+
+    def __init__(self):
+        self._meta: Dict[Tuple[str, ...], ChainMeta] = {}
+        self._locks: Dict[Tuple[str, ...], asyncio.Lock] = {}
+
+    def peek(self, urls: Iterable[str]) -> Optional[ChainMeta]:
+        """Lấy thông tin đã lưu mà không gửi yêu cầu."""
+        return self._meta.get(tuple(urls))
+
+    async def get(self, urls: Iterable[str], web3: AsyncWeb3) -> ChainMeta:
+        """Lấy thông tin chuỗi, truy vấn qua web3 nếu chưa có trong bộ nhớ đệm."""
+        key = tuple(urls)
+        meta = self._meta.get(key)
+        if meta is not None:
+            return meta
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            meta = self._meta.get(key)
+            if meta is None:
+                meta = await self._resolve(web3)
+                self._meta[key] = meta
+                logger.info(
+                    f"Chuỗi {meta.chain_id}: EIP-1559 {'có' if meta.eip1559 else 'không'}, "
+                    f"thời gian khối ~{meta.block_time:.2f} giây"
+                )
+            return meta
+
+    @staticmethod
+    async def _resolve(web3: AsyncWeb3) -> ChainMeta:
+        async with web3.batch_requests() as batch:
+            batch.add(web3.eth.chain_id)
+            batch.add(web3.eth.get_block("latest"))
+            chain_id, latest = await batch.async_execute()
+
+        block_time = 1.0
+        sample = min(BLOCK_TIME_SAMPLE, latest["number"])
+        if sample > 0:
+            try:
+                older = await web3.eth.get_block(latest["number"] - sample)
+                block_time = max(
+                    (latest["timestamp"] - older["timestamp"]) / sample, 0.001
+                )
+            except Exception as e:
+                logger.debug(f"Không thể tính thời gian khối: {e}")
+
+        return ChainMeta(
+            chain_id=chain_id,
+            eip1559=latest.get("baseFeePerGas") is not None,
+            block_time=block_time,
+        )
+
+
+def get_chain_meta_cache() -> ChainMetaCache:
+    """Lấy ChainMetaCache singleton"""
+    if not hasattr(get_chain_meta_cache, "_cache"):
+        get_chain_meta_cache._cache = ChainMetaCache()
+    return get_chain_meta_cache._cache
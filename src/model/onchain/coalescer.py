@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Tuple
+
+# Các lệnh đọc có kết quả giống nhau cho mọi tài khoản khi tham số giống nhau
+COALESCED_METHODS = frozenset(
+    {
+        "eth_call",
+        "eth_getBalance",
+        "eth_getCode",
+        "eth_getStorageAt",
+    }
+)
+
+
+class RequestCoalescer:
+    """
+    Gộp các lệnh đọc giống hệt nhau (cùng phương thức và tham số, bao gồm
+    địa chỉ, calldata và block tag) từ mọi tài khoản trên cùng một chuỗi:
+    các yêu cầu đồng thời dùng chung một yêu cầu đang chạy, và nếu ttl > 0
+    thì kết quả được giữ trong bộ nhớ đệm ngắn hạn. Yêu cầu dùng chung được gửi
+    qua kết nối (và proxy) của tài khoản gọi đầu tiên.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0.0,
+        max_entries: int = 10000,
+        methods: FrozenSet[str] = COALESCED_METHODS,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.methods = methods
+        self.hits = 0
+        self.misses = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(request: Dict[str, Any]) -> str:
+        params = json.dumps(request.get("params"), sort_keys=True, separators=(",", ":"))
+        return f"{request['method']}:{params}"
+
+    def _cached(self, key: str):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        return response
+
+    def _on_done(self, key: str, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+        response = json.loads(task.result())
+        # Không lưu lỗi JSON-RPC (ví dụ revert), lần gọi sau sẽ thử lại
+        if "error" in response:
+            return
+        self._cache[key] = (time.monotonic() + self.ttl, response)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def request(
+        self, request_data: bytes, send: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Gửi yêu cầu qua send() hoặc dùng chung kết quả với yêu cầu giống hệt.
+
+        Args:
+            request_data: Yêu cầu JSON-RPC đã mã hóa
+            send: Hàm gửi yêu cầu thật, trả về phản hồi thô
+        """
+        request = json.loads(request_data)
+        key = self._key(request)
+
+        response = self._cached(key)
+        if response is None:
+            task = self._inflight.get(key)
+            if task is None:
+                self.misses += 1
+                # Chạy trong tác vụ riêng để việc hủy một nơi gọi không ảnh hưởng nơi khác
+                task = asyncio.ensure_future(send())
+                self._inflight[key] = task
+                task.add_done_callback(lambda t, key=key: self._on_done(key, t))
+            else:
+                self.hits += 1
+            response = json.loads(await asyncio.shield(task))
+        else:
+            self.hits += 1
+
+        # Phản hồi dùng chung mang id của yêu cầu đầu tiên, đổi lại cho nơi gọi này
+        return json.dumps({**response, "id": request.get("id")}).encode()
+
+
+def get_coalescer(urls: Iterable[str]) -> RequestCoalescer:
+    """Lấy RequestCoalescer dùng chung cho một danh sách RPC"""
+    if not hasattr(get_coalescer, "_coalescers"):
+        get_coalescer._coalescers = {}
+    key = tuple(urls)
+    coalescer = get_coalescer._coalescers.get(key)
+    if coalescer is None:
+        from src.utils.config import get_config
+
+        coalescing = get_config().RPC_SETTINGS.COALESCING
+        coalescer = RequestCoalescer(
+            ttl=coalescing.TTL, max_entries=coalescing.MAX_ENTRIES
+        )
+        get_coalescer._coalescers[key] = coalescer
+    return coalescer
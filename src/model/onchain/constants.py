@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Optional
 from dataclasses import dataclass
 
 
@@ -109,4 +109,14 @@ class Balance:
     def __sub__(self, other: object) -> "Balance":
         if not isinstance(other, Balance):
             return NotImplemented
-        return Balance(_wei=self._wei - other._wei)
\ No newline at end of file
+        return Balance(_wei=self._wei - other._wei)
+
+
+@dataclass
+class TransactionParams:
+    """Tham số giao dịch lấy về trong một yêu cầu JSON-RPC batch."""
+
+    nonce: Optional[int] = None
+    gas_price: Optional[int] = None
+    chain_id: Optional[int] = None
+    gas: Optional[int] = None  # gas ước lượng (chưa cộng đệm)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_abi import decode, encode
+from eth_typing import ChecksumAddress
+from eth_utils import (
+    function_abi_to_4byte_selector,
+    get_abi_input_types,
+    get_abi_output_types,
+)
+from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+
+# Số ABI tối đa được nhớ dấu vân tay theo id (ABI tạo tại chỗ sẽ bị thay thế dần)
+MAX_FINGERPRINTS = 1024
+
+
+@lru_cache(maxsize=4096)
+def to_checksum(address: str) -> ChecksumAddress:
+    """to_checksum_address có bộ nhớ đệm, tránh tính keccak lại cho cùng một địa chỉ."""
+    return AsyncWeb3.to_checksum_address(address)
+
+
+def abi_fingerprint(abi: List[Dict[str, Any]]) -> str:
+    """
+    Dấu vân tay nội dung của ABI. ABI hằng số của mô-đun chỉ được băm một lần
+    (nhớ theo id), ABI giống nhau tạo ở nơi khác cho cùng dấu vân tay.
+    """
+    if not hasattr(abi_fingerprint, "_by_id"):
+        abi_fingerprint._by_id = {}
+    cached = abi_fingerprint._by_id.get(id(abi))
+    # Giữ tham chiếu tới ABI để id không bị dùng lại cho đối tượng khác
+    if cached is not None and cached[0] is abi:
+        return cached[1]
+
+    encoded = json.dumps(abi, sort_keys=True, separators=(",", ":")).encode()
+    fingerprint = hashlib.sha1(encoded).hexdigest()
+    if len(abi_fingerprint._by_id) >= MAX_FINGERPRINTS:
+        abi_fingerprint._by_id.clear()
+    abi_fingerprint._by_id[id(abi)] = (abi, fingerprint)
+    return fingerprint
+
+
+class FunctionCodec:
+    """
+    Bộ mã hóa/giải mã cho một hàm của ABI: selector và kiểu tham số được
+    tính một lần, mỗi lần mã hóa chỉ còn gọi eth_abi trực tiếp.
+    """
+
+    def __init__(self, fn_abi: Dict[str, Any]):
+        self.name = fn_abi["name"]
+        self.selector = function_abi_to_4byte_selector(fn_abi)
+        self.input_types = get_abi_input_types(fn_abi)
+        self.output_types = get_abi_output_types(fn_abi)
+
+    def encode(self, *args: Any) -> str:
+        """Mã hóa calldata (selector + tham số) dưới dạng chuỗi hex."""
+        return "0x" + (self.selector + encode(self.input_types, args)).hex()
+
+    def decode(self, data: bytes) -> Tuple[Any, ...]:
+        """Giải mã kết quả eth_call của hàm."""
+        return decode(self.output_types, data)
+
+
+def get_function_codec(
+    abi: List[Dict[str, Any]], fn_name: str, arg_count: Optional[int] = None
+) -> FunctionCodec:
+    """
+    Lấy FunctionCodec dùng chung cho hàm fn_name của ABI.
+
+    Args:
+        abi: ABI hợp đồng
+        fn_name: Tên hàm
+        arg_count: Số tham số, dùng để chọn khi hàm bị nạp chồng
+    """
+    if not hasattr(get_function_codec, "_codecs"):
+        get_function_codec._codecs = {}
+    key = (abi_fingerprint(abi), fn_name, arg_count)
+    codec = get_function_codec._codecs.get(key)
+    if codec is None:
+        candidates = [
+            item
+            for item in abi
+            if item.get("type", "function") == "function"
+            and item.get("name") == fn_name
+            and (arg_count is None or len(item.get("inputs", [])) == arg_count)
+        ]
+        if len(candidates) != 1:
+            raise ValueError(
+                f"Không tìm thấy hàm {fn_name} duy nhất trong ABI ({len(candidates)} kết quả)"
+            )
+        codec = FunctionCodec(candidates[0])
+        get_function_codec._codecs[key] = codec
+    return codec
+
+
+@dataclass(frozen=True)
+class PreparedCall:
+    """Lệnh gọi hợp đồng đã mã hóa, sẵn sàng ghép thành giao dịch tại chỗ."""
+
+    to: ChecksumAddress
+    data: str
+    value: int = 0
+
+    def as_transaction(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Ghép giao dịch tại chỗ, không gọi RPC như build_transaction của web3.
+
+        Args:
+            extra: Các trường bổ sung (from, gas, giá gas, nonce...)
+        """
+        return {"to": self.to, "data": self.data, "value": self.value, **(extra or {})}
+
+
+def prepare_call(
+    address: str,
+    abi: List[Dict[str, Any]],
+    fn_name: str,
+    *args: Any,
+    value: int = 0,
+) -> PreparedCall:
+    """
+    Mã hóa lệnh gọi hợp đồng mà không cần đối tượng hợp đồng của web3.
+
+    Args:
+        address: Địa chỉ hợp đồng
+        abi: ABI hợp đồng
+        fn_name: Tên hàm
+        *args: Tham số của hàm
+        value: Số wei gửi kèm
+    """
+    codec = get_function_codec(abi, fn_name, len(args))
+    return PreparedCall(to=to_checksum(address), data=codec.encode(*args), value=value)
+
+
+class ContractRegistry:
+    """
+    Bộ nhớ đệm đối tượng hợp đồng theo (thể hiện AsyncWeb3, địa chỉ, dấu vân tay ABI).
+    Đối tượng hợp đồng gắn với AsyncWeb3 của tài khoản (chuỗi, proxy), nên được
+    nhớ riêng cho mỗi thể hiện và tự giải phóng khi thể hiện bị thu hồi.
+    Tạo hợp đồng mất vài mili giây để phân tích ABI, dùng lại thì gần như miễn phí.
+    """
+
+    def __init__(self):
+        self._contracts: "weakref.WeakKeyDictionary[AsyncWeb3, Dict[Tuple[Optional[str], str], AsyncContract]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(
+        self,
+        web3: AsyncWeb3,
+        address: Optional[str],
+        abi: List[Dict[str, Any]],
+    ) -> AsyncContract:
+        """
+        Lấy đối tượng hợp đồng, tạo mới nếu chưa có.
+
+        Args:
+            web3: Thể hiện AsyncWeb3 dùng cho lệnh gọi
+            address: Địa chỉ hợp đồng (None nếu chỉ dùng để mã hóa)
+            abi: ABI hợp đồng
+        """
+        checksum_address = to_checksum(address) if address else None
+        key = (checksum_address, abi_fingerprint(abi))
+        contracts = self._contracts.get(web3)
+        if contracts is None:
+            contracts = {}
+            self._contracts[web3] = contracts
+
+        contract = contracts.get(key)
+        if contract is None:
+            if checksum_address is None:
+                contract = web3.eth.contract(abi=abi)
+            else:
+                contract = web3.eth.contract(address=checksum_address, abi=abi)
+            contracts[key] = contract
+        return contract
+
+
+def get_contract_registry() -> ContractRegistry:
+    """Lấy ContractRegistry dùng chung"""
+    if not hasattr(get_contract_registry, "_registry"):
+        get_contract_registry._registry = ContractRegistry()
+    return get_contract_registry._registry
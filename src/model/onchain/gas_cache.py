@@ -0,0 +1,133 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+from hexbytes import HexBytes
+
+# (chain_id, địa chỉ nhận hoặc "create", selector, số word calldata, có gửi value hay không)
+GasKey = Tuple[Optional[int], str, str, int, bool]
+
+# Giao dịch đã gửi nhưng không ai chờ biên lai bị bỏ khỏi danh sách theo tuổi và số lượng
+PENDING_TTL = 3600.0
+MAX_PENDING = 10000
+
+
+@dataclass
+class _GasEntry:
+    min_used: int
+    max_used: int
+    samples: int = 1
+
+
+def _calldata(tx: Dict[str, Any]) -> bytes:
+    data = tx.get("data") or tx.get("input") or b""
+    if isinstance(data, str):
+        return bytes(HexBytes(data)) if data not in ("", "0x") else b""
+    return bytes(data)
+
+
+def gas_key(chain_id: Optional[int], tx: Dict[str, Any]) -> GasKey:
+    """
+    Khóa theo hình dạng lời gọi: cùng hợp đồng, cùng hàm, cùng số word tham số
+    và cùng việc có gửi value hay không thường tiêu tốn cùng một lượng gas.
+    """
+    data = _calldata(tx)
+    to = tx.get("to") or "create"
+    selector = data[:4].hex() if to != "create" else ""
+    words = (max(0, len(data) - 4) + 31) // 32
+    return chain_id, str(to).lower(), selector, words, bool(tx.get("value"))
+
+
+class GasEstimateCache:
+    """
+    Bộ nhớ đệm giới hạn gas theo hình dạng lời gọi, học từ gasUsed trong biên lai.
+
+    Lời gọi có lượng gas cố định (triển khai hợp đồng, GM, faucet, approve ERC-20)
+    được gán giới hạn gas = gasUsed lớn nhất đã thấy x margin, không cần eth_estimateGas.
+    Lời gọi có gasUsed dao động nhiều hơn max_spread giữa các lần không được phục vụ
+    từ bộ nhớ đệm; giao dịch thất bại xóa mục tương ứng để lần sau ước lượng lại.
+    Nơi gọi vẫn phải kiểm tra revert (eth_call với đúng giới hạn gas đó) khi dùng
+    giới hạn gas từ bộ nhớ đệm, và ước lượng trực tiếp nếu eth_call thất bại.
+    """
+
+    def __init__(self, margin: float = 1.3, min_samples: int = 3, max_spread: float = 0.2):
+        self.margin = margin
+        self.min_samples = min_samples
+        self.max_spread = max_spread
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[GasKey, _GasEntry] = {}
+        # Hash giao dịch đang chờ biên lai -> (khóa, thời điểm gửi), theo thứ tự gửi
+        self._pending: "OrderedDict[str, Tuple[GasKey, float]]" = OrderedDict()
+
+    def lookup(self, chain_id: Optional[int], tx: Dict[str, Any]) -> Optional[int]:
+        """Giới hạn gas (đã có margin) cho giao dịch, None nếu cần ước lượng trực tiếp."""
+        entry = self._entries.get(gas_key(chain_id, tx))
+        if (
+            entry is None
+            or entry.samples < self.min_samples
+            or entry.max_used > entry.min_used * (1 + self.max_spread)
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return int(entry.max_used * self.margin)
+
+    def learn(self, key: GasKey, gas_used: int) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = _GasEntry(gas_used, gas_used)
+            return
+        entry.min_used = min(entry.min_used, gas_used)
+        entry.max_used = max(entry.max_used, gas_used)
+        entry.samples += 1
+
+    def forget(self, key: GasKey) -> None:
+        self._entries.pop(key, None)
+
+    def track(
+        self,
+        chain_id: Optional[int],
+        tx: Dict[str, Any],
+        tx_hash: Union[HexBytes, str],
+    ) -> None:
+        """Ghi nhớ giao dịch đã gửi để học gasUsed khi có biên lai."""
+        now = time.monotonic()
+        self._pending[HexBytes(tx_hash).hex()] = (gas_key(chain_id, tx), now)
+        # Bỏ giao dịch cũ mà không ai chờ biên lai (observe không bao giờ được gọi)
+        while self._pending:
+            _, (_, sent_at) = next(iter(self._pending.items()))
+            if len(self._pending) <= MAX_PENDING and now - sent_at <= PENDING_TTL:
+                break
+            self._pending.popitem(last=False)
+
+    def observe(self, receipt: Dict[str, Any]) -> None:
+        """Học gasUsed từ biên lai của giao dịch đã track()."""
+        pending = self._pending.pop(HexBytes(receipt["transactionHash"]).hex(), None)
+        if pending is None:
+            return
+        key = pending[0]
+        if receipt.get("status") == 1:
+            self.learn(key, receipt["gasUsed"])
+        else:
+            # Có thể hết gas với giới hạn từ bộ nhớ đệm: lần sau ước lượng trực tiếp
+            self.forget(key)
+
+
+def get_gas_cache() -> Optional[GasEstimateCache]:
+    """Lấy GasEstimateCache dùng chung, None nếu RPC_SETTINGS.GAS_CACHE bị tắt"""
+    if not hasattr(get_gas_cache, "_cache"):
+        from src.utils.config import get_config
+
+        gas_cache = get_config().RPC_SETTINGS.GAS_CACHE
+        get_gas_cache._cache = (
+            GasEstimateCache(
+                margin=gas_cache.MARGIN,
+                min_samples=gas_cache.MIN_SAMPLES,
+                max_spread=gas_cache.MAX_SPREAD,
+            )
+            if gas_cache.ENABLED
+            else None
+        )
+    return get_gas_cache._cache
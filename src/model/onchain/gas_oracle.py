@@ -0,0 +1,179 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from web3 import AsyncWeb3
+
+# Khoảng làm mới tối thiểu khi làm mới theo từng khối (giây)
+MIN_REFRESH_INTERVAL = 0.5
+
+
+@dataclass
+class _CachedValue:
+    value: Any
+    fetched_at: float
+    block: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class FeeEstimate:
+    """Phí EIP-1559 ước lượng từ eth_feeHistory."""
+
+    base_fee: int  # phí cơ bản của khối tiếp theo
+    max_priority_fee: int  # phân vị phí ưu tiên của các khối gần đây
+
+    def params(
+        self, base_fee_multiplier: float, priority_multiplier: float = 1.0
+    ) -> Dict[str, int]:
+        """
+        maxFeePerGas = phí cơ bản x base_fee_multiplier + phí ưu tiên.
+        Chỉ phí thực tế (phí cơ bản + phí ưu tiên) bị trừ, phần dư của maxFeePerGas không bị tính.
+        """
+        priority_fee = int(self.max_priority_fee * priority_multiplier)
+        return {
+            "maxFeePerGas": int(self.base_fee * base_fee_multiplier) + priority_fee,
+            "maxPriorityFeePerGas": priority_fee,
+        }
+
+
+class GasOracle:
+    """
+    Nguồn giá gas dùng chung cho mọi tài khoản trên cùng một nhóm RPC.
+    Giá trị được làm mới theo khoảng thời gian cấu hình (hoặc mỗi khối mới)
+    và phục vụ từ bộ nhớ; nhiều tài khoản yêu cầu cùng lúc chỉ tạo một lần truy vấn.
+    Hệ số nhân (1.5x, 1.1x...) do từng nơi gọi tự áp dụng.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float,
+        fee_history_blocks: int = 10,
+        priority_percentile: float = 50,
+        base_fee_multiplier: float = 2.0,
+    ):
+        self.refresh_interval = refresh_interval
+        self.fee_history_blocks = fee_history_blocks
+        self.priority_percentile = priority_percentile
+        self.base_fee_multiplier = base_fee_multiplier
+        self.block_time: Optional[float] = None  # dùng khi refresh_interval = 0
+        self._values: Dict[str, _CachedValue] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._latest_block: Optional[int] = None
+
+    @property
+    def ttl(self) -> float:
+        if self.refresh_interval > 0:
+            return self.refresh_interval
+        return max(self.block_time or MIN_REFRESH_INTERVAL, MIN_REFRESH_INTERVAL)
+
+    def _fresh(self, cached: Optional[_CachedValue]) -> bool:
+        if cached is None:
+            return False
+        if (
+            self._latest_block is not None
+            and cached.block is not None
+            and self._latest_block > cached.block
+        ):
+            return False
+        return time.monotonic() - cached.fetched_at < self.ttl
+
+    def peek(self, name: str) -> Optional[Any]:
+        """Lấy giá trị còn hiệu lực mà không gửi yêu cầu."""
+        cached = self._values.get(name)
+        return cached.value if self._fresh(cached) else None
+
+    def update(self, name: str, value: Any) -> None:
+        """Cập nhật giá trị lấy được từ nơi khác (ví dụ trong yêu cầu batch)."""
+        self._values[name] = _CachedValue(value, time.monotonic(), self._latest_block)
+
+    def on_new_block(self, block_number: int) -> None:
+        """Đánh dấu giá trị cũ khi có khối mới (chỉ ảnh hưởng khi làm mới theo khối)."""
+        if self.refresh_interval <= 0:
+            self._latest_block = max(block_number, self._latest_block or 0)
+
+    def invalidate(self) -> None:
+        self._values.clear()
+
+    async def _get(self, name: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.peek(name)
+        if value is not None:
+            return value
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            value = self.peek(name)
+            if value is None:
+                value = await fetch()
+                self.update(name, value)
+            return value
+
+    async def gas_price(self, web3: AsyncWeb3) -> int:
+        return await self._get("gas_price", lambda: web3.eth.gas_price)
+
+    async def max_priority_fee(self, web3: AsyncWeb3) -> int:
+        return await self._get("max_priority_fee", lambda: web3.eth.max_priority_fee)
+
+    async def base_fee(self, web3: AsyncWeb3) -> int:
+        async def fetch() -> int:
+            latest = await web3.eth.get_block("latest")
+            self.on_new_block(latest["number"])
+            return latest["baseFeePerGas"]
+
+        return await self._get("base_fee", fetch)
+
+    async def fee_estimate(self, web3: AsyncWeb3) -> FeeEstimate:
+        """
+        Phí EIP-1559 từ một lần gọi eth_feeHistory cho mọi tài khoản: phí cơ bản của khối
+        tiếp theo và trung vị (theo khối) của phân vị phí ưu tiên đã trả trong các khối gần đây.
+        """
+
+        async def fetch() -> FeeEstimate:
+            history = await web3.eth.fee_history(
+                self.fee_history_blocks, "latest", [self.priority_percentile]
+            )
+            gas_used_ratios = history["gasUsedRatio"]
+            self.on_new_block(history["oldestBlock"] + len(gas_used_ratios) - 1)
+            base_fee = history["baseFeePerGas"][-1]
+            self.update("base_fee", base_fee)
+
+            # Khối trống báo phí ưu tiên 0, không phản ánh mức phí cần trả
+            rewards = sorted(
+                reward[0]
+                for reward, ratio in zip(history.get("reward") or [], gas_used_ratios)
+                if reward and ratio > 0
+            )
+            if rewards:
+                priority_fee = rewards[len(rewards) // 2]
+            else:
+                priority_fee = await self.max_priority_fee(web3)
+            return FeeEstimate(base_fee=base_fee, max_priority_fee=priority_fee)
+
+        return await self._get("fee_estimate", fetch)
+
+    async def fee_params(
+        self, web3: AsyncWeb3, priority_multiplier: float = 1.0
+    ) -> Dict[str, int]:
+        """maxFeePerGas/maxPriorityFeePerGas sẵn sàng để thêm vào giao dịch."""
+        estimate = await self.fee_estimate(web3)
+        return estimate.params(self.base_fee_multiplier, priority_multiplier)
+
+
+def get_gas_oracle(urls: Iterable[str]) -> GasOracle:
+    """Lấy GasOracle dùng chung cho một danh sách RPC"""
+    if not hasattr(get_gas_oracle, "_oracles"):
+        get_gas_oracle._oracles = {}
+    key = tuple(urls)
+    oracle = get_gas_oracle._oracles.get(key)
+    if oracle is None:
+        from src.utils.config import get_config
+
+        gas_oracle = get_config().RPC_SETTINGS.GAS_ORACLE
+        oracle = GasOracle(
+            gas_oracle.REFRESH_INTERVAL,
+            fee_history_blocks=gas_oracle.FEE_HISTORY_BLOCKS,
+            priority_percentile=gas_oracle.PRIORITY_PERCENTILE,
+            base_fee_multiplier=gas_oracle.BASE_FEE_MULTIPLIER,
+        )
+        get_gas_oracle._oracles[key] = oracle
+    return oracle
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Dict, Optional, Tuple
+
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import AsyncWeb3
+
+# Lỗi cho biết nonce cục bộ đã lệch so với chuỗi
+NONCE_ERRORS = (
+    "nonce too low",
+    "replacement transaction underpriced",
+    "replacement underpriced",
+    "invalid nonce",
+    "nonce has already been used",
+)
+
+# Số nonce chờ tối đa được giữ cho mỗi ví: nút chỉ giữ vài chục giao dịch chờ của một ví,
+# nonce cũ hơn chắc chắn đã được khai thác hoặc bị thay thế dù không ai chờ biên lai
+MAX_PENDING = 64
+
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Cấp phát nonce cục bộ cho một ví trên một chuỗi.
+    Nonce được lấy từ chuỗi một lần, sau đó tăng tại chỗ nên nhiều giao dịch
+    có thể được gửi liên tiếp mà không cần chờ giao dịch trước được khai thác.
+    """
+
+    def __init__(self, chain_id: int, address: str):
+        self.chain_id = chain_id
+        self.address = address
+        self.pending: Dict[int, Optional[HexBytes]] = {}  # nonce -> hash giao dịch
+        self._next: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def synced(self) -> bool:
+        return self._next is not None
+
+    def seed(self, chain_nonce: int) -> None:
+        """Đồng bộ với nonce lấy từ chuỗi (ví dụ trong một yêu cầu batch)."""
+        if self._next is None or chain_nonce > self._next:
+            self._next = chain_nonce
+        self._prune(chain_nonce)
+
+    def _prune(self, below: int) -> None:
+        """Bỏ các nonce nhỏ hơn below khỏi danh sách chờ (đã được khai thác)."""
+        for nonce in [n for n in self.pending if n < below]:
+            del self.pending[nonce]
+
+    def allocate_local(self) -> int:
+        """Cấp nonce tiếp theo, yêu cầu đã đồng bộ."""
+        if self._next is None:
+            raise RuntimeError(f"NonceManager cho {self.address} chưa được đồng bộ")
+        nonce = self._next
+        self._next += 1
+        self.pending[nonce] = None
+        # Giao dịch gửi đi mà không ai chờ biên lai không bao giờ gọi confirmed()
+        self._prune(self._next - MAX_PENDING)
+        return nonce
+
+    async def allocate(self, web3: AsyncWeb3) -> int:
+        """Cấp nonce tiếp theo, đồng bộ từ chuỗi nếu cần."""
+        async with self._lock:
+            if self._next is None:
+                self.seed(await web3.eth.get_transaction_count(self.address, "pending"))
+            return self.allocate_local()
+
+    def submitted(self, nonce: int, tx_hash: HexBytes) -> None:
+        self.pending[nonce] = tx_hash
+
+    def confirmed(self, tx_hash: HexBytes) -> None:
+        """
+        Giao dịch đã được khai thác: bỏ nó và mọi nonce nhỏ hơn khỏi danh sách chờ,
+        vì giao dịch của một ví được khai thác theo thứ tự nonce.
+        """
+        for nonce, pending_hash in list(self.pending.items()):
+            if pending_hash == tx_hash:
+                self._prune(nonce + 1)
+                return
+
+    def release(self, nonce: int) -> None:
+        """
+        Trả lại nonce của giao dịch không gửi được. Nếu đó là nonce cuối cùng thì
+        dùng lại, nếu không thì đồng bộ lại từ chuỗi ở lần cấp tiếp theo để tránh khoảng trống.
+        """
+        self.pending.pop(nonce, None)
+        if self._next is not None and nonce == self._next - 1:
+            self._next = nonce
+        else:
+            self._next = None
+
+    async def resync(self, web3: AsyncWeb3) -> int:
+        """Đồng bộ lại từ chuỗi sau lỗi "nonce too low" / "replacement underpriced"."""
+        async with self._lock:
+            chain_nonce = await web3.eth.get_transaction_count(self.address, "pending")
+            logger.warning(
+                f"Đồng bộ lại nonce cho {self.address}: {self._next} -> {chain_nonce}"
+            )
+            self._next = chain_nonce
+            self._prune(chain_nonce)
+            return chain_nonce
+
+
+def get_nonce_manager(chain_id: int, address: str) -> NonceManager:
+    """Lấy NonceManager dùng chung cho một ví trên một chuỗi"""
+    if not hasattr(get_nonce_manager, "_managers"):
+        get_nonce_manager._managers = {}
+    key: Tuple[int, str] = (chain_id, address.lower())
+    manager = get_nonce_manager._managers.get(key)
+    if manager is None:
+        manager = NonceManager(chain_id, address)
+        get_nonce_manager._managers[key] = manager
+    return manager
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from eth_abi import decode
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+
+from src.utils.decorators import NonRetryableError
+
+# Error(string) và Panic(uint256) của Solidity
+ERROR_SELECTOR = bytes.fromhex("08c379a0")
+PANIC_SELECTOR = bytes.fromhex("4e487b71")
+# allowance(address,address)
+ALLOWANCE_SELECTOR = "0xdd62ed3e"
+MAX_UINT256 = 2**256 - 1
+# Số slot lưu trữ đầu tiên được thử khi tìm mapping allowance của token
+MAX_PROBE_SLOT = 12
+# Giá trị ghi đè khi tìm slot, nhận ra được trong kết quả allowance()
+PROBE_VALUE = 0x5AFE5107
+
+# Các trường giao dịch được gửi trong eth_call
+CALL_FIELDS = ("from", "to", "data", "value", "gas")
+
+
+class PreflightError(NonRetryableError):
+    """Mô phỏng eth_call cho thấy giao dịch sẽ bị revert; giao dịch không được ký và gửi."""
+
+    def __init__(self, reason: str, index: int = 0):
+        super().__init__(f"Giao dịch sẽ bị revert: {reason}")
+        self.reason = reason
+        self.index = index
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """
+    Kết quả mô phỏng một giao dịch.
+    success=False và reverted=False - không mô phỏng được (RPC lỗi, không hỗ trợ
+    state override...), nơi gọi nên gửi giao dịch như bình thường.
+    """
+
+    success: bool = False
+    reverted: bool = False
+    output: bytes = b""
+    reason: Optional[str] = None
+
+
+def _hex(value: Any) -> str:
+    if isinstance(value, int):
+        return hex(value)
+    if isinstance(value, (bytes, bytearray)):
+        return HexBytes(value).to_0x_hex()
+    return value
+
+
+def call_params(tx: Dict[str, Any]) -> Dict[str, Any]:
+    """Giao dịch (to, data, value, ...) thành tham số JSON của eth_call."""
+    return {k: _hex(tx[k]) for k in CALL_FIELDS if tx.get(k) not in (None, "")}
+
+
+def decode_revert(error: Dict[str, Any]) -> str:
+    """Lý do revert đọc được từ đối tượng lỗi JSON-RPC."""
+    data = error.get("data")
+    if isinstance(data, dict):
+        data = data.get("data")
+    if isinstance(data, str) and data.startswith("0x"):
+        raw = bytes(HexBytes(data))
+        try:
+            if raw[:4] == ERROR_SELECTOR:
+                return decode(["string"], raw[4:])[0]
+            if raw[:4] == PANIC_SELECTOR:
+                return f"panic {hex(decode(['uint256'], raw[4:])[0])}"
+        except Exception:
+            pass
+        if raw:
+            return f"{error.get('message', 'execution reverted')} ({data[:10]})"
+    return error.get("message") or str(error)
+
+
+def is_revert(error: Dict[str, Any]) -> bool:
+    """Lỗi eth_call do hợp đồng revert, phân biệt với lỗi RPC (tham số, giới hạn...)."""
+    message = str(error.get("message", "")).lower()
+    return error.get("code") == 3 or "revert" in message
+
+
+def _result(response: Dict[str, Any]) -> SimulationResult:
+    if "result" in response:
+        return SimulationResult(success=True, output=bytes(HexBytes(response["result"] or "0x")))
+    error = response.get("error") or {}
+    if is_revert(error):
+        return SimulationResult(reverted=True, reason=decode_revert(error))
+    return SimulationResult(reason=str(error.get("message") or error))
+
+
+async def simulate(
+    web3: AsyncWeb3,
+    txs: Sequence[Dict[str, Any]],
+    state_override: Optional[Dict[str, Any]] = None,
+    block: str = "latest",
+) -> List[SimulationResult]:
+    """
+    Mô phỏng các giao dịch bằng eth_call trong một yêu cầu batch.
+    Mỗi giao dịch được mô phỏng độc lập trên cùng trạng thái khối; kết quả của bước trước
+    (approve, nạp tiền) được đưa vào bằng state_override ({địa chỉ: {"balance", "stateDiff"}}).
+    """
+    if not txs:
+        return []
+    requests = []
+    for tx in txs:
+        params = [call_params(tx), block]
+        if state_override:
+            params.append(state_override)
+        requests.append(("eth_call", params))
+    try:
+        responses = await web3.provider.make_batch_request(requests)
+    except Exception as e:
+        return [SimulationResult(reason=str(e)) for _ in txs]
+    if not isinstance(responses, list):
+        reason = str(responses.get("error"))
+        return [SimulationResult(reason=reason) for _ in txs]
+    return [_result(response) for response in responses]
+
+
+def _word(value: int) -> str:
+    return "0x" + value.to_bytes(32, "big").hex()
+
+
+def mapping_slot(key: str, slot: int) -> bytes:
+    """Vị trí lưu trữ của mapping[key] khai báo tại slot (bố cục lưu trữ của Solidity)."""
+    return keccak(bytes(HexBytes(key)).rjust(32, b"\0") + slot.to_bytes(32, "big"))
+
+
+def allowance_slot(owner: str, spender: str, slot: int) -> str:
+    """Vị trí lưu trữ của allowance[owner][spender] với mapping allowance tại slot."""
+    inner = mapping_slot(owner, slot)
+    return "0x" + keccak(bytes(HexBytes(spender)).rjust(32, b"\0") + inner).hex()
+
+
+async def find_allowance_slot(
+    web3: AsyncWeb3, token: str, owner: str, spender: str
+) -> Optional[int]:
+    """
+    Tìm slot của mapping allowance trong token ERC-20: ghi đè từng slot ứng viên bằng
+    state override và gọi allowance() trong một yêu cầu batch. Kết quả được nhớ theo token.
+    """
+    if not hasattr(find_allowance_slot, "_slots"):
+        find_allowance_slot._slots = {}
+    key = token.lower()
+    if key in find_allowance_slot._slots:
+        return find_allowance_slot._slots[key]
+
+    data = (
+        ALLOWANCE_SELECTOR
+        + owner[2:].lower().rjust(64, "0")
+        + spender[2:].lower().rjust(64, "0")
+    )
+    requests = [
+        (
+            "eth_call",
+            [
+                {"to": token, "data": data},
+                "latest",
+                {token: {"stateDiff": {allowance_slot(owner, spender, slot): _word(PROBE_VALUE)}}},
+            ],
+        )
+        for slot in range(MAX_PROBE_SLOT)
+    ]
+    try:
+        responses = await web3.provider.make_batch_request(requests)
+    except Exception:
+        return None
+    if not isinstance(responses, list):
+        return None
+
+    slot = None
+    for candidate, response in enumerate(responses):
+        result = response.get("result")
+        if result and result != "0x" and int(result, 16) == PROBE_VALUE:
+            slot = candidate
+            break
+    find_allowance_slot._slots[key] = slot
+    return slot
+
+
+async def allowance_override(
+    web3: AsyncWeb3,
+    token: str,
+    owner: str,
+    spender: str,
+    amount: int = MAX_UINT256,
+) -> Optional[Dict[str, Any]]:
+    """
+    State override đặt allowance[owner][spender] = amount, dùng để mô phỏng bước
+    tiếp theo (deposit, swap) trước khi giao dịch approve được gửi.
+    None nếu không tìm được slot allowance hoặc RPC không hỗ trợ state override.
+    """
+    slot = await find_allowance_slot(web3, token, owner, spender)
+    if slot is None:
+        return None
+    return {token: {"stateDiff": {allowance_slot(owner, spender, slot): _word(amount)}}}
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.utils.circuit_breaker import proxy_host
+
+# Dấu hiệu lỗi JSON-RPC báo vượt giới hạn tần suất trong phản hồi HTTP 200
+RATE_LIMIT_MARKERS = (b"rate limit", b"too many requests", b"-32005")
+
+
+@dataclass
+class RateLimitSettings:
+    """
+    Cài đặt token bucket cho mỗi bộ (RPC, proxy).
+    Tần suất bắt đầu từ rate, tăng dần khi không bị giới hạn và giảm khi gặp 429.
+    """
+
+    rate: float = 20.0  # số yêu cầu/giây ban đầu
+    burst: float = 20.0  # số yêu cầu tối đa gửi liền một lúc
+    min_rate: float = 1.0
+    max_rate: float = 200.0
+    increase: float = 5.0  # tăng thêm (yêu cầu/giây) sau mỗi giây không bị giới hạn
+    decrease: float = 0.5  # nhân tần suất với hệ số này khi gặp 429
+    max_pause: float = 60.0  # thời gian tạm dừng tối đa theo Retry-After (giây)
+
+
+class TokenBucket:
+    """
+    Token bucket bất đồng bộ: khi hết token, yêu cầu chờ đến lượt thay vì bị từ chối.
+    Tần suất tự điều chỉnh kiểu AIMD: tăng cộng khi thành công, giảm nhân khi gặp 429.
+    """
+
+    def __init__(self, name: str, settings: RateLimitSettings):
+        self.name = name
+        self.settings = settings
+        self.rate = settings.rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled = 0  # số phản hồi 429
+        self.waited = 0.0  # tổng thời gian chờ token (giây)
+        self._lock = asyncio.Lock()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, min(self.settings.burst, self.rate))
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _try_take(self, now: float) -> bool:
+        if now < self.paused_until:
+            return False
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """Chờ đến khi có token. Các yêu cầu đang chờ được phục vụ theo thứ tự đến."""
+        if not self._lock.locked() and self._try_take(time.monotonic()):
+            return
+
+        started_at = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self._try_take(now):
+                    break
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                else:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+        self.waited += time.monotonic() - started_at
+
+    def on_success(self) -> None:
+        if self.rate < self.settings.max_rate:
+            # Tăng increase yêu cầu/giây sau khoảng rate yêu cầu thành công (~1 giây)
+            self.rate = min(
+                self.settings.max_rate, self.rate + self.settings.increase / self.rate
+            )
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        now = time.monotonic()
+        self.throttled += 1
+        self.tokens = 0.0
+        self.updated_at = now
+        if retry_after:
+            self.paused_until = max(
+                self.paused_until, now + min(retry_after, self.settings.max_pause)
+            )
+
+        # Nhiều phản hồi 429 cho cùng một đợt yêu cầu chỉ giảm tần suất một lần
+        if now - self.last_decrease < max(1.0, 1 / self.rate):
+            return
+        self.last_decrease = now
+        self.rate = max(self.settings.min_rate, self.rate * self.settings.decrease)
+        logger.warning(
+            f"Vượt giới hạn tần suất tại {self.name}, giảm xuống {self.rate:.1f} yêu cầu/giây"
+            + (f", tạm dừng {retry_after:.0f} giây" if retry_after else "")
+        )
+
+
+class RateLimiter:
+    """Sổ đăng ký token bucket theo bộ (RPC, proxy), giữ tần suất đã học trong suốt quá trình chạy."""
+
+    def __init__(self, settings: Optional[RateLimitSettings] = None):
+        self.settings = settings or RateLimitSettings()
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+
+    def bucket(self, rpc_url: str, proxy: Optional[str]) -> TokenBucket:
+        key = (rpc_url, proxy)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            name = rpc_url if proxy is None else f"{rpc_url} (proxy {proxy_host(proxy)})"
+            bucket = TokenBucket(name, self.settings)
+            self._buckets[key] = bucket
+        return bucket
+
+    def summary(self) -> List[Tuple[str, float, int, float]]:
+        """(tên, tần suất hiện tại, số lần 429, tổng thời gian chờ) của các bucket."""
+        return [
+            (b.name, b.rate, b.throttled, b.waited) for b in self._buckets.values()
+        ]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Giá trị Retry-After (số giây hoặc ngày HTTP) thành số giây, None nếu không hợp lệ."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited_body(body: bytes) -> bool:
+    """Phản hồi JSON-RPC chứa lỗi vượt giới hạn tần suất (một số RPC trả về HTTP 200)."""
+    if b'"error"' not in body or len(body) > 4096:
+        return False
+    lowered = body.lower()
+    return any(marker in lowered for marker in RATE_LIMIT_MARKERS)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Lấy RateLimiter dùng chung theo cấu hình RPC_SETTINGS.RATE_LIMIT"""
+    if not hasattr(get_rate_limiter, "_limiter"):
+        from src.utils.config import get_config
+
+        rate_limit = get_config().RPC_SETTINGS.RATE_LIMIT
+        get_rate_limiter._limiter = RateLimiter(
+            RateLimitSettings(
+                rate=rate_limit.RATE,
+                burst=rate_limit.BURST,
+                min_rate=rate_limit.MIN_RATE,
+                max_rate=rate_limit.MAX_RATE,
+                increase=rate_limit.INCREASE,
+                decrease=rate_limit.DECREASE,
+                max_pause=rate_limit.MAX_PAUSE,
+            )
+        )
+    return get_rate_limiter._limiter
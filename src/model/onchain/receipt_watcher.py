@@ -0,0 +1,115 @@
+import asyncio
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+
+from hexbytes import HexBytes
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+
+from src.model.onchain.block_watcher import BlockWatcher
+
+if TYPE_CHECKING:
+    from src.model.onchain.web3_custom import Web3Custom
+
+
+class ReceiptWatcher(BlockWatcher):
+    """
+    Một tác vụ nền cho mỗi nhóm RPC theo dõi khối mới và lấy biên lai của tất cả
+    giao dịch đang chờ bằng yêu cầu batch, thay vì mỗi tài khoản tự hỏi
+    eth_getTransactionReceipt liên tục. Số yêu cầu tỷ lệ với số khối, không với số giao dịch.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        poll_interval: float,
+        batch_size: int,
+        proxy: Optional[str] = None,
+        ssl: bool = False,
+    ):
+        super().__init__(urls, poll_interval, proxy, ssl)
+        self.batch_size = batch_size
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    @property
+    def pending(self) -> int:
+        return len(self._waiters)
+
+    def _has_waiters(self) -> bool:
+        return bool(self._waiters)
+
+    async def wait(
+        self,
+        source: "Web3Custom",
+        tx_hash: Union[HexBytes, str],
+        timeout: float = 120,
+    ) -> TxReceipt:
+        """
+        Chờ biên lai giao dịch.
+
+        Args:
+            source: Thể hiện Web3Custom (cung cấp thông tin chuỗi khi tạo kết nối)
+            tx_hash: Hash giao dịch
+            timeout: Thời gian chờ tối đa (giây)
+
+        Raises:
+            TimeExhausted: Nếu không có biên lai trong thời gian chờ
+        """
+        key = HexBytes(tx_hash).to_0x_hex()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, []).append(future)
+        self._ensure_running(source)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(
+                f"Giao dịch {key} chưa có trong chuỗi sau {timeout} giây"
+            )
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[key]
+
+    async def _on_block(self, block: int) -> None:
+        hashes = list(self._waiters)
+        provider = self._web3.provider
+        for start in range(0, len(hashes), self.batch_size):
+            chunk = hashes[start : start + self.batch_size]
+            responses = await provider.make_batch_request(
+                [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in chunk]
+            )
+            if not isinstance(responses, list):
+                raise Exception(responses.get("error"))
+
+            for tx_hash, response in zip(chunk, responses):
+                raw_receipt = response.get("result")
+                if not raw_receipt:
+                    continue
+                receipt = AttributeDict.recursive(receipt_formatter(raw_receipt))
+                for future in self._waiters.pop(tx_hash, []):
+                    if not future.done():
+                        future.set_result(receipt)
+
+
+def get_receipt_watcher(urls: Iterable[str]) -> ReceiptWatcher:
+    """Lấy ReceiptWatcher dùng chung cho một danh sách RPC"""
+    if not hasattr(get_receipt_watcher, "_watchers"):
+        get_receipt_watcher._watchers = {}
+    key = tuple(urls)
+    watcher = get_receipt_watcher._watchers.get(key)
+    if watcher is None:
+        from src.utils.config import get_config
+
+        receipts = get_config().RPC_SETTINGS.RECEIPTS
+        watcher = ReceiptWatcher(
+            key,
+            receipts.POLL_INTERVAL,
+            receipts.BATCH_SIZE,
+            f"http://{receipts.PROXY}" if receipts.PROXY else None,
+        )
+        get_receipt_watcher._watchers[key] = watcher
+    return watcher
@@ -0,0 +1,298 @@
+import bisect
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.model.onchain.preflight import is_revert
+from src.utils.circuit_breaker import proxy_host
+
+# Ranh giới các ô của biểu đồ độ trễ (giây): từ 1 ms đến ~100 giây, mỗi ô lớn hơn ô trước 25%
+LATENCY_BOUNDS: Tuple[float, ...] = tuple(0.001 * 1.25**i for i in range(52))
+
+_METHOD_RE = re.compile(rb'"method"\s*:\s*"([^"]+)"')
+
+
+def request_methods(data: bytes) -> List[str]:
+    """Tên các phương thức JSON-RPC trong yêu cầu đã mã hóa (đơn lẻ hoặc batch)."""
+    if data.startswith(b"["):
+        return [m.decode() for m in _METHOD_RE.findall(data)]
+    match = _METHOD_RE.search(data)
+    return [match.group(1).decode()] if match else []
+
+
+def response_error(body: bytes) -> Optional[str]:
+    """
+    Lớp lỗi JSON-RPC trong phản hồi: "revert" nếu mọi lỗi là hợp đồng revert
+    (ví dụ mô phỏng trước khi gửi cho thấy giao dịch sẽ thất bại), "rpc_error" nếu
+    có lỗi khác, None nếu không có lỗi.
+    """
+    if b'"error"' not in body:
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return "rpc_error"
+    responses = payload if isinstance(payload, list) else [payload]
+    errors = [
+        response["error"]
+        for response in responses
+        if isinstance(response, dict) and isinstance(response.get("error"), dict)
+    ]
+    if not errors:
+        return None
+    return "revert" if all(is_revert(error) for error in errors) else "rpc_error"
+
+
+def request_label(methods: List[str]) -> str:
+    """Nhãn của yêu cầu: tên phương thức, batch:<phương thức> hoặc batch:mixed."""
+    if len(methods) == 1:
+        return methods[0]
+    if methods and all(method == methods[0] for method in methods):
+        return f"batch:{methods[0]}"
+    return "batch:mixed"
+
+
+class LatencyHistogram:
+    """Biểu đồ độ trễ với các ô cố định theo thang log: ghi O(log n), bộ nhớ cố định."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def since(self, earlier: "LatencyHistogram") -> "LatencyHistogram":
+        """Biểu đồ của các mẫu ghi sau thời điểm chụp earlier."""
+        delta = LatencyHistogram()
+        delta.counts = [a - b for a, b in zip(self.counts, earlier.counts)]
+        delta.count = self.count - earlier.count
+        delta.total = self.total - earlier.total
+        delta.max = self.max
+        return delta
+
+    def percentile(self, percent: float) -> float:
+        """Cận trên của ô chứa phân vị (sai số tối đa 25%)."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BOUNDS[i] if i < len(LATENCY_BOUNDS) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class RequestStats:
+    """Thống kê yêu cầu HTTP/WebSocket tới một RPC cho một nhãn phương thức."""
+
+    requests: int = 0
+    errors: Counter = field(default_factory=Counter)  # lớp lỗi -> số lần
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def merge(self, other: "RequestStats") -> None:
+        self.requests += other.requests
+        self.errors.update(other.errors)
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.latency.merge(other.latency)
+
+    def since(self, earlier: "RequestStats") -> "RequestStats":
+        """Số liệu của các yêu cầu ghi sau thời điểm chụp earlier (xem RpcMetrics.totals)."""
+        return RequestStats(
+            requests=self.requests - earlier.requests,
+            errors=self.errors - earlier.errors,
+            bytes_sent=self.bytes_sent - earlier.bytes_sent,
+            bytes_received=self.bytes_received - earlier.bytes_received,
+            latency=self.latency.since(earlier.latency),
+        )
+
+
+class RpcMetrics:
+    """
+    Số liệu RPC của toàn bộ tiến trình theo (nhãn phương thức, RPC, proxy):
+    số yêu cầu, lớp lỗi, số byte và biểu đồ độ trễ. Ngoài ra đếm số lời gọi
+    JSON-RPC của mỗi phương thức, kể cả lời gọi nằm trong batch.
+    """
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str, Optional[str]], RequestStats] = {}
+        self.calls: Counter = Counter()
+        # Sự kiện ngoài tầng vận chuyển (ví dụ nonce_error), dùng cho bộ điều khiển luồng
+        self.events: Counter = Counter()
+
+    def record_event(self, name: str) -> None:
+        self.events[name] += 1
+
+    def record(
+        self,
+        data: bytes,
+        rpc_url: str,
+        proxy: Optional[str],
+        seconds: float,
+        body: Optional[bytes] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Ghi lại một yêu cầu đã gửi.
+
+        Args:
+            data: Yêu cầu JSON-RPC đã mã hóa
+            rpc_url: RPC nhận yêu cầu
+            proxy: Proxy đã dùng (None - kết nối trực tiếp)
+            seconds: Thời gian từ lúc gửi đến khi có phản hồi hoặc lỗi
+            body: Phản hồi thô (None nếu lỗi)
+            error: Lớp lỗi (None nếu thành công)
+        """
+        methods = request_methods(data)
+        self.calls.update(methods)
+        key = (request_label(methods), rpc_url, proxy)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = RequestStats()
+            self.stats[key] = stats
+        stats.requests += 1
+        stats.bytes_sent += len(data)
+        stats.latency.record(seconds)
+        if body is not None:
+            stats.bytes_received += len(body)
+            if error is None:
+                error = response_error(body)
+        if error is not None:
+            stats.errors[error] += 1
+
+    def merge(self, other: "RpcMetrics") -> None:
+        """Gộp số liệu của tiến trình khác (chế độ nhiều shard)."""
+        for key, stats in other.stats.items():
+            merged = self.stats.get(key)
+            if merged is None:
+                merged = RequestStats()
+                self.stats[key] = merged
+            merged.merge(stats)
+        self.calls.update(other.calls)
+        self.events.update(other.events)
+
+    def totals(self) -> RequestStats:
+        """Số liệu gộp của mọi yêu cầu (bản chụp mới, không thay đổi theo yêu cầu sau)."""
+        total = RequestStats()
+        for stats in self.stats.values():
+            total.merge(stats)
+        return total
+
+    def by(self, dimension: str) -> Dict[str, RequestStats]:
+        """
+        Gộp số liệu theo một chiều: "method", "endpoint" hoặc "proxy".
+        Ví dụ: get_rpc_metrics().by("method")["eth_call"].latency.percentile(95)
+        """
+        index = {"method": 0, "endpoint": 1, "proxy": 2}[dimension]
+        result: Dict[str, RequestStats] = {}
+        for key, stats in self.stats.items():
+            name = key[index]
+            if dimension == "endpoint":
+                name = urlsplit(name).netloc.rsplit("@", 1)[-1] or name
+            elif dimension == "proxy":
+                name = proxy_host(name) if name else "direct"
+            merged = result.get(name)
+            if merged is None:
+                merged = RequestStats()
+                result[name] = merged
+            merged.merge(stats)
+        return result
+
+    def format_summary(self, top: int = 15) -> List[str]:
+        """Các dòng tóm tắt theo phương thức, RPC và proxy, sắp xếp theo tổng thời gian."""
+        lines = []
+        for dimension, title, limit in (
+            ("method", "Phương thức", top),
+            ("endpoint", "RPC", top),
+            ("proxy", "Proxy", 5),
+        ):
+            groups = sorted(
+                self.by(dimension).items(),
+                key=lambda item: item[1].latency.total,
+                reverse=True,
+            )
+            if not groups:
+                continue
+            lines.append(f"{title}:")
+            lines.extend(_format_row(name, stats) for name, stats in groups[:limit])
+            if len(groups) > limit:
+                lines.append(f"  ... và {len(groups) - limit} mục khác")
+        if self.events:
+            lines.append(
+                "Sự kiện: " + ", ".join(f"{name} {count}" for name, count in self.events.most_common())
+            )
+        if self.calls:
+            lines.append(
+                "Lời gọi JSON-RPC (kể cả trong batch): "
+                + ", ".join(f"{method} {count}" for method, count in self.calls.most_common(top))
+            )
+        return lines
+
+
+def _format_row(name: str, stats: RequestStats) -> str:
+    latency = stats.latency
+    errors = sum(stats.errors.values())
+    row = (
+        f"  {name}: {stats.requests} yêu cầu, "
+        f"p50 {latency.percentile(50) * 1000:.0f} ms, "
+        f"p95 {latency.percentile(95) * 1000:.0f} ms, "
+        f"p99 {latency.percentile(99) * 1000:.0f} ms, "
+        f"tổng {latency.total:.1f} giây, "
+        f"gửi {_format_bytes(stats.bytes_sent)}, nhận {_format_bytes(stats.bytes_received)}"
+    )
+    if errors:
+        row += ", lỗi " + ", ".join(
+            f"{error} {count}" for error, count in stats.errors.most_common(3)
+        )
+    return row
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def error_class(error: BaseException) -> str:
+    """Lớp lỗi ngắn gọn cho thống kê, ví dụ HTTP 429, TimeoutError."""
+    status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return f"HTTP {status}"
+    return type(error).__name__
+
+
+def get_rpc_metrics() -> Optional[RpcMetrics]:
+    """Lấy RpcMetrics dùng chung, None nếu RPC_SETTINGS.METRICS bị tắt"""
+    if not hasattr(get_rpc_metrics, "_metrics"):
+        from src.utils.config import get_config
+
+        get_rpc_metrics._metrics = (
+            RpcMetrics() if get_config().RPC_SETTINGS.METRICS.ENABLED else None
+        )
+    return get_rpc_metrics._metrics
@@ -0,0 +1,269 @@
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from aiohttp import ClientResponseError
+from loguru import logger
+
+from src.model.onchain.transport import RpcTransport
+
+
+@dataclass
+class BalancerSettings:
+    """Cài đặt cho bộ cân bằng tải RPC."""
+
+    ewma_alpha: float = 0.3  # trọng số của mẫu mới trong EWMA
+    max_error_rate: float = 0.5  # tỷ lệ lỗi tối đa trước khi loại endpoint
+    eject_after_failures: int = 3  # số lỗi liên tiếp trước khi loại endpoint
+    eject_seconds: float = 30.0  # thời gian loại trước khi thử lại
+    rate_limit_penalty_seconds: float = 10.0  # thời gian phạt sau phản hồi 429
+
+
+@dataclass
+class EndpointStats:
+    """Thống kê sức khỏe của một endpoint RPC."""
+
+    url: str
+    latency: Optional[float] = None  # EWMA độ trễ (giây)
+    error_rate: float = 0.0  # EWMA tỷ lệ lỗi
+    in_flight: int = 0
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    consecutive_failures: int = 0
+    rate_limited_until: float = 0.0
+    ejected_until: float = 0.0
+    probing: bool = False
+    last_transport: Optional[RpcTransport] = field(default=None, repr=False)
+    samples: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=200), repr=False
+    )  # độ trễ gần đây để tính phân vị
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > time.monotonic()
+
+    def score(self, default_latency: float) -> float:
+        """Điểm càng thấp càng tốt: độ trễ x (yêu cầu đang chạy + 1) x phạt lỗi."""
+        latency = self.latency if self.latency is not None else default_latency
+        score = latency * (self.in_flight + 1) * (1 + 4 * self.error_rate)
+        if self.rate_limited_until > time.monotonic():
+            score *= 10
+        return score
+
+
+class RpcRouter:
+    """
+    Phân phối yêu cầu giữa các RPC đã cấu hình theo điểm sức khỏe
+    (EWMA độ trễ, tỷ lệ lỗi, phản hồi 429). Endpoint không khỏe bị loại
+    tạm thời và được kiểm tra lại trong nền.
+    """
+
+    def __init__(self, urls: Iterable[str], settings: Optional[BalancerSettings] = None):
+        self.settings = settings or BalancerSettings()
+        self.endpoints: Dict[str, EndpointStats] = {
+            url: EndpointStats(url=url) for url in urls
+        }
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self.endpoints)
+
+    def _default_latency(self) -> float:
+        known = [e.latency for e in self.endpoints.values() if e.latency is not None]
+        # Endpoint chưa có số liệu được coi là nhanh để được thử sớm
+        return min(known) if known else 0.1
+
+    def pick(self, exclude: Iterable[str] = ()) -> str:
+        """
+        Chọn endpoint cho yêu cầu tiếp theo.
+        Chọn ngẫu nhiên có trọng số 1/điểm trong số các endpoint khỏe,
+        nếu tất cả đều bị loại thì chọn endpoint có thời hạn loại sớm nhất.
+        """
+        excluded = set(exclude)
+        candidates = [
+            e for e in self.endpoints.values() if e.url not in excluded and not e.ejected
+        ]
+        if not candidates:
+            fallback = [e for e in self.endpoints.values() if e.url not in excluded]
+            if not fallback:
+                fallback = list(self.endpoints.values())
+            return min(fallback, key=lambda e: e.ejected_until).url
+
+        if len(candidates) == 1:
+            return candidates[0].url
+
+        default_latency = self._default_latency()
+        weights = [1 / max(e.score(default_latency), 1e-6) for e in candidates]
+        return random.choices(candidates, weights=weights, k=1)[0].url
+
+    def ordered(self) -> List[str]:
+        """Danh sách endpoint theo thứ tự thử: endpoint được chọn trước, sau đó theo điểm."""
+        first = self.pick()
+        default_latency = self._default_latency()
+        rest = sorted(
+            (e for e in self.endpoints.values() if e.url != first),
+            key=lambda e: (e.ejected, e.score(default_latency)),
+        )
+        return [first] + [e.url for e in rest]
+
+    def started(self, url: str) -> float:
+        self.endpoints[url].in_flight += 1
+        return time.monotonic()
+
+    def record_success(self, url: str, started_at: float) -> None:
+        endpoint = self.endpoints[url]
+        alpha = self.settings.ewma_alpha
+        elapsed = time.monotonic() - started_at
+        endpoint.in_flight = max(0, endpoint.in_flight - 1)
+        endpoint.requests += 1
+        endpoint.consecutive_failures = 0
+        endpoint.latency = (
+            elapsed
+            if endpoint.latency is None
+            else alpha * elapsed + (1 - alpha) * endpoint.latency
+        )
+        endpoint.error_rate = (1 - alpha) * endpoint.error_rate
+        endpoint.samples.append(elapsed)
+
+    def record_cancel(self, url: str, started_at: float) -> None:
+        """
+        Yêu cầu bị hủy (ví dụ thua yêu cầu dự phòng). Không tính là lỗi, nhưng
+        thời gian đã chờ là cận dưới của độ trễ nên vẫn được đưa vào EWMA.
+        """
+        endpoint = self.endpoints[url]
+        alpha = self.settings.ewma_alpha
+        elapsed = time.monotonic() - started_at
+        endpoint.in_flight = max(0, endpoint.in_flight - 1)
+        if endpoint.latency is None or elapsed > endpoint.latency:
+            endpoint.latency = (
+                elapsed
+                if endpoint.latency is None
+                else alpha * elapsed + (1 - alpha) * endpoint.latency
+            )
+
+    def latency_percentile(self, url: str, percentile: float) -> Optional[float]:
+        """Phân vị độ trễ gần đây của endpoint (giây), None nếu chưa đủ số liệu."""
+        samples = sorted(self.endpoints[url].samples)
+        if len(samples) < 10:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def record_failure(
+        self,
+        url: str,
+        started_at: float,
+        error: Exception,
+        transport: Optional[RpcTransport] = None,
+    ) -> None:
+        endpoint = self.endpoints[url]
+        alpha = self.settings.ewma_alpha
+        endpoint.in_flight = max(0, endpoint.in_flight - 1)
+        endpoint.requests += 1
+        endpoint.errors += 1
+        endpoint.consecutive_failures += 1
+        endpoint.error_rate = alpha + (1 - alpha) * endpoint.error_rate
+        if transport is not None:
+            endpoint.last_transport = transport
+
+        if is_rate_limit_error(error):
+            endpoint.rate_limited += 1
+            endpoint.rate_limited_until = (
+                time.monotonic() + self.settings.rate_limit_penalty_seconds
+            )
+
+        if (
+            endpoint.consecutive_failures >= self.settings.eject_after_failures
+            or endpoint.error_rate > self.settings.max_error_rate
+        ) and not endpoint.ejected:
+            self._eject(endpoint)
+
+    def _eject(self, endpoint: EndpointStats) -> None:
+        if len(self.endpoints) == 1:
+            # Không loại endpoint duy nhất, chỉ dựa vào retry của lớp trên
+            return
+        endpoint.ejected_until = time.monotonic() + self.settings.eject_seconds
+        logger.warning(
+            f"Tạm loại RPC {endpoint.url} trong {self.settings.eject_seconds:.0f} giây "
+            f"(lỗi liên tiếp: {endpoint.consecutive_failures}, tỷ lệ lỗi: {endpoint.error_rate:.2f})"
+        )
+        if not endpoint.probing and endpoint.last_transport is not None:
+            endpoint.probing = True
+            asyncio.get_running_loop().create_task(self._reprobe(endpoint))
+
+    async def _reprobe(self, endpoint: EndpointStats) -> None:
+        """Kiểm tra lại endpoint bị loại trong nền bằng eth_blockNumber."""
+        payload = json.dumps(
+            {"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []}
+        ).encode()
+        try:
+            while True:
+                await asyncio.sleep(self.settings.eject_seconds)
+                transport = endpoint.last_transport
+                if transport is None or transport.closed:
+                    # Không còn kết nối để kiểm tra, để lưu lượng thật thử lại
+                    endpoint.ejected_until = 0.0
+                    return
+                try:
+                    started_at = time.monotonic()
+                    response = json.loads(await transport.post(payload))
+                    if "result" not in response:
+                        raise Exception(response.get("error"))
+                except Exception as e:
+                    endpoint.ejected_until = (
+                        time.monotonic() + self.settings.eject_seconds
+                    )
+                    logger.debug(f"RPC {endpoint.url} vẫn chưa khỏe: {e}")
+                    continue
+
+                endpoint.latency = time.monotonic() - started_at
+                endpoint.error_rate = 0.0
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = 0.0
+                logger.info(f"RPC {endpoint.url} đã hoạt động trở lại")
+                return
+        finally:
+            endpoint.probing = False
+
+    def summary(self) -> List[Tuple[str, Optional[float], float, int, bool]]:
+        return [
+            (e.url, e.latency, e.error_rate, e.requests, e.ejected)
+            for e in self.endpoints.values()
+        ]
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Phản hồi 429 hoặc lỗi JSON-RPC báo vượt giới hạn tần suất."""
+    if isinstance(error, ClientResponseError):
+        return error.status == 429
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "too many requests" in message
+
+
+def get_rpc_router(urls: Iterable[str]) -> RpcRouter:
+    """Lấy RpcRouter dùng chung cho một danh sách RPC"""
+    if not hasattr(get_rpc_router, "_routers"):
+        get_rpc_router._routers = {}
+    key = tuple(urls)
+    router = get_rpc_router._routers.get(key)
+    if router is None:
+        from src.utils.config import get_config
+
+        balancer = get_config().RPC_SETTINGS.BALANCER
+        router = RpcRouter(
+            key,
+            BalancerSettings(
+                ewma_alpha=balancer.EWMA_ALPHA,
+                max_error_rate=balancer.MAX_ERROR_RATE,
+                eject_after_failures=balancer.EJECT_AFTER_FAILURES,
+                eject_seconds=balancer.EJECT_SECONDS,
+                rate_limit_penalty_seconds=balancer.RATE_LIMIT_PENALTY_SECONDS,
+            ),
+        )
+        get_rpc_router._routers[key] = router
+    return router
@@ -0,0 +1,118 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
+
+PrivateKey = Union[str, bytes]
+
+
+# Các hàm chạy trong tiến trình con, phải ở cấp mô-đun để có thể pickle
+def _sign(tx: Dict[str, Any], key: PrivateKey) -> SignedTransaction:
+    return Account.sign_transaction(tx, key)
+
+
+def _sign_batch(items: Sequence[Tuple[Dict[str, Any], PrivateKey]]) -> List[SignedTransaction]:
+    return [Account.sign_transaction(tx, key) for tx, key in items]
+
+
+def _from_key(key: PrivateKey) -> LocalAccount:
+    return Account.from_key(key)
+
+
+def _from_keys(keys: Sequence[PrivateKey]) -> List[LocalAccount]:
+    return [Account.from_key(key) for key in keys]
+
+
+class SignerPool:
+    """
+    Ký giao dịch và suy ra tài khoản từ khóa riêng ngoài vòng lặp sự kiện.
+    secp256k1 thuần Python mất vài mili giây cho mỗi lần ký và giữ GIL, nên với
+    hàng trăm tài khoản đồng thời nó làm chậm mọi yêu cầu RPC đang chờ.
+
+    Chế độ:
+        inline - chạy ngay trong vòng lặp (hành vi cũ)
+        thread - chạy trong luồng riêng (chỉ có ích khi có thư viện C như coincurve)
+        process - chạy trong tiến trình con
+    """
+
+    def __init__(self, mode: str = "process", workers: int = 0):
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(f"Chế độ ký không hợp lệ: {mode}")
+        self.mode = mode
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="signer"
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        if self.mode == "inline":
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    async def _run_chunked(self, fn: Callable, items: Sequence[Any]) -> List[Any]:
+        if not items:
+            return []
+        if self.mode == "inline":
+            return fn(items)
+        # Chia đều cho các worker, mỗi worker nhận một phần để giảm chi phí truyền dữ liệu
+        size = -(-len(items) // self.workers)
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        results = await asyncio.gather(*(self._run(fn, chunk) for chunk in chunks))
+        return [item for chunk in results for item in chunk]
+
+    async def sign(self, tx: Dict[str, Any], key: PrivateKey) -> SignedTransaction:
+        """Ký một giao dịch."""
+        return await self._run(_sign, tx, key)
+
+    async def sign_many(
+        self, items: Sequence[Tuple[Dict[str, Any], PrivateKey]]
+    ) -> List[SignedTransaction]:
+        """
+        Ký nhiều giao dịch cùng lúc, chia đều cho các worker.
+
+        Args:
+            items: Danh sách (giao dịch, khóa riêng)
+
+        Returns:
+            Giao dịch đã ký theo đúng thứ tự đầu vào
+        """
+        return await self._run_chunked(_sign_batch, list(items))
+
+    async def account(self, key: PrivateKey) -> LocalAccount:
+        """Suy ra tài khoản (địa chỉ) từ khóa riêng."""
+        return await self._run(_from_key, key)
+
+    async def accounts(self, keys: Sequence[PrivateKey]) -> List[LocalAccount]:
+        """Suy ra nhiều tài khoản cùng lúc, chia đều cho các worker."""
+        return await self._run_chunked(_from_keys, list(keys))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def get_signer_pool() -> SignerPool:
+    """Lấy SignerPool dùng chung theo cấu hình SIGNER"""
+    if not hasattr(get_signer_pool, "_pool"):
+        from src.utils.config import get_config
+
+        signer = get_config().SIGNER
+        get_signer_pool._pool = SignerPool(
+            mode=signer.MODE if signer.ENABLED else "inline",
+            workers=signer.WORKERS,
+        )
+    return get_signer_pool._pool
@@ -0,0 +1,469 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union, cast
+
+import aiohttp
+from loguru import logger
+from web3 import AsyncWeb3
+from web3._utils.batching import sort_batch_response_by_response_ids
+from web3.types import RPCEndpoint, RPCResponse
+
+from src.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from src.model.onchain.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    is_rate_limited_body,
+    parse_retry_after,
+)
+from src.model.onchain.rpc_metrics import RpcMetrics, error_class
+
+
+@dataclass
+class TransportLimits:
+    """Giới hạn của nhóm kết nối dùng chung cho mỗi RPC."""
+
+    max_connections: int = 100
+    max_connections_per_host: int = 0  # 0 - không giới hạn
+    keepalive_timeout: float = 30.0
+    request_timeout: float = 30.0
+    idle_ttl: float = 120.0  # thời gian giữ nhóm không dùng trước khi đóng
+
+
+# Các phương thức chỉ đọc, an toàn để gửi trùng lặp
+HEDGEABLE_METHODS = frozenset(
+    {
+        "eth_call",
+        "eth_getBalance",
+        "eth_blockNumber",
+        "eth_chainId",
+        "eth_gasPrice",
+        "eth_maxPriorityFeePerGas",
+        "eth_feeHistory",
+        "eth_getCode",
+        "eth_getStorageAt",
+        "eth_getTransactionCount",
+        "eth_getTransactionReceipt",
+        "eth_getTransactionByHash",
+        "eth_getBlockByNumber",
+        "eth_estimateGas",
+    }
+)
+
+
+@dataclass
+class HedgeSettings:
+    """
+    Cài đặt yêu cầu dự phòng cho các lệnh đọc: nếu không có phản hồi sau
+    phân vị độ trễ của RPC, gửi thêm một bản sao tới RPC khác và lấy kết quả đến trước.
+    """
+
+    percentile: float = 95.0
+    min_delay: float = 0.2  # độ trễ tối thiểu trước khi gửi bản sao (giây)
+    max_delay: float = 3.0  # độ trễ tối đa trước khi gửi bản sao (giây)
+    methods: FrozenSet[str] = field(default_factory=lambda: HEDGEABLE_METHODS)
+
+
+class RpcTransport:
+    """
+    Nhóm kết nối keep-alive dùng chung cho một bộ (rpc_url, proxy, ssl).
+    Mọi thể hiện Web3Custom có cùng bộ khóa này sẽ dùng chung một phiên aiohttp.
+    Nếu có bucket, mỗi yêu cầu chờ token trước khi gửi; nếu có breaker,
+    yêu cầu bị từ chối ngay khi RPC (qua proxy này) đang bị ngắt.
+    Nếu có metrics, mỗi yêu cầu được ghi lại (phương thức, byte, độ trễ, lớp lỗi).
+    """
+
+    HEADERS = {"Content-Type": "application/json"}
+
+    def __init__(
+        self,
+        rpc_url: str,
+        proxy: Optional[str],
+        ssl: bool,
+        limits: TransportLimits,
+        bucket: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[RpcMetrics] = None,
+    ):
+        self.rpc_url = rpc_url
+        self.proxy = proxy
+        self.ssl = ssl
+        self.limits = limits
+        self.bucket = bucket
+        self.breaker = breaker
+        self.metrics = metrics
+        self.users = 0
+        self.last_used = time.monotonic()
+        self.last_success = 0.0  # thời điểm phản hồi thành công gần nhất
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def key(self) -> Tuple[str, Optional[str], bool]:
+        return self.rpc_url, self.proxy, self.ssl
+
+    @property
+    def available(self) -> bool:
+        """RPC không bị circuit breaker ngắt."""
+        return self.breaker is None or self.breaker.available
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limits.max_connections,
+                limit_per_host=self.limits.max_connections_per_host,
+                keepalive_timeout=self.limits.keepalive_timeout,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.limits.request_timeout),
+                headers=self.HEADERS,
+            )
+        return self._session
+
+    async def post(self, data: bytes) -> bytes:
+        """Gửi một yêu cầu JSON-RPC (đơn lẻ hoặc batch) đã mã hóa và trả về phản hồi thô."""
+        if self.breaker is not None:
+            self.breaker.check()
+        if self.bucket is not None:
+            await self.bucket.acquire()
+        self.last_used = started_at = time.monotonic()
+        try:
+            body = await self._request(data)
+        except aiohttp.ClientResponseError as e:
+            self._record(data, started_at, error=error_class(e))
+            # 429 và các lỗi 4xx khác nghĩa là RPC vẫn hoạt động
+            if self.breaker is not None and e.status >= 500:
+                self.breaker.record_failure()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._record(data, started_at, error=error_class(e))
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Bản sao thua của yêu cầu dự phòng hoặc tác vụ bị hủy
+            self._record(data, started_at, error="cancelled")
+            raise
+        self._record(data, started_at, body=body)
+        self.last_success = time.monotonic()
+        if self.breaker is not None:
+            self.breaker.record_success()
+        if self.bucket is not None:
+            if is_rate_limited_body(body):
+                self.bucket.on_rate_limited()
+            else:
+                self.bucket.on_success()
+        return body
+
+    def _record(
+        self,
+        data: bytes,
+        started_at: float,
+        body: Optional[bytes] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        if self.metrics is not None:
+            self.metrics.record(
+                data, self.rpc_url, self.proxy, time.monotonic() - started_at, body, error
+            )
+
+    async def _request(self, data: bytes) -> bytes:
+        session = self._get_session()
+        async with session.post(
+            self.rpc_url, data=data, proxy=self.proxy, ssl=self.ssl
+        ) as response:
+            if response.status == 429 and self.bucket is not None:
+                self.bucket.on_rate_limited(
+                    parse_retry_after(response.headers.get("Retry-After"))
+                )
+            response.raise_for_status()
+            return await response.read()
+
+    def healthy_within(self, seconds: float) -> bool:
+        """Nhóm kết nối có phản hồi thành công trong khoảng thời gian gần đây hay không."""
+        return time.monotonic() - self.last_success < seconds
+
+    async def close(self) -> None:
+        if not self.closed:
+            await self._session.close()
+        self._session = None
+
+
+class TransportPool:
+    """Sổ đăng ký nhóm kết nối RPC dùng chung trong toàn bộ tiến trình."""
+
+    def __init__(
+        self,
+        limits: Optional[TransportLimits] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        ws_urls: Optional[Dict[str, str]] = None,
+        metrics: Optional[RpcMetrics] = None,
+    ):
+        self.limits = limits or TransportLimits()
+        self.rate_limiter = rate_limiter
+        self.breakers = breakers
+        self.metrics = metrics
+        # RPC HTTP -> WebSocket tương ứng; RPC không có ở đây chỉ dùng HTTP
+        self.ws_urls = ws_urls or {}
+        self._transports: Dict[Tuple[str, Optional[str], bool], RpcTransport] = {}
+
+    def acquire(self, rpc_url: str, proxy: Optional[str], ssl: bool) -> RpcTransport:
+        """
+        Lấy (hoặc tạo) nhóm kết nối cho bộ (rpc_url, proxy, ssl).
+        Mỗi lần acquire phải đi kèm một lần release.
+        """
+        key = (rpc_url, proxy, ssl)
+        transport = self._transports.get(key)
+        if transport is None:
+            bucket = (
+                self.rate_limiter.bucket(rpc_url, proxy)
+                if self.rate_limiter is not None
+                else None
+            )
+            breaker = (
+                self.breakers.get(rpc_url, proxy) if self.breakers is not None else None
+            )
+            ws_url = self.ws_urls.get(rpc_url)
+            if ws_url:
+                from src.model.onchain.ws_transport import WsTransport
+
+                transport = WsTransport(
+                    rpc_url,
+                    proxy,
+                    ssl,
+                    self.limits,
+                    ws_url,
+                    bucket=bucket,
+                    breaker=breaker,
+                    metrics=self.metrics,
+                )
+            else:
+                transport = RpcTransport(
+                    rpc_url,
+                    proxy,
+                    ssl,
+                    self.limits,
+                    bucket=bucket,
+                    breaker=breaker,
+                    metrics=self.metrics,
+                )
+            self._transports[key] = transport
+        transport.users += 1
+        transport.last_used = time.monotonic()
+        return transport
+
+    async def release(self, transport: RpcTransport) -> None:
+        """Trả nhóm kết nối và đóng các nhóm đã không dùng quá idle_ttl."""
+        transport.users = max(0, transport.users - 1)
+        transport.last_used = time.monotonic()
+        await self._close_idle()
+
+    async def _close_idle(self) -> None:
+        now = time.monotonic()
+        for key, transport in list(self._transports.items()):
+            if transport.users == 0 and now - transport.last_used > self.limits.idle_ttl:
+                del self._transports[key]
+                await transport.close()
+
+    async def close_all(self) -> None:
+        """Đóng tất cả các nhóm kết nối. Gọi khi kết thúc quá trình chạy."""
+        transports = list(self._transports.values())
+        self._transports.clear()
+        for transport in transports:
+            try:
+                await transport.close()
+            except Exception as e:
+                logger.warning(f"Lỗi khi đóng nhóm kết nối {transport.rpc_url}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._transports)
+
+
+class PooledHTTPProvider(AsyncWeb3.AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider gửi mọi yêu cầu qua RpcTransport dùng chung
+    thay vì tạo phiên aiohttp riêng cho từng tài khoản.
+    Nếu có router, mỗi yêu cầu được gửi tới endpoint do router chọn
+    và chuyển sang endpoint tiếp theo khi gặp lỗi kết nối.
+    """
+
+    def __init__(
+        self,
+        transports: Dict[str, RpcTransport],
+        router: Optional[Any] = None,
+        hedge: Optional[HedgeSettings] = None,
+        coalescer: Optional[Any] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(next(iter(transports)), **kwargs)
+        self.transports = transports
+        self.router = router
+        self.hedge = hedge
+        self.coalescer = coalescer
+        # Đặt sau khi biết thông tin chuỗi, eth_chainId sẽ được trả lời tại chỗ
+        self.chain_id: Optional[int] = None
+
+    async def _post_to(self, url: str, request_data: bytes) -> bytes:
+        transport = self.transports[url]
+        started_at = self.router.started(url)
+        try:
+            response = await transport.post(request_data)
+        except (asyncio.CancelledError, CircuitOpenError):
+            # Bị ngắt không phải lỗi mới của RPC, không tính vào thống kê
+            self.router.record_cancel(url, started_at)
+            raise
+        except Exception as e:
+            self.router.record_failure(url, started_at, e, transport)
+            raise
+        self.router.record_success(url, started_at)
+        return response
+
+    def _ordered_urls(self) -> List[str]:
+        urls = [url for url in self.router.ordered() if url in self.transports]
+        # Chuyển sang RPC không bị ngắt; nếu tất cả đều bị ngắt, yêu cầu sẽ lỗi ngay
+        available = [url for url in urls if self.transports[url].available]
+        return available or urls
+
+    async def _post(self, request_data: bytes) -> bytes:
+        if self.router is None:
+            return await next(iter(self.transports.values())).post(request_data)
+
+        # Thử endpoint được chọn, sau đó chuyển sang endpoint tốt nhất tiếp theo
+        last_error: Optional[Exception] = None
+        for url in self._ordered_urls()[:2]:
+            try:
+                return await self._post_to(url, request_data)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _hedge_delay(self, url: str) -> float:
+        delay = self.router.latency_percentile(url, self.hedge.percentile)
+        if delay is None:
+            # Chưa đủ số liệu - ước lượng từ độ trễ trung bình
+            latency = self.router.endpoints[url].latency
+            delay = latency * 3 if latency is not None else self.hedge.max_delay
+        return min(self.hedge.max_delay, max(self.hedge.min_delay, delay))
+
+    async def _hedged_post(self, request_data: bytes) -> bytes:
+        """
+        Gửi yêu cầu đọc tới endpoint được chọn; nếu chưa có phản hồi sau phân vị
+        độ trễ của endpoint đó, gửi thêm bản sao tới endpoint tiếp theo (hoặc cùng
+        endpoint qua kết nối khác nếu chỉ có một). Lấy phản hồi đến trước, hủy phần còn lại.
+        """
+        urls = self._ordered_urls()
+        primary = urls[0]
+        secondary = urls[1] if len(urls) > 1 else primary
+
+        tasks = {asyncio.ensure_future(self._post_to(primary, request_data))}
+        hedged = False
+        last_error: Optional[BaseException] = None
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks,
+                    timeout=None if hedged else self._hedge_delay(primary),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if not hedged:
+                    # Hết thời gian chờ hoặc yêu cầu chính lỗi - gửi bản sao
+                    hedged = True
+                    tasks.add(
+                        asyncio.ensure_future(self._post_to(secondary, request_data))
+                    )
+            raise last_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _make_request(self, method: RPCEndpoint, request_data: bytes) -> bytes:
+        if method == "eth_chainId" and self.chain_id is not None:
+            request_id = json.loads(request_data).get("id")
+            return json.dumps(
+                {"jsonrpc": "2.0", "id": request_id, "result": hex(self.chain_id)}
+            ).encode()
+        if self.coalescer is not None and method in self.coalescer.methods:
+            return await self.coalescer.request(
+                request_data, lambda: self._send(method, request_data)
+            )
+        return await self._send(method, request_data)
+
+    async def _send(self, method: RPCEndpoint, request_data: bytes) -> bytes:
+        if self.hedge and self.router is not None and method in self.hedge.methods:
+            return await self._hedged_post(request_data)
+        return await self._post(request_data)
+
+    async def make_batch_request(
+        self, batch_requests: List[Tuple[RPCEndpoint, Any]]
+    ) -> Union[List[RPCResponse], RPCResponse]:
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        raw_response = await self._post(request_data)
+        response = self.decode_rpc_response(raw_response)
+        if not isinstance(response, list):
+            # Lỗi RPC chỉ trả về một phản hồi chứa đối tượng lỗi
+            return response
+        return sort_batch_response_by_response_ids(cast(List[RPCResponse], response))
+
+    async def disconnect(self) -> None:
+        # Phiên thuộc về TransportPool, không đóng ở đây
+        pass
+
+
+def get_transport_pool() -> TransportPool:
+    """Lấy TransportPool singleton với giới hạn từ cấu hình"""
+    if not hasattr(get_transport_pool, "_pool"):
+        from src.utils.config import get_config
+
+        from src.model.onchain.rate_limiter import get_rate_limiter
+        from src.model.onchain.rpc_metrics import get_rpc_metrics
+        from src.utils.circuit_breaker import get_circuit_breakers
+
+        rpc_settings = get_config().RPC_SETTINGS
+        pool_config = rpc_settings.POOL
+        get_transport_pool._pool = TransportPool(
+            TransportLimits(
+                max_connections=pool_config.MAX_CONNECTIONS,
+                max_connections_per_host=pool_config.MAX_CONNECTIONS_PER_HOST,
+                keepalive_timeout=pool_config.KEEPALIVE_TIMEOUT,
+                request_timeout=pool_config.REQUEST_TIMEOUT,
+                idle_ttl=pool_config.IDLE_TTL,
+            ),
+            rate_limiter=(
+                get_rate_limiter() if rpc_settings.RATE_LIMIT.ENABLED else None
+            ),
+            breakers=get_circuit_breakers(),
+            ws_urls=(
+                rpc_settings.WEBSOCKET.URLS if rpc_settings.WEBSOCKET.ENABLED else None
+            ),
+            metrics=get_rpc_metrics(),
+        )
+    return get_transport_pool._pool
+
+
+def get_hedge_settings() -> HedgeSettings:
+    """Lấy cài đặt yêu cầu dự phòng từ cấu hình"""
+    if not hasattr(get_hedge_settings, "_settings"):
+        from src.utils.config import get_config
+
+        hedging = get_config().RPC_SETTINGS.HEDGING
+        get_hedge_settings._settings = HedgeSettings(
+            percentile=hedging.PERCENTILE,
+            min_delay=hedging.MIN_DELAY,
+            max_delay=hedging.MAX_DELAY,
+        )
+    return get_hedge_settings._settings
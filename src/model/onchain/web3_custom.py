@@ -1,13 +1,83 @@
 from decimal import Decimal
-from typing import Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from loguru import logger
+from hexbytes import HexBytes
 from web3 import AsyncWeb3
+from web3.contract import AsyncContract
+from web3.types import TxReceipt
+from eth_account.datastructures import SignedTransaction
 from eth_account.signers.local import LocalAccount
 from src.utils.decorators import retry_async
-from src.model.onchain.constants import Balance
+from src.utils.config import get_config
+from src.model.onchain.constants import Balance, TransactionParams
+from src.model.onchain.transport import (
+    PooledHTTPProvider,
+    RpcTransport,
+    get_hedge_settings,
+    get_transport_pool,
+)
+from src.model.onchain.rpc_router import get_rpc_router
+from src.model.onchain.rpc_metrics import get_rpc_metrics
+from src.model.onchain.coalescer import get_coalescer
+from src.model.onchain.contracts import get_contract_registry
+from src.model.onchain.signer import get_signer_pool
+from src.model.onchain.chain_meta import ChainMeta, get_chain_meta_cache
+from src.model.onchain.gas_oracle import GasOracle, get_gas_oracle
+from src.model.onchain.gas_cache import gas_key, get_gas_cache
+from src.model.onchain.preflight import PreflightError, SimulationResult, simulate
+from src.model.onchain.receipt_watcher import get_receipt_watcher
+from src.model.onchain.balance_watcher import get_balance_watcher
+from src.model.onchain.nonce_manager import (
+    NonceManager,
+    get_nonce_manager,
+    is_nonce_error,
+)
 import asyncio
 import traceback
 
+# Hệ số nhân cho giá gas và giới hạn gas ước lượng
+GAS_PRICE_MULTIPLIER = 1.5
+GAS_LIMIT_MULTIPLIER = 2.2
+
+# ABI ERC20 tối thiểu, khai báo một lần để bộ nhớ đệm hợp đồng dùng lại
+ERC20_BALANCE_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function",
+    }
+]
+
+ERC20_APPROVE_ABI = [
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_owner", "type": "address"},
+            {"name": "_spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_spender", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function",
+    },
+]
+
+
+def _call_fields(transaction: Dict) -> Dict:
+    """Bản giao dịch cho eth_estimateGas/eth_call, không có nonce và chainId."""
+    return {k: v for k, v in transaction.items() if k not in ("nonce", "chainId")}
+
 
 class Web3Custom:
     def __init__(
@@ -17,48 +87,83 @@ class Web3Custom:
         use_proxy: bool,
         proxy: str,
         ssl: bool = False,
+        hedge_reads: Optional[bool] = None,
     ):
         self.account_index = account_index
         self.RPC_URLS = RPC_URLS
         self.use_proxy = use_proxy
         self.proxy = proxy
         self.ssl = ssl
+        # None - theo RPC_SETTINGS.HEDGING.ENABLED
+        self.hedge_reads = hedge_reads
         self.web3 = None
+        self.transports: Dict[str, RpcTransport] = {}
+        self.chain_meta: Optional[ChainMeta] = None
+
+    @property
+    def chain_id(self) -> Optional[int]:
+        """Chain ID đã lưu trong bộ nhớ đệm (None nếu chưa kết nối)."""
+        return self.chain_meta.chain_id if self.chain_meta else None
+
+    @property
+    def proxy_url(self) -> Optional[str]:
+        """Proxy cho yêu cầu RPC (None nếu kết nối trực tiếp)."""
+        return f"http://{self.proxy}" if (self.use_proxy and self.proxy) else None
 
     async def connect_web3(self) -> None:
         """
-        Thử kết nối đến từng URL RPC trong danh sách.
-        Thực hiện 3 lần thử cho mỗi RPC với độ trễ 1 giây giữa các lần thử.
+        Kết nối đến danh sách URL RPC qua bộ cân bằng tải dùng chung.
+        Mỗi yêu cầu được gửi tới RPC có điểm sức khỏe tốt nhất, vì vậy tất cả RPC
+        đã cấu hình đều được sử dụng thay vì chỉ RPC đầu tiên phản hồi.
+        Thực hiện 3 lần thử với độ trễ 1 giây giữa các lần thử.
+        Kết nối được lấy từ nhóm dùng chung nên không phải bắt tay lại cho mỗi tài khoản.
+        RPC có WebSocket trong RPC_SETTINGS.WEBSOCKET gửi yêu cầu qua một WebSocket dùng chung.
         """
-        for rpc_url in self.RPC_URLS:
-            for attempt in range(3):
-                try:
-                    proxy_settings = (
-                        (f"http://{self.proxy}")
-                        if (self.use_proxy and self.proxy)
-                        else None
-                    )
-                    self.web3 = AsyncWeb3(
-                        AsyncWeb3.AsyncHTTPProvider(
-                            rpc_url,
-                            request_kwargs={
-                                "proxy": proxy_settings,
-                                "ssl": self.ssl,
-                            },
-                        )
-                    )
+        pool = get_transport_pool()
+        proxy_settings = self.proxy_url
 
-                    # Kiểm tra kết nối
-                    await self.web3.eth.chain_id
-                    return
+        transports = {
+            rpc_url: pool.acquire(rpc_url, proxy_settings, self.ssl)
+            for rpc_url in self.RPC_URLS
+        }
+        hedge_reads = self.hedge_reads
+        if hedge_reads is None:
+            hedge_reads = get_config().RPC_SETTINGS.HEDGING.ENABLED
+        provider = PooledHTTPProvider(
+            transports,
+            router=get_rpc_router(self.RPC_URLS),
+            hedge=get_hedge_settings() if hedge_reads else None,
+            coalescer=(
+                get_coalescer(self.RPC_URLS)
+                if get_config().RPC_SETTINGS.COALESCING.ENABLED
+                else None
+            ),
+        )
+        self.web3 = AsyncWeb3(provider)
+
+        probe_ttl = get_config().RPC_SETTINGS.POOL.PROBE_TTL
+        for attempt in range(3):
+            try:
+                # Thông tin chuỗi chỉ được truy vấn một lần cho mỗi nhóm RPC
+                meta = await get_chain_meta_cache().get(self.RPC_URLS, self.web3)
+                # Kiểm tra kết nối chỉ khi nhóm kết nối chưa phản hồi gần đây
+                if not any(t.healthy_within(probe_ttl) for t in transports.values()):
+                    await self.web3.eth.block_number
+                provider.chain_id = meta.chain_id
+                self.gas_oracle.block_time = meta.block_time
+                self.chain_meta = meta
+                self.transports = transports
+                return
 
-                except Exception as e:
-                    logger.warning(
-                        f"{self.account_index} | Lần thử {attempt + 1}/3 thất bại cho {rpc_url}: {str(e)}"
-                    )
-                    if attempt < 2:  # Không chờ sau lần thử cuối
-                        await asyncio.sleep(1)
-                    continue
+            except Exception as e:
+                logger.warning(
+                    f"{self.account_index} | Lần thử {attempt + 1}/3 thất bại cho {', '.join(self.RPC_URLS)}: {str(e)}"
+                )
+                if attempt < 2:  # Không chờ sau lần thử cuối
+                    await asyncio.sleep(1)
+
+        for transport in transports.values():
+            await pool.release(transport)
 
         raise Exception("Không thể kết nối đến bất kỳ URL RPC nào")
 
@@ -97,34 +202,287 @@ class Web3Custom:
         """
         if token_abi is None:
             # Sử dụng ABI ERC20 tối thiểu nếu không cung cấp
-            token_abi = [
-                {
-                    "constant": True,
-                    "inputs": [{"name": "_owner", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"name": "balance", "type": "uint256"}],
-                    "type": "function",
-                }
-            ]
-
-        token_contract = self.web3.eth.contract(
-            address=self.web3.to_checksum_address(token_address), abi=token_abi
-        )
+            token_abi = ERC20_BALANCE_ABI
+
+        token_contract = self.contract(token_address, token_abi)
         wei_balance = await token_contract.functions.balanceOf(wallet_address).call()
 
         return Balance.from_wei(wei_balance, decimals=decimals, symbol=symbol)
 
+    def contract(self, address: Optional[str], abi: list) -> AsyncContract:
+        """
+        Lấy đối tượng hợp đồng từ bộ nhớ đệm thay vì phân tích ABI lại mỗi lần.
+
+        Args:
+            address: Địa chỉ hợp đồng (None nếu chỉ dùng để mã hóa)
+            abi: ABI hợp đồng
+        """
+        return get_contract_registry().get(self.web3, address, abi)
+
+    @property
+    def gas_oracle(self) -> GasOracle:
+        """Nguồn giá gas dùng chung cho nhóm RPC của thể hiện này."""
+        return get_gas_oracle(self.RPC_URLS)
+
     @retry_async(attempts=3, delay=5.0, default_value=None)
-    async def get_gas_params(self) -> Dict[str, int]:
+    async def get_gas_price(self) -> int:
+        """Giá gas hiện tại (chưa nhân hệ số), lấy từ bộ nhớ đệm dùng chung."""
+        return await self.gas_oracle.gas_price(self.web3)
+
+    @property
+    def eip1559(self) -> bool:
+        """Dùng phí EIP-1559 từ eth_feeHistory (chuỗi hỗ trợ và GAS_ORACLE.EIP1559 bật)."""
+        return (
+            self.chain_meta is not None
+            and self.chain_meta.eip1559
+            and get_config().RPC_SETTINGS.GAS_ORACLE.EIP1559
+        )
+
+    @retry_async(attempts=3, delay=5.0, default_value=None)
+    async def get_gas_params(
+        self, multiplier: float = GAS_PRICE_MULTIPLIER
+    ) -> Dict[str, int]:
+        """
+        Tham số gas cho giao dịch: maxFeePerGas/maxPriorityFeePerGas trên chuỗi EIP-1559,
+        gasPrice legacy trên các chuỗi khác. Giá trị dùng chung giữa các tài khoản.
+
+        Args:
+            multiplier: Hệ số nhân giá gas (mặc định 1.5x); với EIP-1559 áp dụng cho phí ưu tiên
+        """
         try:
-            gas_price = await self.web3.eth.gas_price
-            return {"gasPrice": int(gas_price * 1.5)}
+            if self.eip1559:
+                return await self.gas_oracle.fee_params(self.web3, multiplier)
+            gas_price = await self.gas_oracle.gas_price(self.web3)
+            return {"gasPrice": int(gas_price * multiplier)}
         except Exception as e:
             logger.error(
                 f"{self.account_index} | Không thể lấy tham số gas: {str(e)}"
             )
             raise
 
+    async def batch_requests(
+        self, *requests: Callable[[AsyncWeb3], Any]
+    ) -> List[Any]:
+        """
+        Gộp nhiều lời gọi RPC độc lập vào một yêu cầu JSON-RPC batch (một lần POST).
+
+        Args:
+            requests: Các hàm nhận AsyncWeb3 và trả về lời gọi cần gộp,
+                ví dụ: lambda w3: w3.eth.gas_price
+
+        Returns:
+            Danh sách kết quả đã được web3 định dạng, theo đúng thứ tự yêu cầu
+        """
+        async with self.web3.batch_requests() as batch:
+            for request in requests:
+                batch.add(request(self.web3))
+            return await batch.async_execute()
+
+    async def simulate(
+        self, *txs: Dict, state_override: Optional[Dict] = None
+    ) -> List[SimulationResult]:
+        """
+        Mô phỏng các giao dịch bằng eth_call trong một yêu cầu batch, trước khi ký.
+
+        Args:
+            txs: Giao dịch (from, to, data, value)
+            state_override: Trạng thái giả định cho các bước trước chưa được gửi
+                (ví dụ allowance_override cho deposit sau approve)
+        """
+        if not get_config().RPC_SETTINGS.PREFLIGHT.ENABLED:
+            return [SimulationResult() for _ in txs]
+        return await simulate(self.web3, txs, state_override)
+
+    async def preflight(self, *txs: Dict, state_override: Optional[Dict] = None) -> None:
+        """
+        Mô phỏng các giao dịch và ném PreflightError nếu có giao dịch sẽ bị revert,
+        để không tốn gas, thời gian chờ xác nhận và thời gian nghỉ giữa các lần thử.
+        Giao dịch không mô phỏng được (lỗi RPC) được coi là hợp lệ.
+        """
+        for index, result in enumerate(await self.simulate(*txs, state_override=state_override)):
+            if result.reverted:
+                raise PreflightError(result.reason, index)
+
+    @retry_async(attempts=3, delay=5.0, default_value=None)
+    async def get_transaction_params(
+        self,
+        address: str,
+        transaction: Optional[Dict] = None,
+        nonce: bool = True,
+        gas_price: bool = True,
+        chain_id: bool = True,
+        call: Optional[Dict] = None,
+    ) -> TransactionParams:
+        """
+        Lấy nonce, giá gas, chain ID và (tùy chọn) gas ước lượng trong một yêu cầu batch.
+
+        Args:
+            address: Địa chỉ ví để lấy nonce
+            transaction: Giao dịch cần ước lượng gas (bỏ qua nếu None)
+            nonce: Có lấy nonce hay không
+            gas_price: Có lấy giá gas hay không
+            chain_id: Có lấy chain ID hay không
+            call: Giao dịch cần kiểm tra bằng eth_call (revert ném lỗi như khi ước lượng gas)
+        """
+        return await self._fetch_transaction_params(
+            address, transaction, nonce, gas_price, chain_id, call
+        )
+
+    async def _fetch_transaction_params(
+        self,
+        address: str,
+        transaction: Optional[Dict],
+        nonce: bool,
+        gas_price: bool,
+        chain_id: bool,
+        call: Optional[Dict],
+    ) -> TransactionParams:
+        """get_transaction_params không thử lại."""
+        fields = []
+        requests = []
+        known = {}
+        if nonce:
+            fields.append("nonce")
+            requests.append(
+                lambda w3: w3.eth.get_transaction_count(address, "pending")
+            )
+        # Giá gas và chain ID được lấy từ bộ nhớ đệm dùng chung nếu còn hiệu lực
+        cached_gas_price = self.gas_oracle.peek("gas_price") if gas_price else None
+        if cached_gas_price is not None:
+            known["gas_price"] = cached_gas_price
+        elif gas_price:
+            fields.append("gas_price")
+            requests.append(lambda w3: w3.eth.gas_price)
+        if chain_id and self.chain_id is not None:
+            known["chain_id"] = self.chain_id
+        elif chain_id:
+            fields.append("chain_id")
+            requests.append(lambda w3: w3.eth.chain_id)
+        if transaction is not None:
+            fields.append("gas")
+            requests.append(lambda w3: w3.eth.estimate_gas(transaction))
+        if call is not None:
+            fields.append("call")
+            requests.append(lambda w3: w3.eth.call(call))
+
+        if not requests:
+            return TransactionParams(**known)
+
+        results = dict(zip(fields, await self.batch_requests(*requests)))
+        results.pop("call", None)
+        if "gas_price" in results:
+            self.gas_oracle.update("gas_price", results["gas_price"])
+        return TransactionParams(**known, **results)
+
+    async def prepare_transaction(
+        self,
+        tx: Dict,
+        wallet: LocalAccount,
+        estimate_gas: bool = True,
+        allocate_nonce: bool = False,
+    ) -> Dict:
+        """
+        Điền nonce, chainId, gas và giá gas còn thiếu cho giao dịch
+        bằng một yêu cầu batch duy nhất thay vì 3-4 lần gọi riêng lẻ.
+
+        Args:
+            tx: Dữ liệu giao dịch (to, data, value, ...)
+            wallet: Thể hiện ví
+            estimate_gas: Ước lượng gas nếu giao dịch chưa có trường "gas"
+            allocate_nonce: Cấp nonce từ NonceManager thay vì lấy từ chuỗi.
+                Nơi gọi phải trả lại nonce nếu giao dịch không được gửi
+                (submit_transaction tự xử lý việc này)
+        """
+        transaction = {"from": wallet.address, **tx}
+        has_gas_price = "gasPrice" in transaction or "maxFeePerGas" in transaction
+        if not has_gas_price and self.eip1559:
+            # Phí EIP-1559 lấy từ bộ nhớ đệm dùng chung, thường không cần yêu cầu nào.
+            # Lấy trước khi cấp nonce: lỗi eth_feeHistory không giữ nonce nào
+            transaction.update(
+                await self.gas_oracle.fee_params(self.web3, GAS_PRICE_MULTIPLIER)
+            )
+        # Nonce được cấp cục bộ; chỉ lấy từ chuỗi lần đầu cho mỗi ví
+        nonce_manager = self.nonce_manager(wallet.address) if allocate_nonce else None
+        if "nonce" not in transaction and nonce_manager and nonce_manager.synced:
+            transaction["nonce"] = nonce_manager.allocate_local()
+        try:
+            await self._fill_transaction(transaction, wallet, estimate_gas, nonce_manager)
+        except BaseException:
+            # Nonce đã cấp nhưng giao dịch không được gửi: trả lại để không tạo khoảng trống
+            if nonce_manager and "nonce" not in tx and "nonce" in transaction:
+                nonce_manager.release(transaction["nonce"])
+            raise
+        return transaction
+
+    async def _fill_transaction(
+        self,
+        transaction: Dict,
+        wallet: LocalAccount,
+        estimate_gas: bool,
+        nonce_manager: Optional[NonceManager],
+    ) -> None:
+        """Điền các trường còn thiếu của prepare_transaction (sau khi đã cấp nonce)."""
+        has_gas_price = "gasPrice" in transaction or "maxFeePerGas" in transaction
+        gas_cache = get_gas_cache()
+        params = None
+        cached_failed = False
+        if estimate_gas and "gas" not in transaction and gas_cache is not None:
+            # Lời gọi cùng hình dạng đã có biên lai: dùng gasUsed đã học, bỏ eth_estimateGas.
+            # eth_call trong cùng batch chạy với đúng giới hạn gas sẽ ký, nên chặn cả
+            # giao dịch sẽ bị revert lẫn giới hạn từ bộ nhớ đệm quá thấp
+            cached_gas = gas_cache.lookup(self.chain_id, transaction)
+            if cached_gas is not None:
+                transaction["gas"] = cached_gas
+                try:
+                    params = await self._fetch_transaction_params(
+                        wallet.address,
+                        None,
+                        nonce="nonce" not in transaction,
+                        gas_price=not has_gas_price,
+                        chain_id="chainId" not in transaction,
+                        call=_call_fields(transaction),
+                    )
+                except Exception as e:
+                    # Không thử lại với giới hạn từ bộ nhớ đệm: ước lượng trực tiếp
+                    logger.debug(
+                        f"{self.account_index} | eth_call với gas từ bộ nhớ đệm thất bại, ước lượng trực tiếp: {e}"
+                    )
+                    del transaction["gas"]
+                    cached_failed = True
+
+        if params is None:
+            # chainId bị loại khỏi bản ước lượng: middleware kiểm tra chainId của web3
+            # sẽ gọi eth_chainId riêng, điều không thể thực hiện bên trong batch
+            to_estimate = (
+                _call_fields(transaction)
+                if estimate_gas and "gas" not in transaction
+                else None
+            )
+
+            # get_transaction_params ném lỗi sau lần thử cuối (không trả về None)
+            params = await self.get_transaction_params(
+                wallet.address,
+                to_estimate,
+                nonce="nonce" not in transaction,
+                gas_price=not has_gas_price,
+                chain_id="chainId" not in transaction,
+            )
+            if cached_failed:
+                # Ước lượng trực tiếp thành công: giới hạn đã học không đủ cho lời gọi này
+                gas_cache.forget(gas_key(self.chain_id, transaction))
+
+        if params.nonce is not None and nonce_manager:
+            nonce_manager.seed(params.nonce)
+            transaction["nonce"] = nonce_manager.allocate_local()
+        elif params.nonce is not None:
+            transaction["nonce"] = params.nonce
+        if params.chain_id is not None:
+            transaction["chainId"] = params.chain_id
+        if params.gas_price is not None:
+            transaction["gasPrice"] = int(params.gas_price * GAS_PRICE_MULTIPLIER)
+        if params.gas is not None:
+            transaction["gas"] = int(params.gas * GAS_LIMIT_MULTIPLIER)
+
     def convert_to_wei(self, amount: float, decimals: int) -> int:
         """Chuyển đổi số tiền sang đơn vị wei dựa trên số chữ số thập phân."""
         return int(Decimal(str(amount)) * Decimal(str(10**decimals)))
@@ -133,6 +491,102 @@ class Web3Custom:
         """Chuyển đổi số tiền từ wei về đơn vị token."""
         return float(Decimal(str(amount)) / Decimal(str(10**decimals)))
 
+    def nonce_manager(self, address: str) -> NonceManager:
+        """Bộ cấp phát nonce dùng chung của ví trên chuỗi này."""
+        return get_nonce_manager(self.chain_id, address)
+
+    async def allocate_nonce(self, address: str) -> int:
+        """
+        Cấp nonce tiếp theo cho ví mà không gọi get_transaction_count mỗi lần.
+        Nonce không được gửi đi phải được trả lại bằng nonce_manager(address).release().
+        """
+        return await self.nonce_manager(address).allocate(self.web3)
+
+    async def submit_transaction(self, tx: Dict, wallet: LocalAccount) -> HexBytes:
+        """
+        Điền tham số còn thiếu, ký và gửi giao dịch mà không chờ xác nhận.
+        Cho phép gửi liên tiếp nhiều giao dịch phụ thuộc nhau (nonce n, n+1, ...).
+        Khi gặp lỗi nonce, đồng bộ lại từ chuỗi và gửi lại một lần với nonce mới.
+
+        Args:
+            tx: Dữ liệu giao dịch (có thể đã có nonce, gas, giá gas)
+            wallet: Thể hiện ví
+
+        Returns:
+            Hash giao dịch
+        """
+        nonce_manager = self.nonce_manager(wallet.address)
+        for attempt in range(2):
+            transaction = await self.prepare_transaction(
+                tx, wallet, allocate_nonce=True
+            )
+            # Thêm type 2 chỉ cho giao dịch EIP-1559
+            if "maxFeePerGas" in transaction:
+                transaction["type"] = 2
+            nonce = transaction["nonce"]
+
+            try:
+                signed_txn = await self.sign_transaction(transaction, wallet.key)
+                tx_hash = await self.web3.eth.send_raw_transaction(
+                    signed_txn.raw_transaction
+                )
+            except Exception as e:
+                nonce_error = is_nonce_error(e)
+                rpc_metrics = get_rpc_metrics()
+                if nonce_error and rpc_metrics is not None:
+                    # Tín hiệu quá tải cho bộ điều khiển số luồng thích ứng
+                    rpc_metrics.record_event("nonce_error")
+                if attempt == 0 and nonce_error:
+                    logger.warning(
+                        f"{self.account_index} | Nonce {nonce} không hợp lệ ({str(e)}), đồng bộ lại"
+                    )
+                    await nonce_manager.resync(self.web3)
+                    tx = {k: v for k, v in tx.items() if k != "nonce"}
+                    continue
+                nonce_manager.release(nonce)
+                raise
+
+            nonce_manager.submitted(nonce, tx_hash)
+            gas_cache = get_gas_cache()
+            if gas_cache is not None:
+                gas_cache.track(self.chain_id, transaction, tx_hash)
+            return tx_hash
+
+    async def sign_transaction(self, tx: Dict, key: Any) -> SignedTransaction:
+        """
+        Ký giao dịch qua SignerPool dùng chung (ngoài vòng lặp sự kiện nếu được bật).
+
+        Args:
+            tx: Giao dịch đầy đủ (nonce, gas, giá gas, chainId)
+            key: Khóa riêng
+        """
+        return await get_signer_pool().sign(tx, key)
+
+    async def wait_for_receipt(
+        self, tx_hash: Union[HexBytes, str], timeout: float = 120
+    ) -> TxReceipt:
+        """
+        Chờ biên lai giao dịch qua tác vụ theo dõi khối dùng chung của chuỗi,
+        thay vì tự hỏi eth_getTransactionReceipt liên tục.
+
+        Args:
+            tx_hash: Hash giao dịch
+            timeout: Thời gian chờ tối đa (giây)
+
+        Raises:
+            TimeExhausted: Nếu không có biên lai trong thời gian chờ
+        """
+        receipt = await get_receipt_watcher(self.RPC_URLS).wait(
+            self, tx_hash, timeout
+        )
+        get_nonce_manager(self.chain_id, receipt["from"]).confirmed(
+            receipt["transactionHash"]
+        )
+        gas_cache = get_gas_cache()
+        if gas_cache is not None:
+            gas_cache.observe(receipt)
+        return receipt
+
     @retry_async(attempts=1, delay=5.0, backoff=2.0, default_value=None)
     async def execute_transaction(
         self,
@@ -151,34 +605,15 @@ class Web3Custom:
             explorer_url: URL explorer để ghi log (tùy chọn)
         """
         try:
-            nonce = await self.web3.eth.get_transaction_count(wallet.address)
-            gas_params = await self.get_gas_params()
-            if gas_params is None:
-                raise Exception("Không thể lấy tham số gas")
-
-            transaction = {
-                "from": wallet.address,
-                "nonce": nonce,
-                "chainId": chain_id,
-                **tx_data,
-                **gas_params,
-            }
-
-            # Thêm type 2 chỉ cho giao dịch EIP-1559
-            if "maxFeePerGas" in gas_params:
-                transaction["type"] = 2
-
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, wallet.key)
-            tx_hash = await self.web3.eth.send_raw_transaction(
-                signed_txn.raw_transaction
+            # Chỉ lấy các tham số còn thiếu, gộp trong một yêu cầu batch
+            tx_hash = await self.submit_transaction(
+                {"chainId": chain_id, **tx_data}, wallet
             )
 
             logger.info(
                 f"{self.account_index} | Đang chờ xác nhận giao dịch..."
             )
-            receipt = await self.web3.eth.wait_for_transaction_receipt(
-                tx_hash, poll_latency=2
-            )
+            receipt = await self.wait_for_receipt(tx_hash)
 
             if receipt["status"] == 1:
                 tx_hex = tx_hash.hex()
@@ -221,32 +656,9 @@ class Web3Custom:
         try:
             if token_abi is None:
                 # Sử dụng ABI ERC20 tối thiểu nếu không cung cấp
-                token_abi = [
-                    {
-                        "constant": True,
-                        "inputs": [
-                            {"name": "_owner", "type": "address"},
-                            {"name": "_spender", "type": "address"},
-                        ],
-                        "name": "allowance",
-                        "outputs": [{"name": "", "type": "uint256"}],
-                        "type": "function",
-                    },
-                    {
-                        "constant": False,
-                        "inputs": [
-                            {"name": "_spender", "type": "address"},
-                            {"name": "_value", "type": "uint256"},
-                        ],
-                        "name": "approve",
-                        "outputs": [{"name": "", "type": "bool"}],
-                        "type": "function",
-                    },
-                ]
-
-            token_contract = self.web3.eth.contract(
-                address=self.web3.to_checksum_address(token_address), abi=token_abi
-            )
+                token_abi = ERC20_APPROVE_ABI
+
+            token_contract = self.contract(token_address, token_abi)
 
             current_allowance = await token_contract.functions.allowance(
                 wallet.address, spender_address
@@ -258,20 +670,14 @@ class Web3Custom:
                 )
                 return None
 
-            gas_params = await self.get_gas_params()
-            if gas_params is None:
-                raise Exception("Không thể lấy tham số gas")
-
-            approve_tx = await token_contract.functions.approve(
-                spender_address, amount
-            ).build_transaction(
-                {
-                    "from": wallet.address,
-                    "nonce": await self.web3.eth.get_transaction_count(wallet.address),
-                    "chainId": chain_id,
-                    **gas_params,
-                }
-            )
+            # Nonce, gas và giá gas được điền trong execute_transaction bằng một yêu cầu batch
+            approve_tx = {
+                "to": self.web3.to_checksum_address(token_address),
+                "data": token_contract.encode_abi(
+                    "approve", args=[spender_address, amount]
+                ),
+                "value": 0,
+            }
 
             return await self.execute_transaction(
                 approve_tx, wallet=wallet, chain_id=chain_id, explorer_url=explorer_url
@@ -287,54 +693,52 @@ class Web3Custom:
     async def wait_for_balance_increase(
         self,
         wallet_address: str,
-        initial_balance: float,
+        initial_balance: Union[Balance, float, Decimal],
         token_address: Optional[str] = None,
         token_abi: Optional[list] = None,
         timeout: int = 60,
         check_interval: int = 5,
         log_interval: int = 15,
         account_index: Optional[int] = None,
+        decimals: int = 18,
     ) -> bool:
         """
         Chờ số dư tăng (hoạt động cho cả coin gốc và token).
+        Số dư được kiểm tra bởi tác vụ theo dõi dùng chung của chuỗi (mỗi khối,
+        một lần đọc cho tất cả địa chỉ đang chờ) thay vì vòng lặp riêng cho mỗi ví.
 
         Args:
             wallet_address: Địa chỉ để kiểm tra số dư
-            initial_balance: Số dư ban đầu để so sánh
+            initial_balance: Số dư ban đầu để so sánh (Balance hoặc số ở đơn vị token)
             token_address: Địa chỉ token (nếu chờ số dư token)
-            token_abi: ABI token (tùy chọn, dành cho token)
+            token_abi: Không còn dùng, giữ để tương thích
             timeout: Thời gian chờ tối đa tính bằng giây
-            check_interval: Tần suất kiểm tra số dư tính bằng giây
+            check_interval: Không còn dùng, tần suất do RPC_SETTINGS.BALANCES quyết định
             log_interval: Tần suất ghi log tiến trình tính bằng giây
             account_index: Chỉ số tài khoản để ghi log (tùy chọn)
+            decimals: Số chữ số thập phân khi initial_balance là số
         """
         logger.info(
             f"{self.account_index} | Đang chờ số dư tăng (thời gian chờ tối đa: {timeout} giây)..."
         )
-        start_time = asyncio.get_event_loop().time()
-
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            # Lấy số dư hiện tại (coin gốc hoặc token)
-            if token_address:
-                current_balance = await self.get_token_balance(
-                    wallet_address, token_address, token_abi
-                )
-            else:
-                current_balance = await self.get_balance(wallet_address)
-
-            if current_balance > initial_balance:
-                logger.success(
-                    f"{self.account_index} | Số dư đã tăng từ {initial_balance} lên {current_balance}"
-                )
-                return True
-
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % log_interval == 0:
-                logger.info(
-                    f"{self.account_index} | Vẫn đang chờ số dư tăng... ({elapsed}/{timeout} giây)"
-                )
-
-            await asyncio.sleep(check_interval)
+        if isinstance(initial_balance, Balance):
+            threshold = initial_balance.wei
+        else:
+            threshold = self.convert_to_wei(initial_balance, decimals)
+
+        new_balance = await get_balance_watcher(self.RPC_URLS).wait(
+            self,
+            wallet_address,
+            threshold,
+            token=token_address,
+            timeout=timeout,
+            log_interval=log_interval,
+        )
+        if new_balance is not None:
+            logger.success(
+                f"{self.account_index} | Số dư đã tăng từ {initial_balance} lên {self.convert_from_wei(new_balance, decimals)}"
+            )
+            return True
 
         logger.error(
             f"{self.account_index} | Số dư không tăng sau {timeout} giây"
@@ -342,12 +746,44 @@ class Web3Custom:
         return False
 
     @retry_async(attempts=3, delay=10.0, default_value=None)
-    async def estimate_gas(self, transaction: dict) -> int:
-        """Ước lượng gas cho giao dịch và thêm một số đệm."""
+    async def estimate_gas(
+        self, transaction: dict, state_override: Optional[Dict] = None
+    ) -> int:
+        """
+        Ước lượng gas cho giao dịch và thêm một số đệm.
+        Lời gọi cùng hình dạng đã có biên lai được trả từ GasEstimateCache,
+        chỉ kiểm tra revert bằng eth_call thay vì eth_estimateGas.
+
+        Args:
+            transaction: Giao dịch cần ước lượng
+            state_override: Trạng thái giả định cho các bước trước chưa được khai thác
+                (ví dụ allowance_override cho swap gửi ngay sau approve)
+        """
+        gas_cache = get_gas_cache()
+        cached_gas = None
+        if gas_cache is not None:
+            cached_gas = gas_cache.lookup(self.chain_id, transaction)
+            if cached_gas is not None:
+                try:
+                    # Kiểm tra với đúng giới hạn gas sẽ dùng, không phải giới hạn mặc định của nút
+                    await self.web3.eth.call(
+                        {**_call_fields(transaction), "gas": cached_gas},
+                        state_override=state_override,
+                    )
+                    return cached_gas
+                except Exception as e:
+                    logger.debug(
+                        f"{self.account_index} | eth_call với gas từ bộ nhớ đệm thất bại, ước lượng trực tiếp: {e}"
+                    )
         try:
-            estimated = await self.web3.eth.estimate_gas(transaction)
-            # Thêm 10% vào gas ước lượng để đảm bảo an toàn
-            return int(estimated * 2.2)
+            estimated = await self.web3.eth.estimate_gas(
+                transaction, state_override=state_override
+            )
+            if gas_cache is not None and cached_gas is not None:
+                # Giới hạn đã học không đủ cho lời gọi này
+                gas_cache.forget(gas_key(self.chain_id, transaction))
+            # Thêm đệm vào gas ước lượng để đảm bảo an toàn
+            return int(estimated * GAS_LIMIT_MULTIPLIER)
         except Exception as e:
             logger.warning(f"{self.account_index} | Lỗi khi ước lượng gas: {e}.")
             raise e
@@ -360,17 +796,19 @@ class Web3Custom:
         use_proxy: bool,
         proxy: str,
         ssl: bool = False,
+        hedge_reads: Optional[bool] = None,
     ) -> "Web3Custom":
         """
         Phương thức factory bất đồng bộ để tạo thể hiện lớp.
+        hedge_reads bật/tắt yêu cầu dự phòng cho lệnh đọc (None - theo cấu hình).
         """
-        instance = cls(account_index, RPC_URLS, use_proxy, proxy, ssl)
+        instance = cls(account_index, RPC_URLS, use_proxy, proxy, ssl, hedge_reads)
         await instance.connect_web3()
         return instance
 
     async def cleanup(self):
         """
-        Phương thức dọn dẹp để đóng phiên client Web3 đúng cách.
+        Phương thức dọn dẹp để trả kết nối Web3 về nhóm dùng chung.
         Nên gọi khi hoàn tất sử dụng thể hiện Web3.
         """
         try:
@@ -380,29 +818,14 @@ class Web3Custom:
                 )
                 return
 
-            if hasattr(self.web3, "provider"):
-                provider = self.web3.provider
-
-                # Ngắt kết nối provider
-                if hasattr(provider, "disconnect"):
-                    await provider.disconnect()
-                    logger.info(
-                        f"{self.account_index} | Ngắt kết nối provider Web3 thành công"
-                    )
-
-                # Thêm bước đóng bất kỳ phiên nào có thể tồn tại
-                if hasattr(provider, "_request_kwargs") and isinstance(
-                    provider._request_kwargs, dict
-                ):
-                    session = provider._request_kwargs.get("session")
-                    if session and hasattr(session, "close") and not session.closed:
-                        await session.close()
-                        logger.info(
-                            f"{self.account_index} | Hoàn tất dọn dẹp phiên bổ sung"
-                        )
-            else:
-                logger.warning(
-                    f"{self.account_index} | Không tìm thấy provider trong thể hiện web3"
+            if self.transports:
+                # Phiên thuộc về nhóm dùng chung, chỉ trả lại chứ không đóng
+                pool = get_transport_pool()
+                for transport in self.transports.values():
+                    await pool.release(transport)
+                self.transports = {}
+                logger.info(
+                    f"{self.account_index} | Đã trả kết nối Web3 về nhóm dùng chung"
                 )
 
         except Exception as e:
@@ -419,8 +842,8 @@ class Web3Custom:
             params: Tham số cho hàm
             abi: ABI hợp đồng
         """
-        contract = self.web3.eth.contract(abi=abi)
-        return contract.encodeABI(fn_name=function_name, args=[params])
+        contract = self.contract(None, abi)
+        return contract.encode_abi(function_name, args=[params])
 
     async def send_transaction(
         self,
@@ -440,33 +863,15 @@ class Web3Custom:
             value: Số lượng token gốc để gửi
             chain_id: ID chuỗi (tùy chọn)
         """
-        if chain_id is None:
-            chain_id = await self.web3.eth.chain_id
-
-        # Lấy ước lượng gas
         tx_params = {
-            "from": wallet.address,
             "to": to,
             "data": data,
             "value": value,
-            "chainId": chain_id,
         }
+        if chain_id is not None:
+            tx_params["chainId"] = chain_id
 
-        try:
-            gas_limit = await self.estimate_gas(tx_params)
-            tx_params["gas"] = gas_limit
-        except Exception as e:
-            raise e
-
-        # Lấy tham số giá gas
-        gas_params = await self.get_gas_params()
-        tx_params.update(gas_params)
-
-        # Lấy nonce
-        tx_params["nonce"] = await self.web3.eth.get_transaction_count(wallet.address)
-
-        # Ký và gửi giao dịch
-        signed_tx = self.web3.eth.account.sign_transaction(tx_params, wallet.key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        # Ước lượng gas, giá gas và chain ID trong một yêu cầu batch, nonce cấp cục bộ
+        tx_hash = await self.submit_transaction(tx_params, wallet)
 
         return tx_hash.hex()
\ No newline at end of file
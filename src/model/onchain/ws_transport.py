@@ -0,0 +1,282 @@
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+from loguru import logger
+
+from src.model.onchain.transport import RpcTransport, TransportLimits
+
+# Tham số eth_subscribe cho khối mới
+NEW_HEADS = ["newHeads"]
+# Thời gian chờ trước khi thử kết nối lại sau khi mất kết nối (giây)
+RECONNECT_DELAY = 5.0
+HEARTBEAT = 20.0
+
+Listener = Callable[[Any], None]
+
+
+@dataclass
+class Subscription:
+    """Một subscription trên máy chủ, dùng chung cho mọi người nghe có cùng tham số."""
+
+    params: List[Any]
+    listeners: List[Listener] = field(default_factory=list)
+    id: Optional[str] = None  # id do máy chủ cấp, None nếu chưa đăng ký
+    subscribing: bool = False
+
+    @property
+    def active(self) -> bool:
+        return self.id is not None
+
+
+class WsConnection:
+    """
+    Một WebSocket JSON-RPC cho mỗi bộ (ws_url, proxy, ssl), dùng chung cho mọi tài khoản.
+    Các yêu cầu được ghép trên cùng kết nối bằng id riêng; mỗi subscription (newHeads, logs)
+    chỉ đăng ký một lần cho mọi người nghe và tự đăng ký lại sau khi kết nối lại.
+    """
+
+    def __init__(self, ws_url: str, proxy: Optional[str], ssl: bool, request_timeout: float):
+        self.ws_url = ws_url
+        self.proxy = proxy
+        self.ssl = ssl
+        self.request_timeout = request_timeout
+        self.retry_at = 0.0  # không thử kết nối lại trước thời điểm này
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._by_id: Dict[str, Subscription] = {}
+        self._closing = False
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def _ensure_connected(self) -> None:
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            if time.monotonic() < self.retry_at:
+                raise aiohttp.ClientConnectionError(
+                    f"WebSocket {self.ws_url} đang chờ kết nối lại"
+                )
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession()
+            try:
+                self._ws = await asyncio.wait_for(
+                    self._session.ws_connect(
+                        self.ws_url,
+                        proxy=self.proxy,
+                        ssl=self.ssl,
+                        heartbeat=HEARTBEAT,
+                        max_msg_size=0,
+                    ),
+                    self.request_timeout,
+                )
+            except Exception as e:
+                self.retry_at = time.monotonic() + RECONNECT_DELAY
+                raise aiohttp.ClientConnectionError(
+                    f"Không thể kết nối WebSocket {self.ws_url}: {e}"
+                ) from e
+            self._reader = asyncio.create_task(self._read(self._ws))
+
+        for subscription in list(self._subscriptions.values()):
+            await self._subscribe_on_server(subscription)
+
+    async def _send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        request_id = next(self._ids)
+        payload["id"] = request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            try:
+                await self._ws.send_str(json.dumps(payload))
+            except (ConnectionError, RuntimeError) as e:
+                raise aiohttp.ClientConnectionError(
+                    f"Mất kết nối WebSocket {self.ws_url}: {e}"
+                ) from e
+            return await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def request(self, data: bytes) -> bytes:
+        """Gửi một yêu cầu JSON-RPC đơn lẻ đã mã hóa, trả về phản hồi với id gốc."""
+        payload = json.loads(data)
+        original_id = payload.get("id")
+        await self._ensure_connected()
+        response = await self._send(payload)
+        response["id"] = original_id
+        return json.dumps(response).encode()
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        try:
+            async for message in ws:
+                if message.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    continue
+                try:
+                    data = json.loads(message.data)
+                except ValueError:
+                    continue
+                if not isinstance(data, dict):
+                    continue
+
+                if data.get("method") == "eth_subscription":
+                    params = data.get("params") or {}
+                    subscription = self._by_id.get(params.get("subscription"))
+                    if subscription is not None:
+                        for listener in list(subscription.listeners):
+                            try:
+                                listener(params.get("result"))
+                            except Exception as e:
+                                logger.debug(f"Lỗi khi xử lý thông báo WebSocket: {e}")
+                    continue
+
+                future = self._pending.get(data.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(data)
+        finally:
+            error = aiohttp.ClientConnectionError(f"Mất kết nối WebSocket {self.ws_url}")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._by_id.clear()
+            for subscription in self._subscriptions.values():
+                subscription.id = None
+            if self._subscriptions and not self._closing:
+                logger.debug(f"Mất kết nối WebSocket {self.ws_url}, sẽ kết nối lại")
+                self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while self._subscriptions and not self._closing and not self.connected:
+            await asyncio.sleep(max(RECONNECT_DELAY, self.retry_at - time.monotonic()))
+            try:
+                await self._ensure_connected()
+            except Exception as e:
+                logger.debug(f"Kết nối lại WebSocket {self.ws_url} thất bại: {e}")
+
+    async def _subscribe_on_server(self, subscription: Subscription) -> None:
+        if subscription.active or subscription.subscribing or not self.connected:
+            return
+        subscription.subscribing = True
+        try:
+            response = await self._send(
+                {"jsonrpc": "2.0", "method": "eth_subscribe", "params": subscription.params}
+            )
+            if "result" not in response:
+                raise Exception(response.get("error"))
+            subscription.id = response["result"]
+            self._by_id[subscription.id] = subscription
+        except Exception as e:
+            logger.debug(f"Không thể đăng ký {subscription.params} qua {self.ws_url}: {e}")
+        finally:
+            subscription.subscribing = False
+
+    async def subscribe(self, params: List[Any], listener: Listener) -> Subscription:
+        """
+        Đăng ký nhận thông báo eth_subscribe (ví dụ NEW_HEADS hoặc ["logs", {...}]).
+        Không ném lỗi khi chưa kết nối được: subscription được đăng ký khi kết nối
+        thành công, người gọi kiểm tra Subscription.active để biết có nên tự hỏi RPC hay không.
+        """
+        key = json.dumps(params)
+        subscription = self._subscriptions.get(key)
+        if subscription is None:
+            subscription = Subscription(params=params)
+            self._subscriptions[key] = subscription
+        subscription.listeners.append(listener)
+
+        try:
+            await self._ensure_connected()
+            await self._subscribe_on_server(subscription)
+        except Exception as e:
+            logger.debug(f"WebSocket {self.ws_url} chưa sẵn sàng: {e}")
+            self._schedule_reconnect()
+        return subscription
+
+    async def unsubscribe(self, params: List[Any], listener: Listener) -> None:
+        key = json.dumps(params)
+        subscription = self._subscriptions.get(key)
+        if subscription is None:
+            return
+        if listener in subscription.listeners:
+            subscription.listeners.remove(listener)
+        if subscription.listeners:
+            return
+
+        del self._subscriptions[key]
+        if subscription.id is not None:
+            self._by_id.pop(subscription.id, None)
+            if self.connected:
+                try:
+                    await self._send(
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "eth_unsubscribe",
+                            "params": [subscription.id],
+                        }
+                    )
+                except Exception as e:
+                    logger.debug(f"Không thể hủy đăng ký {params} qua {self.ws_url}: {e}")
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+        self._ws = None
+        self._session = None
+
+
+class WsTransport(RpcTransport):
+    """
+    RpcTransport gửi yêu cầu đơn lẻ qua WebSocket dùng chung của RPC.
+    Yêu cầu batch và mọi yêu cầu khi WebSocket chưa kết nối được đi qua HTTP của cùng RPC.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        proxy: Optional[str],
+        ssl: bool,
+        limits: TransportLimits,
+        ws_url: str,
+        **kwargs: Any,
+    ):
+        super().__init__(rpc_url, proxy, ssl, limits, **kwargs)
+        self.ws_url = ws_url
+        self.connection = WsConnection(ws_url, proxy, ssl, limits.request_timeout)
+
+    @property
+    def closed(self) -> bool:
+        return super().closed and not self.connection.connected
+
+    async def _request(self, data: bytes) -> bytes:
+        if not data.startswith(b"[") and time.monotonic() >= self.connection.retry_at:
+            try:
+                return await self.connection.request(data)
+            except aiohttp.ClientConnectionError as e:
+                logger.debug(f"Chuyển sang HTTP cho {self.rpc_url}: {e}")
+        return await super()._request(data)
+
+    async def close(self) -> None:
+        await self.connection.close()
+        await super().close()
@@ -44,34 +44,12 @@ class Owlto:
                 "value": 0,
             }
 
-            # Estimate gas
-            try:
-                gas_limit = await self.web3.estimate_gas(tx)
-                tx["gas"] = gas_limit
-            except Exception as e:
-                raise e
-
-           # Nhận thông số giá gas
-            gas_params = await self.web3.get_gas_params()
-            tx.update(gas_params)
-
-            # Thêm ID chuỗi và nonce
             tx["chainId"] = CHAIN_ID
-            tx["nonce"] = await self.web3.web3.eth.get_transaction_count(
-                self.wallet.address
-            )
-
-           # Ký giao dịch
-            signed_tx = self.web3.web3.eth.account.sign_transaction(tx, self.wallet.key)
-
-            # Send transaction
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_tx.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hex = tx_hash.hex()
 
            # Chờ nhận giao dịch
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await self.web3.wait_for_receipt(tx_hash)
 
             if receipt["status"] == 1:
                 contract_address = receipt["contractAddress"]
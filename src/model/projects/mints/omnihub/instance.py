@@ -15,6 +15,9 @@ from src.utils.constants import EXPLORER_URL_MEGAETH
 
 CHAIN_ID = 6342  # From constants.py comment
 
+# mint(1)
+MINT_PAYLOAD = "0xa0712d680000000000000000000000000000000000000000000000000000000000000001"
+
 # ERC721 ABI for NFT balance check
 ERC721_ABI = [
     {
@@ -57,6 +60,13 @@ class OmniHub:
                 )
                 return False
 
+            contracts_to_mint = await self._filter_mintable(contracts_to_mint)
+            if not contracts_to_mint:
+                logger.warning(
+                    f"{self.account_index} | Tất cả hợp đồng OmniHub sẽ bị revert khi đúc (đã bán hết hoặc đóng)"
+                )
+                return False
+
             contract_to_mint = random.choice(contracts_to_mint)
     
             logger.info(
@@ -85,14 +95,29 @@ class OmniHub:
             await asyncio.sleep(random_pause)
             raise
 
+    async def _filter_mintable(self, contracts: list) -> list:
+        """Mô phỏng mint(1) trên mọi hợp đồng ứng viên trong một yêu cầu batch, bỏ hợp đồng sẽ revert."""
+        unique = list({contract["address"]: contract for contract in contracts}.values())
+        results = await self.web3.simulate(
+            *(
+                {
+                    "from": self.wallet.address,
+                    "to": contract["address"],
+                    "data": MINT_PAYLOAD,
+                    "value": Web3.to_wei(contract["price"], "ether"),
+                }
+                for contract in unique
+            )
+        )
+        return [
+            contract for contract, result in zip(unique, results) if not result.reverted
+        ]
+
     @retry_async(default_value=0)
     async def _check_nft_balance(self, contract_address: str) -> int:
         """Kiểm tra số dư NFT cho ví hiện tại từ hợp đồng đã cho."""
         try:
-            nft_contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(contract_address),
-                abi=ERC721_ABI,
-            )
+            nft_contract = self.web3.contract(contract_address, ERC721_ABI)
 
             balance = await nft_contract.functions.balanceOf(self.wallet.address).call()
             return balance
@@ -107,11 +132,9 @@ class OmniHub:
             title = contract["title"]
             address = contract["address"]
 
-            payload = "0xa0712d680000000000000000000000000000000000000000000000000000000000000001"
-
             tx_hash = await self.web3.send_transaction(
                 to=address,
-                data=payload,
+                data=MINT_PAYLOAD,
                 wallet=self.wallet,
                 value=Web3.to_wei(price, "ether"),
                 chain_id=CHAIN_ID,
@@ -121,7 +144,7 @@ class OmniHub:
             logger.info(
                 f"{self.account_index} | Đang chờ xác nhận giao dịch..."
             )
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(
+            receipt = await self.web3.wait_for_receipt(
                 tx_hash, timeout=120
             )
 
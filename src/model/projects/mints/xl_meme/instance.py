@@ -6,6 +6,8 @@ import os
 
 from eth_account import Account
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.contracts import get_function_codec, prepare_call
+from src.model.onchain.preflight import PreflightError
 from loguru import logger
 import primp
 from web3 import Web3
@@ -133,17 +135,40 @@ class XLMeme:
                 },
             ]
 
-            contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(contract_address),
-                abi=contract_abi,
-            )
-
             # Đảm bảo amount là số nguyên
             amount = int(amount)
 
-            # Sử dụng phương thức estimateBuy để lấy số lượng token dự kiến
+            # estimateBuy và mô phỏng buyForETH trong một yêu cầu batch:
+            # bonding curve đã đóng bị phát hiện trước khi ký và gửi giao dịch
+            estimate_result, buy_result = await self.web3.simulate(
+                prepare_call(
+                    contract_address, contract_abi, "estimateBuy", amount
+                ).as_transaction(),
+                prepare_call(
+                    contract_address,
+                    contract_abi,
+                    "buyForETH",
+                    self.wallet.address,
+                    amount,
+                    0,
+                    value=amount,
+                ).as_transaction({"from": self.wallet.address}),
+            )
+            if buy_result.reverted:
+                raise PreflightError(buy_result.reason)
+
+            # Sử dụng kết quả estimateBuy để lấy số lượng token dự kiến
             try:
-                estimated_tokens = await contract.functions.estimateBuy(amount).call()
+                if estimate_result.success:
+                    estimated_tokens = get_function_codec(
+                        contract_abi, "estimateBuy", 1
+                    ).decode(estimate_result.output)[0]
+                elif estimate_result.reverted:
+                    raise Exception(estimate_result.reason)
+                else:
+                    # Mô phỏng bị tắt hoặc lỗi RPC: lấy báo giá bằng lời gọi riêng
+                    contract = self.web3.contract(contract_address, contract_abi)
+                    estimated_tokens = await contract.functions.estimateBuy(amount).call()
                 # Sử dụng 95% số lượng token dự kiến để tính đến trượt giá
                 supply_amount_out_min = int(estimated_tokens * 0.95)
             except Exception as e:
@@ -158,28 +183,23 @@ class XLMeme:
             )
 
             # Tạo giao dịch cơ bản với các thiết lập tối thiểu
-            tx = await contract.functions.buyForETH(
-                self.wallet.address, amount, supply_amount_out_min
-            ).build_transaction(
+            tx = prepare_call(
+                contract_address,
+                contract_abi,
+                "buyForETH",
+                self.wallet.address,
+                amount,
+                supply_amount_out_min,
+                value=amount,
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "value": amount,
                     "chainId": CHAIN_ID,
-                    "nonce": await self.web3.web3.eth.get_transaction_count(
-                        self.wallet.address
-                    ),
                 }
             )
 
-            # Xóa các tham số gas có thể xung đột
-            if "maxFeePerGas" in tx:
-                del tx["maxFeePerGas"]
-            if "maxPriorityFeePerGas" in tx:
-                del tx["maxPriorityFeePerGas"]
-
-            # Chỉ thêm gasPrice
-            gas_price = await self.web3.web3.eth.gas_price
-            tx["gasPrice"] = int(gas_price * 1.1)  # Tăng 10%
+            # Thêm tham số gas (EIP-1559 hoặc gasPrice tùy chuỗi)
+            tx.update(await self.web3.get_gas_params(multiplier=1.1))  # Tăng 10%
 
             # Ước tính gas
             try:
@@ -191,17 +211,11 @@ class XLMeme:
             except Exception as e:
                 raise e
 
-            # Ký và gửi giao dịch
-            signed_txn = self.web3.web3.eth.account.sign_transaction(
-                tx, self.wallet.key
-            )
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_txn.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hash_hex = tx_hash.hex()
 
             # Đợi giao dịch hoàn tất
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(
+            receipt = await self.web3.wait_for_receipt(
                 tx_hash, timeout=60
             )
 
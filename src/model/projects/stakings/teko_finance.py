@@ -7,6 +7,8 @@ import os
 from eth_account.messages import encode_typed_data
 from eth_account import Account
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.contracts import prepare_call
+from src.model.onchain.preflight import allowance_override
 from loguru import logger
 import primp
 from web3 import Web3
@@ -18,6 +20,9 @@ from src.utils.constants import EXPLORER_URL_MEGAETH
 
 CHAIN_ID = 6342  # Từ bình luận trong constants.py
 
+# Hợp đồng vault nhận deposit và rút tiền
+TEKO_VAULT = Web3.to_checksum_address("0x13c051431753fCE53eaEC02af64A38A273E198D0")
+
 
 class TekoFinance:
     def __init__(
@@ -73,7 +78,27 @@ class TekoFinance:
 
             random.shuffle(payloads)
 
-            for payload in payloads:
+            # Mô phỏng mọi lệnh mint faucet trong một yêu cầu batch, bỏ qua lệnh sẽ revert
+            results = await self.web3.simulate(
+                *(
+                    {
+                        "from": self.wallet.address,
+                        "to": payload["contract"],
+                        "data": payload["payload"],
+                    }
+                    for payload in payloads
+                )
+            )
+            mintable = []
+            for payload, result in zip(payloads, results):
+                if result.reverted:
+                    logger.warning(
+                        f"{self.account_index} | Bỏ qua faucet {payload['token']}: giao dịch sẽ bị revert ({result.reason})"
+                    )
+                else:
+                    mintable.append(payload)
+
+            for payload in mintable:
                 await self._request_faucet_token(
                     payload["token"], payload["payload"], payload["contract"]
                 )
@@ -93,18 +118,7 @@ class TekoFinance:
             )
 
             # Lấy số dư token tkUSDC
-            token_contract = self.web3.web3.eth.contract(
-                address=token_address,
-                abi=[
-                    {
-                        "constant": True,
-                        "inputs": [{"name": "_owner", "type": "address"}],
-                        "name": "balanceOf",
-                        "outputs": [{"name": "balance", "type": "uint256"}],
-                        "type": "function",
-                    }
-                ],
-            )
+            token_contract = self.web3.contract(token_address, ERC20_ABI)
 
             token_balance = await token_contract.functions.balanceOf(
                 self.wallet.address
@@ -120,10 +134,6 @@ class TekoFinance:
                 f"{self.account_index} | Số dư tkUSDC hiện tại: {formatted_balance:.6f} USDC"
             )
 
-            # Phê duyệt token để chi tiêu
-            approve_data = "0x095ea7b300000000000000000000000013c051431753fce53eaec02af64a38a273e198d0ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff"
-            await self._approve(token_address, "tkUSDC", approve_data)
-
             # Tính toán số lượng stake dựa trên phần trăm trong cấu hình
             min_percent, max_percent = (
                 self.config.STAKINGS.TEKO_FINANCE.BALANCE_PERCENTAGE_TO_STAKE
@@ -137,6 +147,19 @@ class TekoFinance:
                 f"{self.account_index} | Sẽ stake {stake_percentage:.2f}% tkUSDC: {formatted_amount:.6f} USDC"
             )
 
+            # Mô phỏng deposit trước khi gửi approve, allowance được giả định bằng state override
+            override = await allowance_override(
+                self.web3.web3, token_address, self.wallet.address, TEKO_VAULT
+            )
+            if override is not None:
+                await self.web3.preflight(
+                    self._deposit_tx(amount_to_stake), state_override=override
+                )
+
+            # Phê duyệt token để chi tiêu
+            approve_data = "0x095ea7b300000000000000000000000013c051431753fce53eaec02af64a38a273e198d0ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff"
+            await self._approve(token_address, "tkUSDC", approve_data)
+
             # Thực hiện deposit
             await self._deposit_tkUSDC(amount_to_stake)
 
@@ -227,9 +250,6 @@ class TekoFinance:
                 "to": token_address,
                 "data": approve_data,
                 "value": 0,  # Không gửi giá trị ETH
-                "nonce": await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                ),
                 "chainId": CHAIN_ID,
                 **gas_params,
             }
@@ -245,17 +265,11 @@ class TekoFinance:
             if "maxFeePerGas" in gas_params:
                 tx["type"] = 2
 
-            # Ký giao dịch
-            signed_tx = self.web3.web3.eth.account.sign_transaction(tx, self.wallet.key)
-
-            # Gửi giao dịch
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_tx.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hex = tx_hash.hex()
 
             # Đợi biên lai giao dịch
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await self.web3.wait_for_receipt(tx_hash)
 
             if receipt["status"] == 1:
                 logger.success(
@@ -279,6 +293,24 @@ class TekoFinance:
             await asyncio.sleep(random_pause)
             raise
 
+    def _deposit_tx(self, amount: int) -> dict:
+        """Giao dịch deposit tkUSDC vào vault Teko Finance (chưa có nonce và gas)."""
+        # Định dạng số lượng dưới dạng hex, sử dụng 8 ký tự
+        hex_amount = hex(amount)[2:].zfill(8)
+
+        # Định dạng địa chỉ ví không có tiền tố 0x
+        wallet_address_no_prefix = self.wallet.address[2:].lower()
+
+        # Xây dựng payload
+        payload = f"0x8dbdbe6d57841b7b735a58794b8d4d8c38644050529cec291846e80e5afa791048c9410a00000000000000000000000000000000000000000000000000000000{hex_amount}000000000000000000000000{wallet_address_no_prefix}"
+
+        return {
+            "from": self.wallet.address,
+            "to": TEKO_VAULT,
+            "data": payload,
+            "value": 0,
+        }
+
     @retry_async(default_value=False)
     async def _deposit_tkUSDC(self, amount):
         try:
@@ -288,38 +320,16 @@ class TekoFinance:
                 f"{self.account_index} | Đang deposit {formatted_amount:.6f} USDC vào Teko Finance..."
             )
 
-            # Định dạng số lượng dưới dạng hex, sử dụng 8 ký tự
-            hex_amount = hex(amount)[2:].zfill(8)
-
-            # Định dạng địa chỉ ví không có tiền tố 0x
-            wallet_address_no_prefix = self.wallet.address[2:].lower()
-
-            # Xây dựng payload
-            payload = f"0x8dbdbe6d57841b7b735a58794b8d4d8c38644050529cec291846e80e5afa791048c9410a00000000000000000000000000000000000000000000000000000000{hex_amount}000000000000000000000000{wallet_address_no_prefix}"
-
-            # Địa chỉ hợp đồng để deposit
-            contract_address = Web3.to_checksum_address(
-                "0x13c051431753fCE53eaEC02af64A38A273E198D0"
-            )
-
-            # Chuẩn bị nonce
-            nonce = await self.web3.web3.eth.get_transaction_count(self.wallet.address)
-
             # Chuẩn bị giao dịch
             base_tx = {
-                "from": self.wallet.address,
-                "to": contract_address,
-                "data": payload,
-                "value": 0,
-                "nonce": nonce,
+                **self._deposit_tx(amount),
                 "chainId": CHAIN_ID,
             }
 
             # Thử ước tính gas, nếu không được thì sử dụng giá trị cố định
             try:
-                # Lấy giá gas
-                gas_price = await self.web3.web3.eth.gas_price
-                base_tx["gasPrice"] = gas_price
+                # Lấy tham số gas
+                base_tx.update(await self.web3.get_gas_params(multiplier=1.0))
 
                 # Ước tính gas
                 estimated_gas = await self.web3.web3.eth.estimate_gas(base_tx)
@@ -328,20 +338,12 @@ class TekoFinance:
                 # Sử dụng giá trị cố định
                 base_tx["gas"] = 127769
 
-            # Ký giao dịch
-            signed_tx = self.web3.web3.eth.account.sign_transaction(
-                base_tx, self.private_key
-            )
-
-            # Gửi giao dịch
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_tx.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(base_tx, self.wallet)
             tx_hex = tx_hash.hex()
 
             # Đợi xác nhận deposit
             logger.info(f"{self.account_index} | Đang đợi xác nhận deposit...")
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await self.web3.wait_for_receipt(tx_hash)
 
             if receipt["status"] == 1:
                 logger.success(
@@ -377,33 +379,7 @@ class TekoFinance:
             # ID pool chính xác cho tkUSDC
             tkUSDC_pool_id = 39584631314667805491088689848282554447608744687563418855093496965842959155466
 
-            # ABI cho các hàm lấy số dư và rút
-            abi = [
-                {
-                    "type": "function",
-                    "name": "getAssetsOf",
-                    "inputs": [
-                        {"name": "poolId", "type": "uint256"},
-                        {"name": "guy", "type": "address"},
-                    ],
-                    "outputs": [{"name": "", "type": "uint256"}],
-                    "stateMutability": "view",
-                },
-                {
-                    "type": "function",
-                    "name": "withdraw",
-                    "inputs": [
-                        {"name": "poolId", "type": "uint256"},
-                        {"name": "assets", "type": "uint256"},
-                        {"name": "receiver", "type": "address"},
-                        {"name": "owner", "type": "address"},
-                    ],
-                    "outputs": [{"name": "shares", "type": "uint256"}],
-                    "stateMutability": "nonpayable",
-                },
-            ]
-
-            contract = self.web3.web3.eth.contract(address=contract_address, abi=abi)
+            contract = self.web3.contract(contract_address, TEKO_POOL_ABI)
 
             # Lấy số dư của người dùng trong pool
             try:
@@ -444,44 +420,27 @@ class TekoFinance:
                 f"{self.account_index} | Đang rút {formatted_amount:.6f} USDC từ Teko Finance..."
             )
 
-            # Lấy nonce
-            nonce = await self.web3.web3.eth.get_transaction_count(self.wallet.address)
-
             # Lấy giá gas hiện tại
-            gas_price = await self.web3.web3.eth.gas_price
+            gas_price = await self.web3.get_gas_price()
             logger.info(
                 f"{self.account_index} | Giá gas hiện tại: {gas_price / 10**9:.9f} Gwei"
             )
 
             # Tạo giao dịch cơ bản không có gas
-            base_tx = {"from": self.wallet.address, "nonce": nonce, "chainId": CHAIN_ID}
-
-            # Nếu mạng hỗ trợ EIP-1559, sử dụng maxFeePerGas và maxPriorityFeePerGas
-            if hasattr(self.web3.web3.eth, "max_priority_fee"):
-                try:
-                    # Lấy phí ưu tiên tối đa
-                    max_priority_fee = await self.web3.web3.eth.max_priority_fee
+            base_tx = {"from": self.wallet.address, "chainId": CHAIN_ID}
 
-                    # Đặt maxFeePerGas và maxPriorityFeePerGas
-                    base_tx["maxPriorityFeePerGas"] = max_priority_fee
-                    base_tx["maxFeePerGas"] = max_priority_fee + (gas_price * 2)
-
-                    logger.info(
-                        f"{self.account_index} | Sử dụng gas EIP-1559: maxPriorityFeePerGas={max_priority_fee / 10**9:.9f} Gwei, maxFeePerGas={(max_priority_fee + (gas_price * 2)) / 10**9:.9f} Gwei"
-                    )
-                except Exception as e:
-                    # Nếu không lấy được max_priority_fee, sử dụng gasPrice thông thường
-                    logger.warning(
-                        f"{self.account_index} | Không thể lấy max_priority_fee: {e}. Sử dụng gasPrice tiêu chuẩn."
-                    )
-                    base_tx["gasPrice"] = gas_price
-            else:
-                # Nếu mạng không hỗ trợ EIP-1559, sử dụng gasPrice thông thường
-                base_tx["gasPrice"] = gas_price
+            # Phí EIP-1559 (hoặc gasPrice trên chuỗi không hỗ trợ) từ nguồn phí dùng chung
+            gas_params = await self.web3.get_gas_params(multiplier=1.0)
+            if gas_params is None:
+                raise Exception("Không thể lấy thông số gas")
+            base_tx.update(gas_params)
 
             # Chuẩn bị dữ liệu cho hàm rút
             # withdraw(poolId, assets, receiver, owner)
-            func_call = contract.functions.withdraw(
+            withdraw_call = prepare_call(
+                contract.address,
+                TEKO_POOL_ABI,
+                "withdraw",
                 pool_id,  # Pool ID chính xác cho tkUSDC
                 amount,  # Số lượng token để rút
                 self.wallet.address,  # Người nhận (receiver)
@@ -490,11 +449,8 @@ class TekoFinance:
 
             # Động thái đánh giá gas cho giao dịch
             try:
-                # Thêm to vào giao dịch để đánh giá gas
-                est_tx = {**base_tx, "to": contract.address}
-
                 # Lấy dữ liệu giao dịch
-                tx_data = func_call.build_transaction(est_tx)
+                tx_data = withdraw_call.as_transaction(base_tx)
 
                 # Ước tính gas
                 estimated_gas = await self.web3.web3.eth.estimate_gas(tx_data)
@@ -517,24 +473,16 @@ class TekoFinance:
                 base_tx["gas"] = fallback_gas
 
             # Xây dựng giao dịch hoàn chỉnh
-            tx = func_call.build_transaction(base_tx)
-
-            # Ký giao dịch
-            signed_tx = self.web3.web3.eth.account.sign_transaction(
-                tx, self.private_key
-            )
+            tx = withdraw_call.as_transaction(base_tx)
 
-            # Gửi giao dịch
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_tx.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hex = tx_hash.hex()
 
             # Đợi xác nhận giao dịch
             logger.info(
                 f"{self.account_index} | Đang đợi xác nhận rút tiền... TX: {EXPLORER_URL_MEGAETH}{tx_hex}"
             )
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await self.web3.wait_for_receipt(tx_hash)
 
             # Tính toán chi phí gas để ghi log
             gas_used = receipt["gasUsed"]
@@ -585,38 +533,7 @@ class TekoFinance:
             )
 
             # Kiểm tra xem đã phê duyệt tkETH chưa
-            tk_eth_contract = self.web3.web3.eth.contract(
-                address=tk_eth_address,
-                abi=[
-                    {
-                        "constant": True,
-                        "inputs": [
-                            {"name": "_owner", "type": "address"},
-                            {"name": "_spender", "type": "address"},
-                        ],
-                        "name": "allowance",
-                        "outputs": [{"name": "remaining", "type": "uint256"}],
-                        "type": "function",
-                    },
-                    {
-                        "constant": False,
-                        "inputs": [
-                            {"name": "_spender", "type": "address"},
-                            {"name": "_value", "type": "uint256"},
-                        ],
-                        "name": "approve",
-                        "outputs": [{"name": "success", "type": "bool"}],
-                        "type": "function",
-                    },
-                    {
-                        "constant": True,
-                        "inputs": [{"name": "_owner", "type": "address"}],
-                        "name": "balanceOf",
-                        "outputs": [{"name": "balance", "type": "uint256"}],
-                        "type": "function",
-                    },
-                ],
-            )
+            tk_eth_contract = self.web3.contract(tk_eth_address, TK_ETH_ABI)
 
             # Kiểm tra số dư tkETH
             tk_eth_balance = await tk_eth_contract.functions.balanceOf(
@@ -649,14 +566,15 @@ class TekoFinance:
                 if gas_params is None:
                     raise Exception("Không thể lấy thông số gas")
 
-                approve_tx = await tk_eth_contract.functions.approve(
-                    contract_address, 2**256 - 1  # Phê duyệt tối đa
-                ).build_transaction(
+                approve_tx = prepare_call(
+                    tk_eth_address,
+                    TK_ETH_ABI,
+                    "approve",
+                    contract_address,
+                    2**256 - 1,  # Phê duyệt tối đa
+                ).as_transaction(
                     {
                         "from": self.wallet.address,
-                        "nonce": await self.web3.web3.eth.get_transaction_count(
-                            self.wallet.address
-                        ),
                         "chainId": CHAIN_ID,
                         **gas_params,
                     }
@@ -696,58 +614,6 @@ class TekoFinance:
                 f"{self.account_index} | Số dư ETH hiện tại: {eth_balance.ether} ETH"
             )
 
-            # Lưu ABI trực tiếp trong code - bao gồm tất cả các hàm cần thiết
-            pool_abi = [
-                # Hàm deposit
-                {
-                    "type": "function",
-                    "name": "deposit",
-                    "inputs": [
-                        {"name": "poolId", "type": "uint256"},
-                        {"name": "assets", "type": "uint256"},
-                        {"name": "receiver", "type": "address"},
-                    ],
-                    "outputs": [{"name": "shares", "type": "uint256"}],
-                    "stateMutability": "nonpayable",
-                },
-                # Hàm borrow
-                {
-                    "type": "function",
-                    "name": "borrow",
-                    "inputs": [
-                        {"name": "poolId", "type": "uint256"},
-                        {"name": "position", "type": "address"},
-                        {"name": "amt", "type": "uint256"},
-                    ],
-                    "outputs": [{"name": "borrowShares", "type": "uint256"}],
-                    "stateMutability": "nonpayable",
-                },
-                # Hàm accrue - QUAN TRỌNG để gọi trước các thao tác
-                {
-                    "type": "function",
-                    "name": "accrue",
-                    "inputs": [{"name": "id", "type": "uint256"}],
-                    "outputs": [],
-                    "stateMutability": "nonpayable",
-                },
-                # Hàm getAssetsOf để kiểm tra số dư
-                {
-                    "type": "function",
-                    "name": "getAssetsOf",
-                    "inputs": [
-                        {"name": "poolId", "type": "uint256"},
-                        {"name": "guy", "type": "address"},
-                    ],
-                    "outputs": [{"name": "", "type": "uint256"}],
-                    "stateMutability": "view",
-                },
-            ]
-
-            # Tạo instance hợp đồng cho pool cho vay
-            pool_contract = self.web3.web3.eth.contract(
-                address=contract_address, abi=pool_abi
-            )
-
             # Lấy ID pool ETH để deposit tài sản thế chấp
             eth_pool_id = 72572175584673509244743384162953726919624465952543019256792130552168516108177
 
@@ -762,18 +628,15 @@ class TekoFinance:
                 if gas_params is None:
                     raise Exception("Không thể lấy thông số gas")
 
-                # Lấy nonce hiện tại
-                nonce = await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                )
-
-                # Xây dựng giao dịch accrue
-                accrue_tx = await pool_contract.functions.accrue(
-                    eth_pool_id  # Pool ID cho tkETH
-                ).build_transaction(
+                # Xây dựng giao dịch accrue (nonce do execute_transaction cấp)
+                accrue_tx = prepare_call(
+                    contract_address,
+                    TEKO_POOL_ABI,
+                    "accrue",
+                    eth_pool_id,  # Pool ID cho tkETH
+                ).as_transaction(
                     {
                         "from": self.wallet.address,
-                        "nonce": nonce,
                         "chainId": CHAIN_ID,
                         "gas": 200000,  # Giới hạn gas bảo thủ
                         **gas_params,
@@ -805,22 +668,22 @@ class TekoFinance:
                 )
 
             # Tiếp tục deposit
-            # Lấy thông số gas và nonce mới
+            # Lấy thông số gas mới
             gas_params = await self.web3.get_gas_params()
             if gas_params is None:
                 raise Exception("Không thể lấy thông số gas")
 
-            nonce = await self.web3.web3.eth.get_transaction_count(self.wallet.address)
-
             # Xây dựng giao dịch deposit (sử dụng ước tính gas thấp hơn để tiết kiệm ETH)
-            deposit_tx = await pool_contract.functions.deposit(
+            deposit_tx = prepare_call(
+                contract_address,
+                TEKO_POOL_ABI,
+                "deposit",
                 eth_pool_id,  # Pool ID cho tkETH
                 amount_to_deposit,  # Số lượng để deposit
                 self.wallet.address,  # Người nhận
-            ).build_transaction(
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "nonce": nonce,
                     "chainId": CHAIN_ID,
                     "gas": 200000,  # Giới hạn gas giảm để tiết kiệm ETH
                     **gas_params,
@@ -861,18 +724,15 @@ class TekoFinance:
                     f"{self.account_index} | Đang tính lãi cho pool USDC trước khi vay..."
                 )
 
-                # Lấy nonce mới
-                nonce = await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                )
-
                 # Xây dựng giao dịch accrue cho pool USDC
-                accrue_tx = await pool_contract.functions.accrue(
-                    pool_id  # Pool ID cho tkUSDC
-                ).build_transaction(
+                accrue_tx = prepare_call(
+                    contract_address,
+                    TEKO_POOL_ABI,
+                    "accrue",
+                    pool_id,  # Pool ID cho tkUSDC
+                ).as_transaction(
                     {
                         "from": self.wallet.address,
-                        "nonce": nonce,
                         "chainId": CHAIN_ID,
                         "gas": 200000,  # Giới hạn gas bảo thủ
                         **gas_params,
@@ -903,21 +763,22 @@ class TekoFinance:
                     f"{self.account_index} | Lỗi khi tính lãi cho pool USDC, nhưng sẽ thử tiếp tục: {e}"
                 )
 
-            # Lấy nonce và thông số gas mới
-            nonce = await self.web3.web3.eth.get_transaction_count(self.wallet.address)
+            # Lấy thông số gas mới
             gas_params = await self.web3.get_gas_params()
             if gas_params is None:
                 raise Exception("Không thể lấy thông số gas")
 
             # Xây dựng giao dịch vay với ước tính gas thấp hơn
-            borrow_tx = await pool_contract.functions.borrow(
+            borrow_tx = prepare_call(
+                contract_address,
+                TEKO_POOL_ABI,
+                "borrow",
                 pool_id,  # Pool ID cho tkUSDC
                 self.wallet.address,  # Vị trí (người vay)
                 borrow_amount,  # Số lượng vay (đã giảm)
-            ).build_transaction(
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "nonce": nonce,
                     "chainId": CHAIN_ID,
                     "gas": 300000,  # Giới hạn gas giảm
                     **gas_params,
@@ -956,4 +817,96 @@ ERC20_ABI = [
     }
 ]
 
-TK_USDC_ADDRESS = "0xFaf334e157175Ff676911AdcF0964D7f54F2C424"
\ No newline at end of file
+TK_USDC_ADDRESS = "0xFaf334e157175Ff676911AdcF0964D7f54F2C424"
+
+
+# tkETH: kiểm tra phê duyệt, phê duyệt và số dư
+TK_ETH_ABI = [
+    {
+        "constant": True,
+        "inputs": [
+            {"name": "_owner", "type": "address"},
+            {"name": "_spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "remaining", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_spender", "type": "address"},
+            {"name": "_value", "type": "uint256"},
+        ],
+        "name": "approve",
+        "outputs": [{"name": "success", "type": "bool"}],
+        "type": "function",
+    },
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function",
+    },
+]
+
+# Pool cho vay Teko: deposit, borrow, accrue, getAssetsOf, withdraw
+TEKO_POOL_ABI = [
+    # Hàm deposit
+    {
+        "type": "function",
+        "name": "deposit",
+        "inputs": [
+            {"name": "poolId", "type": "uint256"},
+            {"name": "assets", "type": "uint256"},
+            {"name": "receiver", "type": "address"},
+        ],
+        "outputs": [{"name": "shares", "type": "uint256"}],
+        "stateMutability": "nonpayable",
+    },
+    # Hàm borrow
+    {
+        "type": "function",
+        "name": "borrow",
+        "inputs": [
+            {"name": "poolId", "type": "uint256"},
+            {"name": "position", "type": "address"},
+            {"name": "amt", "type": "uint256"},
+        ],
+        "outputs": [{"name": "borrowShares", "type": "uint256"}],
+        "stateMutability": "nonpayable",
+    },
+    # Hàm accrue - QUAN TRỌNG để gọi trước các thao tác
+    {
+        "type": "function",
+        "name": "accrue",
+        "inputs": [{"name": "id", "type": "uint256"}],
+        "outputs": [],
+        "stateMutability": "nonpayable",
+    },
+    # Hàm getAssetsOf để kiểm tra số dư
+    {
+        "type": "function",
+        "name": "getAssetsOf",
+        "inputs": [
+            {"name": "poolId", "type": "uint256"},
+            {"name": "guy", "type": "address"},
+        ],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+    },
+    # Hàm withdraw
+    {
+        "type": "function",
+        "name": "withdraw",
+        "inputs": [
+            {"name": "poolId", "type": "uint256"},
+            {"name": "assets", "type": "uint256"},
+            {"name": "receiver", "type": "address"},
+            {"name": "owner", "type": "address"},
+        ],
+        "outputs": [{"name": "shares", "type": "uint256"}],
+        "stateMutability": "nonpayable",
+    },
+]
@@ -7,6 +7,7 @@ import os
 from eth_account.messages import encode_typed_data
 from eth_account import Account
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.contracts import prepare_call
 from loguru import logger
 import primp
 from web3 import Web3
@@ -123,9 +124,7 @@ class Bebop:
             logger.info(f"{self.account_index} | Đang bắt đầu thao tác hoán đổi tại Bebop...")
 
             # Kiểm tra số dư WETH
-            weth_contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(WETH_CONTRACT), abi=WETH_ABI
-            )
+            weth_contract = self.web3.contract(WETH_CONTRACT, WETH_ABI)
             weth_balance_wei = await weth_contract.functions.balanceOf(
                 self.wallet.address
             ).call()
@@ -203,9 +202,7 @@ class Bebop:
             logger.info(f"{self.account_index} | Đang kiểm tra số dư cUSD...")
 
             # Tạo phiên bản hợp đồng
-            cusd_contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(CUSD_CONTRACT), abi=ERC20_ABI
-            )
+            cusd_contract = self.web3.contract(CUSD_CONTRACT, ERC20_ABI)
 
             # Lấy số dư
             balance_wei = await cusd_contract.functions.balanceOf(
@@ -230,33 +227,22 @@ class Bebop:
 
             logger.info(f"{self.account_index} | Đang gói {amount_eth} ETH thành WETH...")
 
-            # Tạo phiên bản hợp đồng
-            weth_contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(WETH_CONTRACT), abi=WETH_ABI
-            )
-
             # Lấy tham số gas
             gas_params = await self.web3.get_gas_params()
             if gas_params is None:
                 raise Exception("Không thể lấy tham số gas")
 
-            # Chuẩn bị tham số giao dịch
+            # Chuẩn bị tham số giao dịch (nonce do execute_transaction cấp)
             tx_params = {
                 "from": self.wallet.address,
-                "value": amount_wei,
-                "nonce": await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                ),
                 "chainId": CHAIN_ID,
                 **gas_params,
             }
 
-            # Đặt loại giao dịch dựa trên tham số gas
-            if "maxFeePerGas" in gas_params:
-                tx_params["type"] = 2
-
             # Xây dựng giao dịch sử dụng hàm deposit
-            tx = await weth_contract.functions.deposit().build_transaction(tx_params)
+            tx = prepare_call(
+                WETH_CONTRACT, WETH_ABI, "deposit", value=amount_wei
+            ).as_transaction(tx_params)
 
             # Thực hiện giao dịch
             tx_hash = await self.web3.execute_transaction(
@@ -291,34 +277,26 @@ class Bebop:
         try:
             logger.info(f"{self.account_index} | Đang phê duyệt WETH để chi tiêu...")
 
-            # Tạo phiên bản hợp đồng
-            weth_contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(WETH_CONTRACT), abi=WETH_ABI
-            )
-
             # Lấy tham số gas
             gas_params = await self.web3.get_gas_params()
             if gas_params is None:
                 raise Exception("Không thể lấy tham số gas")
 
-            # Chuẩn bị tham số giao dịch
+            # Chuẩn bị tham số giao dịch (nonce do execute_transaction cấp)
             tx_params = {
                 "from": self.wallet.address,
-                "nonce": await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                ),
                 "chainId": CHAIN_ID,
                 **gas_params,
             }
 
-            # Đặt loại giao dịch dựa trên tham số gas
-            if "maxFeePerGas" in gas_params:
-                tx_params["type"] = 2
-
             # Xây dựng giao dịch để phê duyệt số lượng tối đa
-            tx = await weth_contract.functions.approve(
-                self.web3.web3.to_checksum_address(SPENDER_CONTRACT), MAX_UINT256
-            ).build_transaction(tx_params)
+            tx = prepare_call(
+                WETH_CONTRACT,
+                WETH_ABI,
+                "approve",
+                self.web3.web3.to_checksum_address(SPENDER_CONTRACT),
+                MAX_UINT256,
+            ).as_transaction(tx_params)
 
             # Thực hiện giao dịch
             tx_hash = await self.web3.execute_transaction(
@@ -369,9 +347,6 @@ class Bebop:
                 "to": CUSD_CONTRACT,  # Hợp đồng token cUSD
                 "data": approve_data,
                 "value": 0,  # Không gửi giá trị ETH
-                "nonce": await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                ),
                 "chainId": CHAIN_ID,
                 **gas_params,
             }
@@ -387,17 +362,11 @@ class Bebop:
             if "maxFeePerGas" in gas_params:
                 tx["type"] = 2
 
-            # Ký giao dịch
-            signed_tx = self.web3.web3.eth.account.sign_transaction(tx, self.wallet.key)
-
-            # Gửi giao dịch
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_tx.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hex = tx_hash.hex()
 
             # Đợi biên lai giao dịch
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await self.web3.wait_for_receipt(tx_hash)
 
             if receipt["status"] == 1:
                 logger.success(
@@ -451,9 +420,6 @@ class Bebop:
                 "to": WETH_CONTRACT,  # Hợp đồng token WETH
                 "data": withdraw_data,
                 "value": 0,  # Không gửi giá trị ETH
-                "nonce": await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                ),
                 "chainId": CHAIN_ID,
                 **gas_params,
             }
@@ -472,17 +438,11 @@ class Bebop:
             if "maxFeePerGas" in gas_params:
                 tx["type"] = 2
 
-            # Ký giao dịch
-            signed_tx = self.web3.web3.eth.account.sign_transaction(tx, self.wallet.key)
-
-            # Gửi giao dịch
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_tx.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hex = tx_hash.hex()
 
             # Đợi biên lai giao dịch
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await self.web3.wait_for_receipt(tx_hash)
 
             if receipt["status"] == 1:
                 logger.success(
@@ -3,6 +3,8 @@ from eth_account.messages import encode_typed_data
 from eth_account import Account
 from src.model.projects.swaps.constants import GTE_SWAPS_ABI, GTE_SWAPS_CONTRACT, GTE_TOKENS
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.contracts import prepare_call
+from src.model.onchain.preflight import allowance_override
 from loguru import logger
 import primp
 from web3 import Web3
@@ -33,10 +35,7 @@ class GteSwaps:
         self.wallet = wallet
         self.proxy = proxy
         self.private_key = private_key
-        self.contract = self.web3.web3.eth.contract(
-            address=self.web3.web3.to_checksum_address(GTE_SWAPS_CONTRACT), 
-            abi=GTE_SWAPS_ABI
-        )
+        self.contract = self.web3.contract(GTE_SWAPS_CONTRACT, GTE_SWAPS_ABI)
 
     @retry_async(default_value=([], None))
     async def _get_path(self, balances: dict) -> tuple[list[str], str]:
@@ -118,10 +117,7 @@ class GteSwaps:
             # Multicall contract for balance checking
                      
             # Create multicall contract instance
-            multicall_contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(BALANCE_CHECKER_CONTRACT_ADDRESS),
-                abi=BALANCE_CHECKER_ABI
-            )
+            multicall_contract = self.web3.contract(BALANCE_CHECKER_CONTRACT_ADDRESS, BALANCE_CHECKER_ABI)
             
             # Prepare token addresses list (include ETH as 0x0 address)
             token_addresses = [
@@ -242,27 +238,67 @@ class GteSwaps:
     async def _sign_and_send_transaction(self, tx, operation_name="giao dịch"):
         """Ký, gửi và đợi giao dịch được khai thác"""
         try:
-            # Sign and send transaction
-            signed_tx = self.web3.web3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            tx_hash_hex = tx_hash.hex()
-            explorer_link = f"{EXPLORER_URL_MEGAETH}{tx_hash_hex}"
-            
-            logger.info(f"[{self.account_index}] {operation_name} đã gửi: {explorer_link}")
-            
-            # Wait for transaction to be mined
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            if receipt.status == 1:
-                logger.success(f"[{self.account_index}] {operation_name} thành công! TX: {explorer_link}")
-            else:
-                logger.error(f"[{self.account_index}] {operation_name} thất bại! TX: {explorer_link}")
-            
-            return receipt
+            tx_hash = await self._submit(tx, operation_name)
+            return await self._wait(tx_hash, operation_name)
         except Exception as e:
             logger.error(f"[{self.account_index}] Lỗi trong _sign_and_send_transaction ({operation_name}): {e}")
             return None
 
+    async def _submit(self, tx, operation_name):
+        """Ký và gửi giao dịch, không chờ khai thác"""
+        tx_hash = await self.web3.submit_transaction(tx, self.wallet)
+        logger.info(f"[{self.account_index}] {operation_name} đã gửi: {EXPLORER_URL_MEGAETH}{tx_hash.hex()}")
+        return tx_hash
+
+    async def _wait(self, tx_hash, operation_name):
+        """Đợi giao dịch đã gửi được khai thác"""
+        explorer_link = f"{EXPLORER_URL_MEGAETH}{tx_hash.hex()}"
+        receipt = await self.web3.wait_for_receipt(tx_hash)
+
+        if receipt.status == 1:
+            logger.success(f"[{self.account_index}] {operation_name} thành công! TX: {explorer_link}")
+        else:
+            logger.error(f"[{self.account_index}] {operation_name} thất bại! TX: {explorer_link}")
+
+        return receipt
+
+    async def _approve_and_swap(self, token_address, token_symbol, amount_in, approval_tx, tx, operation_name):
+        """
+        Gửi approve và swap liên tiếp (nonce n, n+1) rồi đợi cả hai biên lai.
+        Gas của swap được ước lượng với allowance giả định bằng state override; nếu RPC
+        không hỗ trợ state override thì đợi approve được khai thác rồi mới ước lượng swap.
+        """
+        spender = self.web3.web3.to_checksum_address(GTE_SWAPS_CONTRACT)
+        override = await allowance_override(
+            self.web3.web3, token_address, self.wallet.address, spender, amount_in
+        )
+
+        if override is None:
+            approval_receipt = await self._sign_and_send_transaction(approval_tx, f"Phê duyệt {token_symbol}")
+            if not approval_receipt or approval_receipt.status != 1:
+                logger.error(f"[{self.account_index}] Giao dịch phê duyệt thất bại")
+                return False
+            tx["gas"] = await self.web3.estimate_gas(tx)
+            logger.info(f"[{self.account_index}] Ước tính gas cho {operation_name}: {tx['gas']}")
+            receipt = await self._sign_and_send_transaction(tx, operation_name)
+            return receipt and receipt.status == 1
+
+        # Swap sẽ bị revert ngay cả khi đã approve: không gửi gì cả
+        await self.web3.preflight(tx, state_override=override)
+        tx["gas"] = await self.web3.estimate_gas(tx, state_override=override)
+        logger.info(f"[{self.account_index}] Ước tính gas cho {operation_name}: {tx['gas']}")
+
+        approval_hash = await self._submit(approval_tx, f"Phê duyệt {token_symbol}")
+        swap_hash = await self._submit(tx, operation_name)
+        approval_receipt, receipt = await asyncio.gather(
+            self._wait(approval_hash, f"Phê duyệt {token_symbol}"),
+            self._wait(swap_hash, operation_name),
+        )
+        if approval_receipt.status != 1:
+            logger.error(f"[{self.account_index}] Giao dịch phê duyệt thất bại")
+            return False
+        return receipt.status == 1
+
     async def _calculate_min_output(self, path, amount_in, slippage_percentage=10):
         """
         Tính toán lượng đầu ra tối thiểu dựa trên giá hiện tại và mức độ trượt giá cho phép
@@ -334,10 +370,6 @@ class GteSwaps:
             gas = await self.web3.get_gas_params()
             deadline = int(time.time()) + 20 * 60
 
-            # Get the current nonce for the address
-            nonce = await self.web3.web3.eth.get_transaction_count(self.wallet.address)
-            logger.info(f"[{self.account_index}] Sử dụng nonce {nonce} cho hoán đổi ETH -> {target_token_symbol}")
-
             # Ensure path addresses are checksum
             checksum_path = [self.web3.web3.to_checksum_address(addr) for addr in path]
             
@@ -345,16 +377,18 @@ class GteSwaps:
             min_output = await self._calculate_min_output(checksum_path, amount_eth, 10)
 
             # Build transaction without gas limit first
-            tx = await self.contract.functions.swapExactETHForTokens(
+            tx = prepare_call(
+                GTE_SWAPS_CONTRACT,
+                GTE_SWAPS_ABI,
+                "swapExactETHForTokens",
                 min_output,  # Use calculated min amount instead of 0
                 checksum_path,
                 self.wallet.address,
-                deadline
-            ).build_transaction(
+                deadline,
+                value=amount_eth,
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "value": amount_eth,
-                    "nonce": nonce,
                     **gas,
                 }
             )
@@ -423,21 +457,16 @@ class GteSwaps:
             gas = await self.web3.get_gas_params()
             deadline = int(time.time()) + 20 * 60
             
-            # Get the current nonce for the address
-            nonce = await self.web3.web3.eth.get_transaction_count(self.wallet.address)
-            logger.info(f"[{self.account_index}] Sử dụng nonce {nonce} cho phê duyệt")
-            
-            # Create token contract for approval
-            token_contract = self.web3.web3.eth.contract(address=source_token_address, abi=ERC20_ABI)
-            
             # Build approval transaction without gas limit first
-            approval_tx = await token_contract.functions.approve(
+            approval_tx = prepare_call(
+                source_token_address,
+                ERC20_ABI,
+                "approve",
                 self.web3.web3.to_checksum_address(GTE_SWAPS_CONTRACT),
-                amount_in
-            ).build_transaction(
+                amount_in,
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "nonce": nonce,
                     **gas,
                 }
             )
@@ -446,16 +475,6 @@ class GteSwaps:
             approval_tx["gas"] = await self.web3.estimate_gas(approval_tx)
             logger.info(f"[{self.account_index}] Ước tính gas cho phê duyệt token: {approval_tx['gas']}")
             
-            # Sign and send approval
-            approval_receipt = await self._sign_and_send_transaction(approval_tx, f"Phê duyệt {source_token_symbol}")
-            if not approval_receipt or approval_receipt.status != 1:
-                logger.error(f"[{self.account_index}] Giao dịch phê duyệt thất bại")
-                return False
-            
-            # Increment nonce for the next transaction
-            nonce += 1
-            logger.info(f"[{self.account_index}] Sử dụng nonce {nonce} cho hoán đổi Token -> ETH")
-            
             # Ensure path addresses are checksum
             checksum_path = [self.web3.web3.to_checksum_address(addr) for addr in path]
             
@@ -463,26 +482,31 @@ class GteSwaps:
             min_output = await self._calculate_min_output(checksum_path, amount_in, 10)
             
             # Build swap transaction without gas limit first
-            tx = await self.contract.functions.swapExactTokensForETH(
+            tx = prepare_call(
+                GTE_SWAPS_CONTRACT,
+                GTE_SWAPS_ABI,
+                "swapExactTokensForETH",
                 amount_in,
                 min_output,  # Use calculated min amount instead of 0
                 checksum_path,
                 self.wallet.address,
-                deadline
-            ).build_transaction(
+                deadline,
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "nonce": nonce,
                     **gas,
                 }
             )
             
-            # Estimate gas for swap
-            tx["gas"] = await self.web3.estimate_gas(tx)
-            logger.info(f"[{self.account_index}] Ước tính gas cho hoán đổi Token -> ETH: {tx['gas']}")
-            
-            receipt = await self._sign_and_send_transaction(tx, f"Hoán đổi {source_token_symbol} -> ETH")
-            return receipt and receipt.status == 1
+            # Send approval and swap back-to-back, then wait for both
+            return await self._approve_and_swap(
+                source_token_address,
+                source_token_symbol,
+                amount_in,
+                approval_tx,
+                tx,
+                f"Hoán đổi {source_token_symbol} -> ETH",
+            )
             
         except Exception as e:
             logger.error(f"[{self.account_index}] Lỗi trong _swap_token_to_native: {e}")
@@ -514,21 +538,16 @@ class GteSwaps:
             gas = await self.web3.get_gas_params()
             deadline = int(time.time()) + 20 * 60
             
-            # Get the current nonce for the address
-            nonce = await self.web3.web3.eth.get_transaction_count(self.wallet.address)
-            logger.info(f"[{self.account_index}] Sử dụng nonce {nonce} cho phê duyệt")
-            
-            # Create token contract for approval
-            token_contract = self.web3.web3.eth.contract(address=source_token_address, abi=ERC20_ABI)
-            
             # Build approval transaction without gas limit first
-            approval_tx = await token_contract.functions.approve(
+            approval_tx = prepare_call(
+                source_token_address,
+                ERC20_ABI,
+                "approve",
                 self.web3.web3.to_checksum_address(GTE_SWAPS_CONTRACT),
-                amount_in
-            ).build_transaction(
+                amount_in,
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "nonce": nonce,
                     **gas,
                 }
             )
@@ -537,16 +556,6 @@ class GteSwaps:
             approval_tx["gas"] = await self.web3.estimate_gas(approval_tx)
             logger.info(f"[{self.account_index}] Ước tính gas cho phê duyệt token: {approval_tx['gas']}")
             
-            # Sign and send approval
-            approval_receipt = await self._sign_and_send_transaction(approval_tx, f"Phê duyệt {source_token_symbol}")
-            if not approval_receipt or approval_receipt.status != 1:
-                logger.error(f"[{self.account_index}] Giao dịch phê duyệt thất bại")
-                return False
-            
-            # Increment nonce for the next transaction
-            nonce += 1
-            logger.info(f"[{self.account_index}] Sử dụng nonce {nonce} cho hoán đổi Token -> Token")
-            
             # Ensure path addresses are checksum
             checksum_path = [self.web3.web3.to_checksum_address(addr) for addr in path]
             
@@ -554,26 +563,31 @@ class GteSwaps:
             min_output = await self._calculate_min_output(checksum_path, amount_in, 10)
             
             # Build swap transaction without gas limit first
-            tx = await self.contract.functions.swapExactTokensForTokens(
+            tx = prepare_call(
+                GTE_SWAPS_CONTRACT,
+                GTE_SWAPS_ABI,
+                "swapExactTokensForTokens",
                 amount_in,
                 min_output,  # Use calculated min amount instead of 0
                 checksum_path,
                 self.wallet.address,
-                deadline
-            ).build_transaction(
+                deadline,
+            ).as_transaction(
                 {
                     "from": self.wallet.address,
-                    "nonce": nonce,
                     **gas,
                 }
             )
             
-            # Estimate gas for swap
-            tx["gas"] = await self.web3.estimate_gas(tx)
-            logger.info(f"[{self.account_index}] Ước tính gas cho hoán đổi Token -> Token: {tx['gas']}")
-            
-            receipt = await self._sign_and_send_transaction(tx, f"Hoán đổi {source_token_symbol} -> {target_token_symbol}")
-            return receipt and receipt.status == 1
+            # Send approval and swap back-to-back, then wait for both
+            return await self._approve_and_swap(
+                source_token_address,
+                source_token_symbol,
+                amount_in,
+                approval_tx,
+                tx,
+                f"Hoán đổi {source_token_symbol} -> {target_token_symbol}",
+            )
             
         except Exception as e:
             logger.error(f"[{self.account_index}] Lỗi trong _swap_token_to_token: {e}")
@@ -2,6 +2,7 @@ import random
 from eth_account.messages import encode_typed_data
 from eth_account import Account
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.contracts import prepare_call
 from loguru import logger
 import primp
 from web3 import Web3
@@ -84,10 +85,7 @@ class Rainmakr:
         self.private_key = private_key
 
         self.bearer_token = ""
-        self.contract = self.web3.web3.eth.contract(
-            address=self.web3.web3.to_checksum_address(TOKEN_FACTORY_ADDRESS),
-            abi=TOKEN_FACTORY_ABI,
-        )
+        self.contract = self.web3.contract(TOKEN_FACTORY_ADDRESS, TOKEN_FACTORY_ABI)
 
     async def buy_meme(self):
         try:
@@ -178,14 +176,10 @@ class Rainmakr:
                 "value": amount,  # Số lượng ETH để chi tiêu
                 "data": payload,  # Payload với địa chỉ token và địa chỉ ví
                 "chainId": CHAIN_ID,
-                "nonce": await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                ),
             }
 
             # Get gas price
-            gas_price = await self.web3.web3.eth.gas_price
-            tx["gasPrice"] = int(gas_price * 1.1)  # Tăng 10%
+            tx.update(await self.web3.get_gas_params(multiplier=1.1))  # Tăng 10%
 
             # Estimate gas
             try:
@@ -197,17 +191,11 @@ class Rainmakr:
             except Exception as e:
                 raise e
 
-            # Sign and send transaction
-            signed_txn = self.web3.web3.eth.account.sign_transaction(
-                tx, self.private_key
-            )
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_txn.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hash_hex = tx_hash.hex()
 
             # Wait for transaction receipt
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(
+            receipt = await self.web3.wait_for_receipt(
                 tx_hash, timeout=60
             )
 
@@ -232,10 +220,7 @@ class Rainmakr:
     async def _sell(self, contract_address: str):
         try:
             # Create ERC20 contract instance to check balance
-            token_contract = self.web3.web3.eth.contract(
-                address=self.web3.web3.to_checksum_address(contract_address),
-                abi=ERC20_ABI,
-            )
+            token_contract = self.web3.contract(contract_address, ERC20_ABI)
 
             # Get token balance for the wallet
             token_balance = await token_contract.functions.balanceOf(
@@ -289,16 +274,13 @@ class Rainmakr:
                 max_approval = 2**256 - 1
 
                 # Tạo giao dịch phê duyệt
-                approval_tx = await token_contract.functions.approve(
-                    TOKEN_FACTORY_ADDRESS, max_approval
-                ).build_transaction(
+                approval_tx = prepare_call(
+                    contract_address, ERC20_ABI, "approve", TOKEN_FACTORY_ADDRESS, max_approval
+                ).as_transaction(
                     {
                         "from": self.wallet.address,
                         "chainId": CHAIN_ID,
-                        "nonce": await self.web3.web3.eth.get_transaction_count(
-                            self.wallet.address
-                        ),
-                        "gasPrice": await self.web3.web3.eth.gas_price,
+                        **(await self.web3.get_gas_params(multiplier=1.0)),
                     }
                 )
 
@@ -309,17 +291,11 @@ class Rainmakr:
                 except Exception as e:
                     raise e
 
-                # Ký và gửi giao dịch phê duyệt
-                signed_approval = self.web3.web3.eth.account.sign_transaction(
-                    approval_tx, self.private_key
-                )
-                approval_hash = await self.web3.web3.eth.send_raw_transaction(
-                    signed_approval.raw_transaction
-                )
+                approval_hash = await self.web3.submit_transaction(approval_tx, self.wallet)
 
                 # Đợi giao dịch phê duyệt hoàn thành
                 approval_receipt = (
-                    await self.web3.web3.eth.wait_for_transaction_receipt(approval_hash)
+                    await self.web3.wait_for_receipt(approval_hash)
                 )
 
                 if approval_receipt["status"] == 1:
@@ -349,14 +325,10 @@ class Rainmakr:
                 "value": 0,  # Không có giá trị ETH
                 "data": payload,
                 "chainId": CHAIN_ID,
-                "nonce": await self.web3.web3.eth.get_transaction_count(
-                    self.wallet.address
-                ),
             }
 
             # Lấy giá gas
-            gas_price = await self.web3.web3.eth.gas_price
-            tx["gasPrice"] = int(gas_price * 1.1)  # Tăng 10%
+            tx.update(await self.web3.get_gas_params(multiplier=1.1))  # Tăng 10%
 
             # Ước tính gas
             try:
@@ -368,17 +340,11 @@ class Rainmakr:
             except Exception as e:
                 raise e
 
-            # Ký và gửi giao dịch
-            signed_txn = self.web3.web3.eth.account.sign_transaction(
-                tx, self.private_key
-            )
-            tx_hash = await self.web3.web3.eth.send_raw_transaction(
-                signed_txn.raw_transaction
-            )
+            tx_hash = await self.web3.submit_transaction(tx, self.wallet)
             tx_hash_hex = tx_hash.hex()
 
             # Đợi biên lai giao dịch
-            receipt = await self.web3.web3.eth.wait_for_transaction_receipt(
+            receipt = await self.web3.wait_for_receipt(
                 tx_hash, timeout=60
             )
 
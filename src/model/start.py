@@ -1,4 +1,4 @@
-from eth_account import Account
+from eth_account.signers.local import LocalAccount
 from loguru import logger
 import primp
 import random
@@ -23,8 +23,10 @@ from src.model.megaeth.faucet import faucet
 from src.model.projects.other.gte_faucet.instance import GteFaucet
 from src.model.help.stats import WalletStats
 from src.model.onchain.web3_custom import Web3Custom
+from src.model.onchain.signer import get_signer_pool
 from src.utils.client import create_client
 from src.utils.config import Config
+from src.utils.worker_pool import pause as pause_account
 from src.model.database.db_manager import Database
 from src.utils.telegram_logger import send_telegram_message
 from src.utils.reader import read_private_keys
@@ -46,11 +48,14 @@ class Start:
         self.session: primp.AsyncClient | None = None
         self.megaeth_web3: Web3Custom | None = None
 
-        self.wallet = Account.from_key(self.private_key)
-        self.wallet_address = self.wallet.address
+        # Suy ra trong initialize() qua SignerPool để không chặn vòng lặp sự kiện
+        self.wallet: LocalAccount | None = None
+        self.wallet_address: str | None = None
 
     async def initialize(self):
         try:
+            self.wallet = await get_signer_pool().account(self.private_key)
+            self.wallet_address = self.wallet.address
             self.session = await create_client(
                 self.proxy, self.config.OTHERS.SKIP_SSL_VERIFICATION
             )
@@ -304,7 +309,7 @@ class Start:
                 self.session,
                 self.megaeth_web3,
                 self.config,
-                Account.from_key(private_keys[0]),
+                await get_signer_pool().account(private_keys[0]),
                 self.proxy,
                 private_keys[0],
             )
@@ -424,4 +429,5 @@ class Start:
         logger.info(
             f"{self.account_index} | Nghỉ {pause} giây sau nhiệm vụ {task_name}"
         )
-        await asyncio.sleep(pause)
\ No newline at end of file
+        # Trả slot của bộ lập lịch trong lúc nghỉ
+        await pause_account(pause)
\ No newline at end of file
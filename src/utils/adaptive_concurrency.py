@@ -0,0 +1,145 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+
+from src.model.onchain.rpc_metrics import RequestStats, RpcMetrics
+from src.utils.worker_pool import SlotScheduler
+
+# Lớp lỗi RPC báo hiệu quá tải: giảm số luồng ngay
+CONGESTION_ERRORS = frozenset(
+    {
+        "HTTP 429",
+        "TimeoutError",
+        "ServerTimeoutError",
+        "ConnectionTimeoutError",
+        "SocketTimeoutError",
+    }
+)
+CONGESTION_EVENTS = frozenset({"nonce_error"})
+
+
+@dataclass
+class AdaptiveSettings:
+    min_threads: int = 1
+    max_threads: int = 50
+    target_p95: float = 2.0  # độ trễ p95 RPC mục tiêu (giây)
+    target_error_rate: float = 0.05
+    interval: float = 10.0  # chu kỳ điều chỉnh (giây)
+    increase: int = 1  # số luồng thêm mỗi chu kỳ khi mọi chỉ số đạt mục tiêu
+    decrease: float = 0.7  # nhân số luồng với hệ số này khi quá tải
+    min_requests: int = 20  # số yêu cầu tối thiểu trong chu kỳ để đánh giá độ trễ
+
+
+class AdaptiveConcurrency:
+    """
+    Điều chỉnh số slot của SlotScheduler theo kiểu AIMD từ số liệu RPC của mỗi chu kỳ:
+    tăng cộng khi p95 độ trễ và tỷ lệ lỗi dưới mục tiêu và mọi slot đều bận,
+    giảm nhân khi gặp 429, hết thời gian chờ hoặc lỗi nonce.
+    """
+
+    def __init__(
+        self,
+        scheduler: SlotScheduler,
+        metrics: RpcMetrics,
+        settings: Optional[AdaptiveSettings] = None,
+    ):
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.settings = settings or AdaptiveSettings()
+        self._previous: RequestStats = metrics.totals()
+        self._previous_events = metrics.events.copy()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.interval)
+            try:
+                self.adjust()
+            except Exception as e:
+                logger.warning(f"Lỗi khi điều chỉnh số luồng: {e}")
+
+    def adjust(self) -> int:
+        """Đánh giá số liệu từ lần gọi trước và trả về số slot mới."""
+        settings = self.settings
+        totals = self.metrics.totals()
+        window = totals.since(self._previous)
+        events = self.metrics.events - self._previous_events
+        self._previous = totals
+        self._previous_events = self.metrics.events.copy()
+
+        limit = self.scheduler.limit
+        congestion = sum(window.errors[name] for name in CONGESTION_ERRORS) + sum(
+            events[name] for name in CONGESTION_EVENTS
+        )
+        if congestion:
+            new_limit = max(settings.min_threads, int(limit * settings.decrease))
+            if new_limit < limit:
+                logger.warning(
+                    f"Giảm số luồng {limit} -> {new_limit}: {congestion} lỗi quá tải (429, hết thời gian chờ, nonce)"
+                )
+        elif (
+            window.requests >= settings.min_requests
+            and self.scheduler.saturated
+            and window.latency.percentile(95) <= settings.target_p95
+            and self._error_rate(window) <= settings.target_error_rate
+        ):
+            new_limit = min(settings.max_threads, limit + settings.increase)
+        else:
+            new_limit = limit
+
+        if new_limit != limit:
+            self.scheduler.set_limit(new_limit)
+        return new_limit
+
+    @staticmethod
+    def _error_rate(window: RequestStats) -> float:
+        # Bản sao thua của yêu cầu dự phòng bị hủy và giao dịch sẽ bị revert
+        # (mô phỏng trước khi gửi) không phải lỗi của RPC
+        errors = (
+            sum(window.errors.values())
+            - window.errors["cancelled"]
+            - window.errors["revert"]
+        )
+        return errors / window.requests if window.requests else 0.0
+
+
+def create_adaptive_concurrency(scheduler: SlotScheduler) -> Optional[AdaptiveConcurrency]:
+    """Tạo bộ điều khiển cho scheduler, None nếu SCHEDULER.ADAPTIVE hoặc RPC_SETTINGS.METRICS bị tắt"""
+    from src.model.onchain.rpc_metrics import get_rpc_metrics
+    from src.utils.config import get_config
+
+    config = get_config().SCHEDULER
+    if not config.ADAPTIVE:
+        return None
+    metrics = get_rpc_metrics()
+    if metrics is None:
+        logger.warning("SCHEDULER.ADAPTIVE cần RPC_SETTINGS.METRICS, dùng số luồng cố định")
+        return None
+    return AdaptiveConcurrency(
+        scheduler,
+        metrics,
+        AdaptiveSettings(
+            min_threads=config.MIN_THREADS,
+            max_threads=config.MAX_THREADS,
+            target_p95=config.TARGET_P95,
+            target_error_rate=config.TARGET_ERROR_RATE,
+            interval=config.INTERVAL,
+            increase=config.INCREASE,
+            decrease=config.DECREASE,
+        ),
+    )
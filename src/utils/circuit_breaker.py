@@ -0,0 +1,140 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Dịch vụ đang bị ngắt sau nhiều lỗi liên tiếp, yêu cầu bị từ chối ngay."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} đang tạm ngắt, thử lại sau {retry_in:.0f} giây")
+        self.name = name
+        self.retry_in = retry_in
+
+
+@dataclass
+class CircuitBreakerSettings:
+    failure_threshold: int = 5  # số lỗi liên tiếp trước khi ngắt
+    recovery_timeout: float = 30.0  # thời gian ngắt trước khi cho phép yêu cầu thử (giây)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker cho một dịch vụ (host qua một proxy).
+
+    closed - yêu cầu đi qua bình thường, đếm lỗi liên tiếp
+    open - từ chối ngay mọi yêu cầu bằng CircuitOpenError
+    half_open - sau recovery_timeout cho phép một yêu cầu thử (mỗi recovery_timeout
+        tối đa một yêu cầu); thành công thì đóng lại, lỗi thì ngắt tiếp
+    """
+
+    def __init__(self, name: str, settings: CircuitBreakerSettings):
+        self.name = name
+        self.settings = settings
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_until = 0.0
+        self.next_probe_at = 0.0
+        self.rejected = 0  # số yêu cầu bị từ chối khi đang ngắt
+
+    @property
+    def available(self) -> bool:
+        """Yêu cầu tiếp theo có được phép đi qua hay không (không thay đổi trạng thái)."""
+        now = time.monotonic()
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now >= self.opened_until
+        return now >= self.next_probe_at
+
+    def check(self) -> None:
+        """Gọi trước mỗi yêu cầu. Ném CircuitOpenError nếu dịch vụ đang bị ngắt."""
+        if self.state == CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == OPEN and now >= self.opened_until:
+            self.state = HALF_OPEN
+            self.next_probe_at = now
+        if self.state == HALF_OPEN and now >= self.next_probe_at:
+            # Yêu cầu thử; nếu bị hủy hoặc treo, yêu cầu thử tiếp theo sau recovery_timeout
+            self.next_probe_at = now + self.settings.recovery_timeout
+            return
+        self.rejected += 1
+        retry_at = self.opened_until if self.state == OPEN else self.next_probe_at
+        raise CircuitOpenError(self.name, max(0.0, retry_at - now))
+
+    def record_success(self) -> None:
+        if self.state == OPEN:
+            # Phản hồi muộn của yêu cầu gửi trước khi ngắt, chờ yêu cầu thử
+            return
+        if self.state == HALF_OPEN:
+            logger.info(f"{self.name} đã hoạt động trở lại")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED
+            and self.consecutive_failures >= self.settings.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_until = time.monotonic() + self.settings.recovery_timeout
+        logger.warning(
+            f"Tạm ngắt {self.name} trong {self.settings.recovery_timeout:.0f} giây "
+            f"sau {self.consecutive_failures} lỗi liên tiếp"
+        )
+
+
+class CircuitBreakerRegistry:
+    """Sổ đăng ký circuit breaker dùng chung theo bộ (host, proxy) cho toàn bộ tiến trình."""
+
+    def __init__(self, settings: Optional[CircuitBreakerSettings] = None):
+        self.settings = settings or CircuitBreakerSettings()
+        self._breakers: Dict[Tuple[str, Optional[str]], CircuitBreaker] = {}
+
+    def get(self, url: str, proxy: Optional[str] = None) -> CircuitBreaker:
+        """Lấy circuit breaker cho host của url qua proxy (None - kết nối trực tiếp)."""
+        # host[:port] không kèm thông tin đăng nhập
+        host = urlsplit(url).netloc.rsplit("@", 1)[-1] or url
+        key = (host, proxy or None)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            name = host if not proxy else f"{host} (proxy {proxy_host(proxy)})"
+            breaker = CircuitBreaker(name, self.settings)
+            self._breakers[key] = breaker
+        return breaker
+
+
+def proxy_host(proxy: str) -> str:
+    """Bỏ thông tin đăng nhập khỏi proxy khi ghi log."""
+    return proxy.rsplit("@", 1)[-1]
+
+
+def get_circuit_breakers() -> Optional[CircuitBreakerRegistry]:
+    """Lấy sổ đăng ký circuit breaker dùng chung, None nếu CIRCUIT_BREAKER bị tắt"""
+    if not hasattr(get_circuit_breakers, "_registry"):
+        from src.utils.config import get_config
+
+        circuit_breaker = get_config().CIRCUIT_BREAKER
+        get_circuit_breakers._registry = (
+            CircuitBreakerRegistry(
+                CircuitBreakerSettings(
+                    failure_threshold=circuit_breaker.FAILURE_THRESHOLD,
+                    recovery_timeout=circuit_breaker.RECOVERY_TIMEOUT,
+                )
+            )
+            if circuit_breaker.ENABLED
+            else None
+        )
+    return get_circuit_breakers._registry
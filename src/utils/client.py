@@ -1,10 +1,38 @@
 import primp
 
+from src.utils.circuit_breaker import get_circuit_breakers
+
+
+class GuardedAsyncClient(primp.AsyncClient):
+    """
+    primp.AsyncClient kiểm tra circuit breaker của (host, proxy) trước mỗi yêu cầu:
+    khi API hoặc proxy đang bị ngắt, yêu cầu lỗi ngay bằng CircuitOpenError
+    thay vì mỗi tài khoản tự chờ hết thời gian chờ.
+    """
+
+    async def request(self, method, url: str, **kwargs):
+        breakers = get_circuit_breakers()
+        if breakers is None:
+            return await super().request(method, url, **kwargs)
+
+        breaker = breakers.get(url, self.proxy)
+        breaker.check()
+        try:
+            response = await super().request(method, url, **kwargs)
+        except Exception:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
 
 async def create_client(
     proxy: str, skip_ssl_verification: bool = True
 ) -> primp.AsyncClient:
-    session = primp.AsyncClient(impersonate="chrome_131", verify=skip_ssl_verification)
+    session = GuardedAsyncClient(impersonate="chrome_131", verify=skip_ssl_verification)
 
     if proxy:
         session.proxy = proxy
@@ -41,6 +41,146 @@ class RpcsConfig:
     MEGAETH: List[str]
 
 
+@dataclass
+class RpcPoolConfig:
+    MAX_CONNECTIONS: int = 100
+    MAX_CONNECTIONS_PER_HOST: int = 0
+    KEEPALIVE_TIMEOUT: float = 30
+    REQUEST_TIMEOUT: float = 30
+    IDLE_TTL: float = 120
+    PROBE_TTL: float = 30
+
+
+@dataclass
+class RpcBalancerConfig:
+    EWMA_ALPHA: float = 0.3
+    MAX_ERROR_RATE: float = 0.5
+    EJECT_AFTER_FAILURES: int = 3
+    EJECT_SECONDS: float = 30
+    RATE_LIMIT_PENALTY_SECONDS: float = 10
+
+
+@dataclass
+class RpcHedgingConfig:
+    ENABLED: bool = False
+    PERCENTILE: float = 95
+    MIN_DELAY: float = 0.2
+    MAX_DELAY: float = 3.0
+
+
+@dataclass
+class RpcCoalescingConfig:
+    ENABLED: bool = True
+    TTL: float = 0
+    MAX_ENTRIES: int = 10000
+
+
+@dataclass
+class RpcRateLimitConfig:
+    ENABLED: bool = True
+    RATE: float = 20
+    BURST: float = 20
+    MIN_RATE: float = 1
+    MAX_RATE: float = 200
+    INCREASE: float = 5
+    DECREASE: float = 0.5
+    MAX_PAUSE: float = 60
+
+
+@dataclass
+class RpcWebsocketConfig:
+    ENABLED: bool = False
+    URLS: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RpcGasOracleConfig:
+    REFRESH_INTERVAL: float = 3
+    EIP1559: bool = True
+    FEE_HISTORY_BLOCKS: int = 10
+    PRIORITY_PERCENTILE: float = 50
+    BASE_FEE_MULTIPLIER: float = 2.0
+
+
+@dataclass
+class RpcGasCacheConfig:
+    ENABLED: bool = True
+    MARGIN: float = 1.3
+    MIN_SAMPLES: int = 3
+    MAX_SPREAD: float = 0.2
+
+
+@dataclass
+class RpcPreflightConfig:
+    ENABLED: bool = True
+
+
+@dataclass
+class RpcMetricsConfig:
+    ENABLED: bool = True
+
+
+@dataclass
+class RpcReceiptsConfig:
+    POLL_INTERVAL: float = 0
+    BATCH_SIZE: int = 100
+    PROXY: str = ""
+
+
+@dataclass
+class RpcBalancesConfig:
+    POLL_INTERVAL: float = 0
+    BATCH_SIZE: int = 100
+    PROXY: str = ""
+
+
+@dataclass
+class RpcSettingsConfig:
+    POOL: RpcPoolConfig = field(default_factory=RpcPoolConfig)
+    BALANCER: RpcBalancerConfig = field(default_factory=RpcBalancerConfig)
+    HEDGING: RpcHedgingConfig = field(default_factory=RpcHedgingConfig)
+    COALESCING: RpcCoalescingConfig = field(default_factory=RpcCoalescingConfig)
+    RATE_LIMIT: RpcRateLimitConfig = field(default_factory=RpcRateLimitConfig)
+    WEBSOCKET: RpcWebsocketConfig = field(default_factory=RpcWebsocketConfig)
+    GAS_ORACLE: RpcGasOracleConfig = field(default_factory=RpcGasOracleConfig)
+    GAS_CACHE: RpcGasCacheConfig = field(default_factory=RpcGasCacheConfig)
+    PREFLIGHT: RpcPreflightConfig = field(default_factory=RpcPreflightConfig)
+    METRICS: RpcMetricsConfig = field(default_factory=RpcMetricsConfig)
+    RECEIPTS: RpcReceiptsConfig = field(default_factory=RpcReceiptsConfig)
+    BALANCES: RpcBalancesConfig = field(default_factory=RpcBalancesConfig)
+
+
+@dataclass
+class CircuitBreakerConfig:
+    ENABLED: bool = True
+    FAILURE_THRESHOLD: int = 5
+    RECOVERY_TIMEOUT: float = 30
+
+
+@dataclass
+class SchedulerConfig:
+    RELEASE_SLOT_ON_PAUSE: bool = False
+    MAX_PAUSED_PER_THREAD: int = 1
+    ADAPTIVE: bool = False
+    MIN_THREADS: int = 1
+    MAX_THREADS: int = 50
+    TARGET_P95: float = 2.0
+    TARGET_ERROR_RATE: float = 0.05
+    INTERVAL: float = 10
+    INCREASE: int = 1
+    DECREASE: float = 0.7
+    MAX_ACCOUNTS_PER_PROXY: int = 0
+    LOOKAHEAD: int = 100
+    STICKY_PROXY: bool = False
+
+
+@dataclass
+class SignerConfig:
+    ENABLED: bool = False
+    MODE: str = "process"
+    WORKERS: int = 0
+
+
 @dataclass
 class OthersConfig:
     SKIP_SSL_VERIFICATION: bool
@@ -159,6 +299,10 @@ class Config:
     MINTS: MintsConfig
     EXCHANGES: ExchangesConfig
     CRUSTY_SWAP: CrustySwapConfig
+    RPC_SETTINGS: RpcSettingsConfig = field(default_factory=RpcSettingsConfig)
+    SIGNER: SignerConfig = field(default_factory=SignerConfig)
+    CIRCUIT_BREAKER: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
+    SCHEDULER: SchedulerConfig = field(default_factory=SchedulerConfig)
     WALLETS: WalletsConfig = field(default_factory=WalletsConfig)
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
@@ -183,6 +327,23 @@ class Config:
             print(f"Lỗi: {error_msg}")
             raise ImportError(error_msg) from e
 
+        rpc_settings = data.get("RPC_SETTINGS") or {}
+        rpc_pool = rpc_settings.get("POOL") or {}
+        rpc_balancer = rpc_settings.get("BALANCER") or {}
+        rpc_hedging = rpc_settings.get("HEDGING") or {}
+        rpc_coalescing = rpc_settings.get("COALESCING") or {}
+        rpc_rate_limit = rpc_settings.get("RATE_LIMIT") or {}
+        rpc_websocket = rpc_settings.get("WEBSOCKET") or {}
+        rpc_gas_oracle = rpc_settings.get("GAS_ORACLE") or {}
+        rpc_gas_cache = rpc_settings.get("GAS_CACHE") or {}
+        rpc_preflight = rpc_settings.get("PREFLIGHT") or {}
+        rpc_metrics = rpc_settings.get("METRICS") or {}
+        rpc_receipts = rpc_settings.get("RECEIPTS") or {}
+        rpc_balances = rpc_settings.get("BALANCES") or {}
+        signer = data.get("SIGNER") or {}
+        circuit_breaker = data.get("CIRCUIT_BREAKER") or {}
+        scheduler = data.get("SCHEDULER") or {}
+
         return cls(
             SETTINGS=SettingsConfig(
                 THREADS=data["SETTINGS"]["THREADS"],
@@ -300,6 +461,106 @@ class Config:
                 BRIDGE_ALL=data["CRUSTY_SWAP"]["BRIDGE_ALL"],
                 BRIDGE_ALL_MAX_AMOUNT=data["CRUSTY_SWAP"]["BRIDGE_ALL_MAX_AMOUNT"],
             ),
+            RPC_SETTINGS=RpcSettingsConfig(
+                POOL=RpcPoolConfig(
+                    MAX_CONNECTIONS=rpc_pool.get("MAX_CONNECTIONS", 100),
+                    MAX_CONNECTIONS_PER_HOST=rpc_pool.get(
+                        "MAX_CONNECTIONS_PER_HOST", 0
+                    ),
+                    KEEPALIVE_TIMEOUT=rpc_pool.get("KEEPALIVE_TIMEOUT", 30),
+                    REQUEST_TIMEOUT=rpc_pool.get("REQUEST_TIMEOUT", 30),
+                    IDLE_TTL=rpc_pool.get("IDLE_TTL", 120),
+                    PROBE_TTL=rpc_pool.get("PROBE_TTL", 30),
+                ),
+                BALANCER=RpcBalancerConfig(
+                    EWMA_ALPHA=rpc_balancer.get("EWMA_ALPHA", 0.3),
+                    MAX_ERROR_RATE=rpc_balancer.get("MAX_ERROR_RATE", 0.5),
+                    EJECT_AFTER_FAILURES=rpc_balancer.get("EJECT_AFTER_FAILURES", 3),
+                    EJECT_SECONDS=rpc_balancer.get("EJECT_SECONDS", 30),
+                    RATE_LIMIT_PENALTY_SECONDS=rpc_balancer.get(
+                        "RATE_LIMIT_PENALTY_SECONDS", 10
+                    ),
+                ),
+                HEDGING=RpcHedgingConfig(
+                    ENABLED=rpc_hedging.get("ENABLED", False),
+                    PERCENTILE=rpc_hedging.get("PERCENTILE", 95),
+                    MIN_DELAY=rpc_hedging.get("MIN_DELAY", 0.2),
+                    MAX_DELAY=rpc_hedging.get("MAX_DELAY", 3.0),
+                ),
+                COALESCING=RpcCoalescingConfig(
+                    ENABLED=rpc_coalescing.get("ENABLED", True),
+                    TTL=rpc_coalescing.get("TTL", 0),
+                    MAX_ENTRIES=rpc_coalescing.get("MAX_ENTRIES", 10000),
+                ),
+                RATE_LIMIT=RpcRateLimitConfig(
+                    ENABLED=rpc_rate_limit.get("ENABLED", True),
+                    RATE=rpc_rate_limit.get("RATE", 20),
+                    BURST=rpc_rate_limit.get("BURST", 20),
+                    MIN_RATE=rpc_rate_limit.get("MIN_RATE", 1),
+                    MAX_RATE=rpc_rate_limit.get("MAX_RATE", 200),
+                    INCREASE=rpc_rate_limit.get("INCREASE", 5),
+                    DECREASE=rpc_rate_limit.get("DECREASE", 0.5),
+                    MAX_PAUSE=rpc_rate_limit.get("MAX_PAUSE", 60),
+                ),
+                WEBSOCKET=RpcWebsocketConfig(
+                    ENABLED=rpc_websocket.get("ENABLED", False),
+                    URLS=rpc_websocket.get("URLS") or {},
+                ),
+                GAS_ORACLE=RpcGasOracleConfig(
+                    REFRESH_INTERVAL=rpc_gas_oracle.get("REFRESH_INTERVAL", 3),
+                    EIP1559=rpc_gas_oracle.get("EIP1559", True),
+                    FEE_HISTORY_BLOCKS=rpc_gas_oracle.get("FEE_HISTORY_BLOCKS", 10),
+                    PRIORITY_PERCENTILE=rpc_gas_oracle.get("PRIORITY_PERCENTILE", 50),
+                    BASE_FEE_MULTIPLIER=rpc_gas_oracle.get("BASE_FEE_MULTIPLIER", 2.0),
+                ),
+                GAS_CACHE=RpcGasCacheConfig(
+                    ENABLED=rpc_gas_cache.get("ENABLED", True),
+                    MARGIN=rpc_gas_cache.get("MARGIN", 1.3),
+                    MIN_SAMPLES=rpc_gas_cache.get("MIN_SAMPLES", 3),
+                    MAX_SPREAD=rpc_gas_cache.get("MAX_SPREAD", 0.2),
+                ),
+                PREFLIGHT=RpcPreflightConfig(
+                    ENABLED=rpc_preflight.get("ENABLED", True),
+                ),
+                METRICS=RpcMetricsConfig(
+                    ENABLED=rpc_metrics.get("ENABLED", True),
+                ),
+                RECEIPTS=RpcReceiptsConfig(
+                    POLL_INTERVAL=rpc_receipts.get("POLL_INTERVAL", 0),
+                    BATCH_SIZE=rpc_receipts.get("BATCH_SIZE", 100),
+                    PROXY=rpc_receipts.get("PROXY") or "",
+                ),
+                BALANCES=RpcBalancesConfig(
+                    POLL_INTERVAL=rpc_balances.get("POLL_INTERVAL", 0),
+                    BATCH_SIZE=rpc_balances.get("BATCH_SIZE", 100),
+                    PROXY=rpc_balances.get("PROXY") or "",
+                ),
+            ),
+            SIGNER=SignerConfig(
+                ENABLED=signer.get("ENABLED", False),
+                MODE=signer.get("MODE", "process"),
+                WORKERS=signer.get("WORKERS", 0),
+            ),
+            CIRCUIT_BREAKER=CircuitBreakerConfig(
+                ENABLED=circuit_breaker.get("ENABLED", True),
+                FAILURE_THRESHOLD=circuit_breaker.get("FAILURE_THRESHOLD", 5),
+                RECOVERY_TIMEOUT=circuit_breaker.get("RECOVERY_TIMEOUT", 30),
+            ),
+            SCHEDULER=SchedulerConfig(
+                RELEASE_SLOT_ON_PAUSE=scheduler.get("RELEASE_SLOT_ON_PAUSE", False),
+                MAX_PAUSED_PER_THREAD=scheduler.get("MAX_PAUSED_PER_THREAD", 1),
+                ADAPTIVE=scheduler.get("ADAPTIVE", False),
+                MIN_THREADS=scheduler.get("MIN_THREADS", 1),
+                MAX_THREADS=scheduler.get("MAX_THREADS", 50),
+                TARGET_P95=scheduler.get("TARGET_P95", 2.0),
+                TARGET_ERROR_RATE=scheduler.get("TARGET_ERROR_RATE", 0.05),
+                INTERVAL=scheduler.get("INTERVAL", 10),
+                INCREASE=scheduler.get("INCREASE", 1),
+                DECREASE=scheduler.get("DECREASE", 0.7),
+                MAX_ACCOUNTS_PER_PROXY=scheduler.get("MAX_ACCOUNTS_PER_PROXY", 0),
+                LOOKAHEAD=scheduler.get("LOOKAHEAD", 100),
+                STICKY_PROXY=scheduler.get("STICKY_PROXY", False),
+            ),
         )
 
 
@@ -3,10 +3,15 @@ import asyncio
 from typing import TypeVar, Callable, Any, Optional
 from loguru import logger
 from src.utils.config import get_config
+from src.utils.circuit_breaker import CircuitOpenError
 
 T = TypeVar("T")
 
 
+class NonRetryableError(Exception):
+    """Lỗi mà thử lại chắc chắn cũng thất bại; retry_async ném lại ngay."""
+
+
 # @retry_async(attempts=3, default_value=False)
 # async def deploy_contract(self):
 #     try:
@@ -30,6 +35,8 @@ def retry_async(
     """
     Decorator thử lại bất đồng bộ với thời gian chờ tăng cấp số nhân.
     Nếu số lần thử không được cung cấp, sử dụng SETTINGS.ATTEMPTS từ cấu hình.
+    Không thử lại khi dịch vụ đang bị circuit breaker ngắt hoặc giao dịch
+    chắc chắn bị revert theo mô phỏng trước khi gửi.
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
@@ -41,6 +48,9 @@ def retry_async(
             for attempt in range(retry_attempts):
                 try:
                     return await func(*args, **kwargs)
+                except (CircuitOpenError, NonRetryableError) as e:
+                    logger.error(f"Bỏ qua {func.__name__}: {str(e)}")
+                    raise
                 except Exception as e:
                     if attempt < retry_attempts - 1:  # Không nghỉ ở lần thử cuối
                         logger.warning(
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from asyncio import Lock
 from tqdm import tqdm
 from dataclasses import dataclass
@@ -15,6 +15,7 @@ class ProgressTracker:
     description: str = "Tiến độ"
     _lock: Lock = Lock()
     bar_length: int = 30  # Độ dài thanh tiến độ tính bằng ký tự
+    status: Optional[Callable[[], str]] = None  # Trạng thái bổ sung, ví dụ số luồng hiện tại
 
     def __post_init__(self):
         pass
@@ -38,6 +39,8 @@ class ProgressTracker:
                 emoji = "🔄"
 
             progress_msg = f"{emoji} [{self.description}] [{bar}] {self.current}/{self.total} ({percentage:.1f}%)"
+            if self.status is not None:
+                progress_msg += f" | {self.status()}"
             # if message:
             #     progress_msg += f"\n    ├─ {message}"
             logger.info(progress_msg)
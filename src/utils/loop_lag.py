@@ -0,0 +1,54 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LoopLagMonitor:
+    """
+    Đo độ trễ của vòng lặp sự kiện: một tác vụ ngủ interval giây và ghi lại
+    thời gian thức dậy muộn hơn dự kiến. Độ trễ cao nghĩa là có mã đồng bộ
+    (ký giao dịch, phân tích ABI...) chặn vòng lặp và làm chậm mọi tài khoản.
+    """
+
+    def __init__(self, interval: float = 0.05, max_samples: int = 20000):
+        self.interval = interval
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started_at - self.interval))
+
+    def summary(self) -> Dict[str, float]:
+        """Phân vị độ trễ (giây)."""
+        if not self.samples:
+            return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(self.samples)
+        return {
+            "p50": ordered[int(0.5 * (len(ordered) - 1))],
+            "p99": ordered[int(0.99 * (len(ordered) - 1))],
+            "max": ordered[-1],
+        }
+
+    def format_summary(self) -> str:
+        stats = self.summary()
+        return (
+            f"p50 {stats['p50'] * 1000:.1f} ms, p99 {stats['p99'] * 1000:.1f} ms, "
+            f"tối đa {stats['max'] * 1000:.1f} ms ({len(self.samples)} mẫu)"
+        )
@@ -2,6 +2,8 @@ import json
 from loguru import logger
 from eth_account import Account
 from eth_account.hdaccount import generate_mnemonic
+from eth_keys.validation import validate_private_key_bytes
+from hexbytes import HexBytes
 from web3.auto import w3
 
 
@@ -61,8 +63,9 @@ def read_private_keys(file_path: str) -> list:
                     # Thử xử lý như một khóa riêng
                     if not key.startswith("0x"):
                         key = "0x" + key
-                    # Xác minh rằng đó là khóa riêng hợp lệ
-                    Account.from_key(key)
+                    # Xác minh rằng đó là khóa riêng hợp lệ (chỉ kiểm tra độ dài và phạm vi,
+                    # không suy ra khóa công khai - việc đó tốn vài mili giây mỗi khóa)
+                    validate_private_key_bytes(HexBytes(key))
                     private_key = key
 
                 private_keys.append(private_key)
@@ -0,0 +1,229 @@
+import asyncio
+import itertools
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, TypeVar
+
+from loguru import logger
+
+from src.utils.logs import ProgressTracker
+
+T = TypeVar("T")
+
+
+def split_accounts(
+    accounts: Sequence[T], shards: int, key: Callable[[T], Hashable]
+) -> List[List[T]]:
+    """
+    Chia tài khoản thành tối đa shards phần rời nhau, giữ nguyên thứ tự trong mỗi phần.
+    Tài khoản cùng khóa (proxy) luôn vào cùng một shard để giới hạn số tài khoản
+    mỗi proxy vẫn đúng trên toàn bộ quá trình chạy; khóa mới vào shard đang ít tài khoản nhất.
+    """
+    slices: List[List[T]] = [[] for _ in range(max(1, shards))]
+    shard_of: Dict[Hashable, int] = {}
+    for account in accounts:
+        account_key = key(account)
+        shard = shard_of.get(account_key)
+        if shard is None:
+            shard = min(range(len(slices)), key=lambda i: len(slices[i]))
+            shard_of[account_key] = shard
+        slices[shard].append(account)
+    return [part for part in slices if part]
+
+
+def split_threads(threads: int, shards: int) -> List[int]:
+    """Chia THREADS cho các shard, mỗi shard ít nhất một luồng."""
+    return [max(1, threads // shards + (1 if i < threads % shards else 0)) for i in range(shards)]
+
+
+@dataclass
+class ShardProgress(ProgressTracker):
+    """Tiến độ trong tiến trình shard: gửi cho tiến trình cha thay vì ghi log."""
+
+    shard: int = 0
+    channel: Any = None
+
+    async def increment(self, amount: int = 1, message: Optional[str] = None):
+        self.current += amount
+        status = self.status() if self.status is not None else None
+        self.channel.put(("progress", self.shard, amount, status))
+
+
+class ShardWriter:
+    """
+    Database.writer của tiến trình shard: gửi lời gọi ghi cho tiến trình cha và chờ
+    kết quả thật (giá trị trả về hoặc lỗi), nên lần đọc ngay sau đó thấy dữ liệu đã ghi.
+    """
+
+    def __init__(self, shard: int, channel: Any, replies: Any):
+        self.shard = shard
+        self.channel = channel
+        self.replies = replies
+        self._ids = itertools.count()
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    async def __call__(self, method: str, args: tuple, kwargs: dict) -> Any:
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read())
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._futures[request_id] = future
+        self.channel.put(("db", self.shard, request_id, method, args, kwargs))
+        return await future
+
+    async def _read(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                request_id, result, error = await loop.run_in_executor(
+                    None, self.replies.get, True, 1
+                )
+            except queue.Empty:
+                continue
+            future = self._futures.pop(request_id, None)
+            if future is None or future.done():
+                continue
+            if error is not None:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+
+@dataclass
+class ShardResult:
+    """Kết quả một shard gửi về khi xong: thống kê ví, số liệu RPC, độ trễ vòng lặp."""
+
+    shard: int
+    wallets: list
+    rpc_metrics: Any = None
+    loop_lag: str = ""
+
+
+class ShardSupervisor:
+    """
+    Chạy các phần tài khoản trong các tiến trình riêng (mỗi tiến trình một vòng lặp
+    sự kiện, nhóm kết nối RPC và nhóm ký riêng) và gộp kết quả ở tiến trình cha.
+
+    Tiến trình shard gửi thông điệp qua một hàng đợi chung:
+        ("progress", shard, số lượng, trạng thái) - cập nhật thanh tiến độ chung
+        ("telegram", tin nhắn) - tiến trình cha gửi Telegram
+        ("db", shard, mã yêu cầu, phương thức, args, kwargs) - tiến trình cha là nơi
+            duy nhất ghi SQLite, kết quả (mã yêu cầu, giá trị, lỗi) được gửi lại qua
+            hàng đợi trả lời riêng của shard
+        ("done", ShardResult) - shard đã xong
+    """
+
+    def __init__(self, config, progress_tracker: ProgressTracker):
+        self.config = config
+        self.progress_tracker = progress_tracker
+        self.statuses: Dict[int, str] = {}
+        self.results: List[ShardResult] = []
+        self._context = multiprocessing.get_context("spawn")
+        self._channel = self._context.Queue()
+        self._replies: List[Any] = []
+        self._db = None
+
+    def format_status(self) -> str:
+        return "; ".join(
+            f"shard {shard}: {status}" for shard, status in sorted(self.statuses.items())
+        )
+
+    async def run(
+        self,
+        target: Callable[..., None],
+        slices: Sequence[Sequence[Any]],
+        threads: Sequence[int],
+    ) -> List[ShardResult]:
+        """
+        Khởi động một tiến trình target(shard, tài khoản, số luồng, hàng đợi, hàng đợi trả lời)
+        cho mỗi phần và xử lý thông điệp cho đến khi mọi shard xong hoặc dừng bất thường.
+        """
+        self.progress_tracker.status = self.format_status
+        self._replies = [self._context.Queue() for _ in slices]
+        processes = [
+            self._context.Process(
+                target=target,
+                args=(
+                    shard,
+                    list(accounts),
+                    shard_threads,
+                    self._channel,
+                    self._replies[shard],
+                ),
+                name=f"shard-{shard}",
+            )
+            for shard, (accounts, shard_threads) in enumerate(zip(slices, threads))
+        ]
+        for process in processes:
+            process.start()
+        logger.info(
+            f"Đã khởi động {len(processes)} shard: "
+            + ", ".join(
+                f"{len(accounts)} tài khoản/{shard_threads} luồng"
+                for accounts, shard_threads in zip(slices, threads)
+            )
+        )
+
+        loop = asyncio.get_running_loop()
+        finished = set()
+        try:
+            while len(finished) < len(processes):
+                try:
+                    message = await loop.run_in_executor(None, self._channel.get, True, 1)
+                except queue.Empty:
+                    for shard, process in enumerate(processes):
+                        if shard not in finished and process.exitcode is not None:
+                            logger.error(
+                                f"Shard {shard} dừng bất thường (mã thoát {process.exitcode})"
+                            )
+                            finished.add(shard)
+                    continue
+                if message[0] == "done":
+                    finished.add(message[1].shard)
+                await self._handle(message)
+        finally:
+            for process in processes:
+                process.join(timeout=10)
+                if process.is_alive():
+                    process.terminate()
+        return self.results
+
+    async def _handle(self, message: tuple) -> None:
+        kind = message[0]
+        if kind == "progress":
+            _, shard, amount, status = message
+            if status is not None:
+                self.statuses[shard] = status
+            await self.progress_tracker.increment(amount)
+        elif kind == "telegram":
+            from src.utils.telegram_logger import send_telegram_message
+
+            try:
+                await send_telegram_message(self.config, message[1])
+            except Exception as e:
+                logger.error(f"Không thể gửi tin nhắn Telegram: {e}")
+        elif kind == "db":
+            _, shard, request_id, method, args, kwargs = message
+            if self._db is None:
+                from src.model.database.instance import Database
+
+                self._db = Database()
+            result, error = None, None
+            try:
+                result = await getattr(self._db, method)(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Lỗi khi ghi cơ sở dữ liệu cho shard ({method}): {e}")
+                error = str(e)
+            self._replies[shard].put((request_id, result, error))
+        elif kind == "done":
+            result: ShardResult = message[1]
+            self.statuses.pop(result.shard, None)
+            self.results.append(result)
+            logger.info(f"Shard {result.shard} đã xong, độ trễ vòng lặp sự kiện: {result.loop_lag}")
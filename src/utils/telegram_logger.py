@@ -1,4 +1,5 @@
 import asyncio
+from typing import Callable, Optional
 from aiogram import Bot
 from aiogram.enums import ParseMode
 from src.utils.config import Config
@@ -6,10 +7,20 @@ from src.utils.config import Config
 
 async def send_telegram_message(config: Config, message: str) -> None:
     """Gửi tin nhắn đến người dùng Telegram bằng token bot từ cấu hình."""
+    forward = getattr(send_telegram_message, "_forward", None)
+    if forward is not None:
+        forward(message)
+        return
+
     bot = Bot(token=config.SETTINGS.TELEGRAM_BOT_TOKEN)
 
     for user_id in config.SETTINGS.TELEGRAM_USERS_IDS:
         await bot.send_message(chat_id=user_id, text=message, parse_mode=ParseMode.HTML)
         await asyncio.sleep(1)
         
-    await bot.session.close()
\ No newline at end of file
+    await bot.session.close()
+
+
+def forward_telegram_messages(forward: Optional[Callable[[str], None]]) -> None:
+    """Chuyển tin nhắn cho forward thay vì gửi (tiến trình shard gửi qua tiến trình cha)."""
+    send_telegram_message._forward = forward
@@ -0,0 +1,222 @@
+import asyncio
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Hashable,
+    Iterable,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from loguru import logger
+
+T = TypeVar("T")
+
+_END = object()
+
+# Bộ lập lịch của tài khoản đang chạy trong tác vụ hiện tại (None ngoài bộ lập lịch)
+_current_scheduler: ContextVar[Optional["SlotScheduler"]] = ContextVar(
+    "current_scheduler", default=None
+)
+
+
+class SlotScheduler:
+    """
+    Chạy công việc (tài khoản) với tối đa slots công việc đang hoạt động cùng lúc.
+
+    Công việc đang nghỉ (pause) trả slot cho công việc khác và chờ slot lại khi
+    thức dậy; thời điểm thức dậy do hàng đợi hẹn giờ của vòng lặp sự kiện quản lý.
+    Số slot có thể thay đổi khi đang chạy (set_limit, xem AdaptiveConcurrency).
+    Số công việc đã nhận (đang hoạt động + đang nghỉ) bị giới hạn bởi max_admitted,
+    nên bộ nhớ không phụ thuộc số lượng công việc. Công việc được bắt đầu theo
+    đúng thứ tự của jobs, mỗi công việc mới chỉ bắt đầu khi có slot trống.
+
+    Với per_key_limit, số công việc đã nhận có cùng khóa (proxy) bị giới hạn:
+    công việc tiếp theo được chọn trong lookahead công việc kế tiếp là công việc
+    đầu tiên có khóa còn chỗ, công việc có khóa đã đầy được giữ lại chờ lượt sau.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        max_admitted: int = 0,
+        per_key_limit: int = 0,
+        lookahead: int = 1,
+    ):
+        self.limit = max(1, slots)  # số slot hiện tại, có thể thay đổi khi đang chạy
+        self.max_admitted = max(self.limit, max_admitted)
+        self.per_key_limit = per_key_limit  # 0 - không giới hạn theo khóa
+        self.lookahead = max(1, lookahead)
+        self.active = 0  # số công việc đang giữ slot
+        self.paused = 0  # số công việc đang nghỉ
+        self.in_flight: Counter = Counter()  # khóa -> số công việc đã nhận chưa xong
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def saturated(self) -> bool:
+        """Mọi slot đều bận và có công việc đang chờ: tăng slot sẽ tăng thông lượng."""
+        return self.active >= self.limit and bool(self._waiters)
+
+    def set_limit(self, limit: int) -> None:
+        """
+        Đổi số slot. Khi giảm, công việc đang chạy không bị dừng:
+        slot được thu hồi dần khi công việc trả slot (xong hoặc nghỉ).
+        """
+        self.limit = max(1, limit)
+        self._wake()
+
+    def format_status(self) -> str:
+        return f"luồng {self.active}/{self.limit}, đang nghỉ {self.paused}"
+
+    async def _acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Đã được cấp slot ngay trước khi bị hủy: trả lại
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Cấp slot theo thứ tự chờ (FIFO) cho đến khi hết slot trống
+        while self._waiters and self.active < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    def _pick(
+        self, pending: Deque[T], key: Optional[Callable[[T], Hashable]]
+    ) -> Optional[T]:
+        """Lấy công việc đầu tiên có khóa còn chỗ, None nếu mọi khóa đều đầy."""
+        if key is None or self.per_key_limit <= 0:
+            return pending.popleft()
+        for i, job in enumerate(pending):
+            if self.in_flight[key(job)] < self.per_key_limit:
+                del pending[i]
+                return job
+        return None
+
+    async def run(
+        self,
+        jobs: Iterable[T],
+        handler: Callable[[T], Awaitable[Any]],
+        key: Optional[Callable[[T], Hashable]] = None,
+    ) -> None:
+        """
+        Chạy handler cho mọi công việc; lỗi của một công việc được ghi log.
+
+        Args:
+            jobs: Các công việc (thường là generator, được lấy dần)
+            handler: Hàm xử lý một công việc
+            key: Khóa của công việc cho per_key_limit (ví dụ proxy của tài khoản)
+        """
+        admitted = asyncio.Semaphore(self.max_admitted)
+        finished = asyncio.Event()
+        tasks: Set[asyncio.Task] = set()
+        pending: Deque[T] = deque()
+        jobs = iter(jobs)
+        while True:
+            while len(pending) < self.lookahead:
+                job = next(jobs, _END)
+                if job is _END:
+                    break
+                pending.append(job)
+            if not pending:
+                break
+            await admitted.acquire()
+            await self._acquire()
+            job = self._pick(pending, key)
+            while job is None:
+                # Mọi khóa trong bộ đệm đều đầy: trả slot đến khi có công việc xong
+                finished.clear()
+                self._release()
+                await finished.wait()
+                await self._acquire()
+                job = self._pick(pending, key)
+            job_key = key(job) if key is not None else None
+            self.in_flight[job_key] += 1
+            task = asyncio.create_task(
+                self._run_job(job, job_key, handler, admitted, finished)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _run_job(
+        self,
+        job: T,
+        job_key: Hashable,
+        handler: Callable[[T], Awaitable[Any]],
+        admitted: asyncio.Semaphore,
+        finished: asyncio.Event,
+    ) -> None:
+        # Slot đã được lấy trong run(); tác vụ có bản sao context riêng
+        _current_scheduler.set(self)
+        try:
+            await handler(job)
+        except Exception as e:
+            logger.error(f"Lỗi khi xử lý công việc: {e}")
+        finally:
+            self.in_flight[job_key] -= 1
+            if not self.in_flight[job_key]:
+                del self.in_flight[job_key]
+            self._release()
+            admitted.release()
+            finished.set()
+
+    async def pause(self, seconds: float) -> None:
+        """Nghỉ mà không giữ slot, sau đó chờ đến lượt nhận slot lại."""
+        self._release()
+        self.paused += 1
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.paused -= 1
+            await self._acquire()
+
+
+async def pause(seconds: float) -> None:
+    """
+    Nghỉ giữa các hành động của tài khoản. Trong SlotScheduler, slot được trả
+    trong lúc nghỉ để tài khoản khác làm việc; ngoài bộ lập lịch tương đương asyncio.sleep.
+    """
+    scheduler = _current_scheduler.get()
+    if scheduler is None:
+        await asyncio.sleep(seconds)
+    else:
+        await scheduler.pause(seconds)
+
+
+def create_slot_scheduler(threads: int) -> SlotScheduler:
+    """Tạo SlotScheduler cho THREADS slot theo cấu hình SCHEDULER"""
+    from src.utils.config import get_config
+
+    scheduler = get_config().SCHEDULER
+    # Không nhận thêm tài khoản khi nghỉ: tối đa THREADS tài khoản như trước
+    paused_per_thread = (
+        scheduler.MAX_PAUSED_PER_THREAD if scheduler.RELEASE_SLOT_ON_PAUSE else 0
+    )
+    # Ở chế độ thích ứng số slot có thể tăng đến MAX_THREADS
+    max_threads = max(threads, scheduler.MAX_THREADS) if scheduler.ADAPTIVE else threads
+    return SlotScheduler(
+        threads,
+        max_threads * (1 + paused_per_thread),
+        per_key_limit=scheduler.MAX_ACCOUNTS_PER_PROXY,
+        lookahead=scheduler.LOOKAHEAD,
+    )